@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+/api/tasks/<id>/events/ (Server-Sent Events) 는 연결을 오래 붙잡고 있으므로 이 ASGI application 으로
+서빙한다 (gunicorn -k uvicorn_worker.UvicornWorker backend.asgi:application).
+결과 파일 / ZIP download 도 async iterator 로 스트리밍하므로 (core/streaming.py) ASGI 에서 버퍼링되지 않는다.
 """
 
 import os
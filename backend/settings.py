@@ -90,12 +90,40 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Celery Broker 설정 (Redis)
 # 환경 변수가 없으면 로컬 개발용으로 대체됨
 
-CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# Redis 상태 캐시 (core/status_cache.py) 유지 시간 (초). 만료되면 다음 조회 때 DB 에서 다시 채운다.
+STATUS_CACHE_TTL = int(os.environ.get('STATUS_CACHE_TTL', str(24 * 60 * 60)))
+
+# 분석 결과/중간 산출물 캐시 위치 (web 과 worker 가 같은 /data volume 을 공유)
+ANALYSIS_CACHE_DIR = os.environ.get('ANALYSIS_CACHE_DIR', '/data/cache')
+
+# 최종 결과 캐시 (core/result_cache.py) 크기 상한. 넘으면 오래 쓰이지 않은 결과부터 지운다.
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', str(5 * 1024 ** 3)))
+
+# cpplint / lizard 를 git blob 단위로 캐시해서 바뀐 파일만 다시 분석
+ANALYSIS_INCREMENTAL = os.environ.get('ANALYSIS_INCREMENTAL', '') != 'False'
+
+# 병렬로 띄울 cpplint 프로세스 수 (0 이면 CPU core 수)
+CPPLINT_WORKERS = int(os.environ.get('CPPLINT_WORKERS', '0'))
+
+# 분석 tool 의 원시 stdout(cg.txt, lizard_result.csv)도 파일로 남길지 여부 (디버깅용)
+ANALYSIS_KEEP_RAW_OUTPUT = os.environ.get('ANALYSIS_KEEP_RAW_OUTPUT', '') == 'True'
+
+# 전처리 때 call graph 2D 좌표를 미리 계산할 최대 node 수 (0 이면 계산하지 않음)
+ANALYSIS_LAYOUT_MAX_NODES = int(os.environ.get('ANALYSIS_LAYOUT_MAX_NODES', '200000'))
+
+# 미리 계산한 call graph 좌표 캐시 (ANALYSIS_CACHE_DIR/layouts) 크기 상한. 넘으면 오래 쓰이지 않은 좌표부터 지운다.
+ANALYSIS_LAYOUT_CACHE_MAX_BYTES = int(os.environ.get('ANALYSIS_LAYOUT_CACHE_MAX_BYTES', str(1024 ** 3)))
+
+# web worker 마다 메모리에 올려 둘 call graph adjacency index 개수 (LRU)
+CG_INDEX_CACHE_SIZE = int(os.environ.get('CG_INDEX_CACHE_SIZE', '8'))
+
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
@@ -107,7 +135,10 @@ DATABASES = {
     # }
     'default': dj_database_url.config(
         default=os.environ.get('DATABASE_URL', DEFAULT_SQLITE_URL),
-        conn_max_age=600
+        # Celery worker 는 연결을 유지해 재사용한다 (기본 600초).
+        # ASGI web 은 sync view / ORM 호출이 요청마다 다른 executor thread 에서 돌 수 있어
+        # 연결을 유지하면 thread 마다 연결이 하나씩 남으므로 CONN_MAX_AGE=0 으로 실행한다 (Dockerfile / fly.toml).
+        conn_max_age=int(os.environ.get('CONN_MAX_AGE', '600'))
     )
 }
 
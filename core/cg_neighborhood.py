@@ -0,0 +1,81 @@
+# core/cg_neighborhood.py
+"""
+전처리 때 만든 cg_adjacency.npz (core/script/cg_index.py) 로 함수 하나의 k-hop caller / callee 조회.
+
+index 는 web worker 프로세스마다 LRU 로 메모리에 올려 두고 (settings.CG_INDEX_CACHE_SIZE 개),
+파일이 다시 만들어지면 (mtime / size 가 바뀌면) 새로 읽는다.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .result_cache import write_atomic
+from .result_query import QueryError
+from .script.cg_index import DIRECTIONS, INDEX_FILENAME, AdjacencyIndex, build_adjacency_index
+
+DEFAULT_DEPTH = 1
+MAX_DEPTH = 10
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 5000
+
+
+def ensure_index(repo_dir: Path) -> Path:
+    """cg_adjacency.npz 가 없으면 (결과 캐시에서 복원한 경우 등) cg_filtered.json 에서 한 번 만든다."""
+    repo_dir = Path(repo_dir)
+    path = repo_dir / INDEX_FILENAME
+    if path.is_file():
+        return path
+
+    src = repo_dir / "cg_filtered.json"
+    if not src.is_file():
+        raise FileNotFoundError(f"cg_filtered.json not found at {src}")
+    with src.open("r", encoding="utf-8") as f:
+        cg_data = json.load(f)
+    write_atomic(path, build_adjacency_index(cg_data))
+    return path
+
+
+@lru_cache(maxsize=settings.CG_INDEX_CACHE_SIZE)
+def _load(path: str, mtime_ns: int, size: int) -> AdjacencyIndex:
+    return AdjacencyIndex(path)
+
+
+def load_index(path: Path) -> AdjacencyIndex:
+    stat = Path(path).stat()
+    return _load(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _int_param(params, name, default, maximum):
+    try:
+        value = int(params.get(name) or default)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer")
+    if not 1 <= value <= maximum:
+        raise QueryError(f"{name} must be between 1 and {maximum}")
+    return value
+
+
+def neighborhood(index_path: Path, params):
+    """
+    params (request.query_params 와 같은 mapping):
+      - function : 중심 함수 이름 (필수)
+      - depth (기본 1, 최대 10) : 몇 hop 까지
+      - direction=both|callees|callers (기본 both)
+      - limit (기본 200, 최대 5000) : 반환할 최대 node 수 (중심 포함)
+    반환: {"center", "nodes", "edges", "truncated"}. 없는 함수면 KeyError.
+    """
+    function = params.get("function")
+    if not function:
+        raise QueryError("function is required")
+
+    direction = params.get("direction") or "both"
+    if direction not in DIRECTIONS:
+        raise QueryError(f"direction must be one of {', '.join(DIRECTIONS)}")
+
+    depth = _int_param(params, "depth", DEFAULT_DEPTH, MAX_DEPTH)
+    limit = _int_param(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+
+    return load_index(index_path).neighborhood(function, depth=depth, direction=direction, limit=limit)
@@ -0,0 +1,116 @@
+# core/cpplint_runner.py
+"""
+cpplint 를 여러 core 에서 나눠 돌리는 runner.
+
+cpplint --recursive 는 프로세스 하나로 전체 repo 를 검사하므로 core 하나만 쓴다.
+여기서는 C/C++ 소스를 모아 파일 크기 기준으로 고르게 shard 를 나누고,
+shard 마다 cpplint 프로세스를 하나씩 동시에 띄운 뒤 결과를 파일 경로 순서로 합친다.
+출력 record 형식은 cpplint_preprocessing.py 와 같다.
+"""
+
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+from .script.cpplint_preprocessing import parse_cpplint_line
+from .stream_runner import iter_process_lines
+
+# cpplint 기본 --extensions 와 같은 목록
+CPP_EXTENSIONS = (
+    ".c", ".c++", ".cc", ".cpp", ".cu", ".cuh", ".cxx",
+    ".h", ".h++", ".hh", ".hpp", ".hxx",
+)
+
+# 한 번의 cpplint 실행에 넘기는 최대 파일 수 (ARG_MAX 방지)
+FILES_PER_INVOCATION = 200
+
+
+def is_cpp_source(path: str) -> bool:
+    return os.path.splitext(path)[1] in CPP_EXTENSIONS
+
+
+def enumerate_sources(repo_dir: Path):
+    """cpplint --recursive 와 같은 기준으로 repo 안의 C/C++ 소스를 repo 기준 상대 경로로 모은다."""
+    repo_dir = Path(repo_dir)
+    paths = []
+    for root, dirs, files in os.walk(repo_dir):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        for name in files:
+            if is_cpp_source(name):
+                paths.append(os.path.relpath(os.path.join(root, name), repo_dir))
+    paths.sort()
+    return paths
+
+
+def make_shards(repo_dir: Path, paths, num_shards: int):
+    """
+    파일 크기 합이 비슷하도록 paths 를 num_shards 개로 나눈다.
+    (큰 파일부터 현재 가장 가벼운 shard 에 넣는 greedy LPT)
+    """
+    repo_dir = Path(repo_dir)
+    num_shards = max(1, min(num_shards, len(paths)))
+
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = (repo_dir / path).stat().st_size
+        except OSError:
+            sizes[path] = 0
+
+    shards = [[] for _ in range(num_shards)]
+    heap = [(0, i) for i in range(num_shards)]
+    for path in sorted(paths, key=lambda p: (-sizes[p], p)):
+        load, i = heapq.heappop(heap)
+        shards[i].append(path)
+        heapq.heappush(heap, (load + max(sizes[path], 1), i))
+    return [shard for shard in shards if shard]
+
+
+def lint_shard(repo_dir: Path, shard):
+    """shard 의 파일들을 cpplint 로 검사해 {path: [warning record ...]} 를 반환한다."""
+    repo_dir = Path(repo_dir)
+    by_file = {}
+    for i in range(0, len(shard), FILES_PER_INVOCATION):
+        chunk = shard[i:i + FILES_PER_INVOCATION]
+        # cpplint 는 경고를 stderr 로 찍고, 경고가 있으면 exit code 1 이라 check 하지 않는다
+        # 출력은 cpplint 가 검사하는 동안 한 줄씩 바로 파싱한다
+        lines = iter_process_lines(["cpplint", *chunk], repo_dir, check=False, merge_stderr=True)
+        for line in lines:
+            rec = parse_cpplint_line(line, repo_dir)
+            if rec is not None:
+                by_file.setdefault(rec["file"], []).append(rec)
+    return by_file
+
+
+def lint_files(repo_dir: Path, paths, workers=None):
+    """
+    paths 를 shard 로 나눠 동시에 cpplint 로 검사하고 {path: [warning record ...]} 를 반환한다.
+
+    Celery prefork worker 는 daemon 프로세스라 multiprocessing pool 을 만들 수 없으므로,
+    thread 는 cpplint 프로세스를 띄우고 기다리는 역할만 하고 실제 검사는 cpplint 프로세스들이 병렬로 한다.
+    """
+    if not paths:
+        return {}
+    workers = workers or settings.CPPLINT_WORKERS or os.cpu_count() or 1
+    shards = make_shards(repo_dir, paths, workers)
+
+    by_file = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for shard_result in pool.map(lambda shard: lint_shard(repo_dir, shard), shards):
+            by_file.update(shard_result)
+    return by_file
+
+
+def run_cpplint_sharded(repo_dir: Path, paths=None, workers=None):
+    """repo 전체(또는 paths)를 병렬로 검사해 파일 경로 순서로 합친 warning record 리스트를 반환한다."""
+    if paths is None:
+        paths = enumerate_sources(repo_dir)
+    by_file = lint_files(repo_dir, paths, workers)
+
+    results = []
+    for path in sorted(by_file):
+        results.extend(by_file[path])
+    return results
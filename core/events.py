@@ -0,0 +1,166 @@
+# core/events.py
+"""
+Task 진행 상황 push 채널 (Server-Sent Events).
+
+- worker (core/tasks.py) 는 step 상태가 바뀔 때마다 / 전처리 stage 하나가 끝날 때마다
+  Redis pub/sub 채널 infovis:task:<id> 로 event 를 publish 한다. (Celery broker 와 같은 Redis)
+- web (ASGI, backend/asgi.py) 의 /tasks/<id>/events/ 는 그 채널을 subscribe 해서 text/event-stream 으로 흘려 보낸다.
+  연결 직후에는 DB 의 현재 상태를 한 번 보내고, 이후로는 DB 를 다시 읽지 않는다.
+- Redis 에 연결할 수 없으면 publish 는 조용히 건너뛰고, stream 은 POLL_INTERVAL 마다 DB 를 읽는 방식으로 대신한다.
+
+event 종류:
+  status    {"id", "github_url", "commit_sha", "status", "current_step", "created_at", "error_message", "steps": [...]}
+            (TaskStatusView 응답과 같은 모양)
+  progress  {"step", "stage", "index", "total", "elapsed", "ok"}  전처리 stage 하나가 끝났을 때
+"""
+
+import asyncio
+import json
+
+import redis
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.fields import DateTimeField
+
+from .models import AnalysisTask
+from .redis_client import get_client
+
+CHANNEL_PREFIX = "infovis:task:"
+
+STEP_ORDER = [code for code, _ in AnalysisTask.STEP_CHOICES]
+
+# 이 시간 동안 event 가 없으면 연결 유지용 comment 를 보낸다 (proxy idle timeout 방지)
+HEARTBEAT_INTERVAL = 15
+# Redis 없이 DB 를 읽어 대신할 때의 간격
+POLL_INTERVAL = 2
+
+
+# TaskStatusView (DRF) 응답과 같은 날짜 형식
+_datetime = DateTimeField().to_representation
+
+
+def _format_datetime(value):
+    return None if value is None else _datetime(value)
+
+
+def channel(task_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{task_id}"
+
+
+def task_snapshot(task, steps) -> dict:
+    """TaskStatusView 응답 모양의 dict (steps 는 파이프라인 순서)."""
+    return {
+        "id": task.id,
+        "github_url": task.github_url,
+        "commit_sha": task.commit_sha,
+        "status": task.status,
+        "current_step": task.current_step,
+        "created_at": _format_datetime(task.created_at),
+        "error_message": task.error_message,
+        "steps": [
+            {
+                "step": s.step,
+                "status": s.status,
+                "started_at": _format_datetime(s.started_at),
+                "finished_at": _format_datetime(s.finished_at),
+                "error_message": s.error_message,
+            }
+            for s in sorted(steps, key=lambda s: STEP_ORDER.index(s.step))
+        ],
+    }
+
+
+def is_finished(snapshot: dict) -> bool:
+    """더 바뀔 step 이 없는 상태 (실행 중 / 대기 중 step 이 하나도 없음)."""
+    return snapshot["status"] in ("COMPLETED", "FAILED") and not any(
+        s["status"] in ("PENDING", "RUNNING") for s in snapshot["steps"]
+    )
+
+
+def _encode(event_type: str, data: dict) -> str:
+    return json.dumps({"type": event_type, "data": data}, cls=DjangoJSONEncoder)
+
+
+# --- publish (worker) ---
+
+def publish(task_id: int, event_type: str, data: dict):
+    """event 를 publish 한다. Redis 가 없거나 실패해도 분석 작업은 계속한다."""
+    try:
+        get_client().publish(channel(task_id), _encode(event_type, data))
+    except redis.RedisError as e:
+        print(f"[events] publish failed for task {task_id}: {e}")
+
+
+# --- subscribe (web) ---
+
+def _load_snapshot(task_id: int):
+    task = AnalysisTask.objects.prefetch_related("steps").get(pk=task_id)
+    return task_snapshot(task, task.steps.all())
+
+
+def _sse(event_type: str, payload: str) -> str:
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+async def _poll(task_id: int, last: dict):
+    """Redis 를 못 쓸 때: POLL_INTERVAL 마다 DB 를 읽어 바뀐 경우에만 status event."""
+    while not is_finished(last):
+        await asyncio.sleep(POLL_INTERVAL)
+        snapshot = await sync_to_async(_load_snapshot)(task_id)
+        if snapshot != last:
+            last = snapshot
+            yield _sse("status", json.dumps(snapshot, cls=DjangoJSONEncoder))
+        else:
+            yield ": keep-alive\n\n"
+
+
+async def stream_task_events(task_id: int):
+    """/tasks/<id>/events/ 의 text/event-stream 본문 generator. Task 가 끝나면 종료한다."""
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        # 현재 상태를 읽기 전에 subscribe 해서 그 사이의 event 를 놓치지 않는다
+        await pubsub.subscribe(channel(task_id))
+    except (redis.RedisError, OSError):
+        pubsub = None
+
+    try:
+        snapshot = await sync_to_async(_load_snapshot)(task_id)
+        yield _sse("status", json.dumps(snapshot, cls=DjangoJSONEncoder))
+        if is_finished(snapshot):
+            return
+
+        if pubsub is None:
+            async for chunk in _poll(task_id, snapshot):
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_INTERVAL)
+            except (redis.RedisError, OSError):
+                # 도중에 Redis 연결이 끊기면 DB polling 으로 이어간다
+                async for chunk in _poll(task_id, snapshot):
+                    yield chunk
+                return
+            if message is None:
+                # subscribe 확인 메시지를 건너뛴 경우에도 None 이 온다
+                if loop.time() - last_sent >= HEARTBEAT_INTERVAL:
+                    last_sent = loop.time()
+                    yield ": keep-alive\n\n"
+                continue
+            last_sent = loop.time()
+            event = json.loads(message["data"])
+            yield _sse(event["type"], json.dumps(event["data"]))
+            if event["type"] == "status":
+                snapshot = event["data"]
+                if is_finished(snapshot):
+                    return
+    finally:
+        if pubsub is not None:
+            await pubsub.aclose()
+        await client.aclose()
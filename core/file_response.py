@@ -0,0 +1,115 @@
+# core/file_response.py
+"""
+결과 파일을 파싱 / 재직렬화 없이 디스크의 bytes 그대로 내려주는 헬퍼.
+
+- 전처리가 끝날 때 precompress() 로 <file>.br / <file>.gz 를 한 번 만들어 두고
+- 요청의 Accept-Encoding 에 맞는 파일을 골라 스트리밍한다
+  (FileResponse 는 sync iterator 라 ASGI 에서 전체를 메모리에 모은 뒤 보내므로, chunk 마다
+  sync_to_async 로 읽는 async iterator 를 StreamingHttpResponse 에 넘긴다. core/streaming.py)
+- ETag 는 파일 내용 hash (strong), Last-Modified 는 mtime.
+  If-None-Match / If-Modified-Since 가 맞으면 본문 없이 304 를 돌려준다.
+
+brotli 패키지는 선택 사항이다. 없으면 .br 을 만들지 않고 gzip 만 쓴다.
+"""
+
+import gzip
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .result_cache import write_atomic
+from .streaming import async_iterate, iter_file
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+
+# Accept-Encoding 이 둘 다 허용하면 앞의 것을 우선
+ENCODINGS = [
+    ("br", ".br"),
+    ("gzip", ".gz"),
+]
+
+
+def _compress(encoding: str, data: bytes):
+    if encoding == "br":
+        return brotli.compress(data, quality=11) if brotli is not None else None
+    if encoding == "gzip":
+        # mtime=0 으로 같은 입력이면 같은 결과 (ETag 가 흔들리지 않게)
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return None
+
+
+def precompress(path: Path):
+    """path 의 압축본들을 옆에 만든다. 압축해서 더 커지면 만들지 않는다. (worker 에서 호출)"""
+    path = Path(path)
+    data = path.read_bytes()
+    for encoding, suffix in ENCODINGS:
+        variant = path.with_name(path.name + suffix)
+        compressed = _compress(encoding, data)
+        if compressed is None or len(compressed) >= len(data):
+            variant.unlink(missing_ok=True)
+            continue
+        write_atomic(variant, compressed)
+
+
+@lru_cache(maxsize=256)
+def _content_hash(path: str, mtime_ns: int, size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:32]
+
+
+def _accepts(request, encoding: str) -> bool:
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        # q=0 은 명시적 거부
+        return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def serve_file(request, path: Path, content_type: str):
+    """path 를 조건부 GET / 사전 압축본을 지원하는 streaming 응답으로 내려준다."""
+    path = Path(path)
+
+    mtime_ns = path.stat().st_mtime_ns
+    chosen, encoding = path, None
+    for enc, suffix in ENCODINGS:
+        if not _accepts(request, enc):
+            continue
+        variant = path.with_name(path.name + suffix)
+        # 원본이 압축 뒤에 다시 써졌으면 압축본은 낡은 것이므로 쓰지 않는다
+        if variant.is_file() and variant.stat().st_mtime_ns >= mtime_ns:
+            chosen, encoding = variant, enc
+            break
+
+    stat = chosen.stat()
+    digest = _content_hash(str(chosen), stat.st_mtime_ns, stat.st_size)
+    # 같은 리소스라도 인코딩별로 bytes 가 다르므로 strong ETag 도 달라야 한다
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    last_modified = mtime_ns // 1_000_000_000
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is None:
+        response = StreamingHttpResponse(async_iterate(iter_file(chosen.open("rb"))), content_type=content_type)
+        response["Content-Length"] = str(stat.st_size)
+        if encoding:
+            response["Content-Encoding"] = encoding
+    else:
+        response = not_modified
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
@@ -0,0 +1,200 @@
+# core/incremental.py
+"""
+git blob hash 단위의 파일별 분석 결과 캐시 (cpplint / lizard).
+
+- git ls-files -s 로 분석 대상 소스의 blob hash 를 얻고
+  (cpplint 는 C/C++ 확장자, lizard 는 lizard 가 지원하는 모든 언어 — 둘 다 원래 --recursive / 전체 실행과 같은 범위)
+- 캐시에 없는(=바뀐) 파일만 tool 을 다시 돌린 뒤
+- 파일별 record 를 합쳐 cpplint_result.json / lizard_result.json 과 같은 형식으로 반환한다.
+
+캐시 위치: ANALYSIS_CACHE_DIR/blobs/<tool>/<fingerprint>/<key 앞 2자리>/<key>.json
+fingerprint 는 tool 버전 + core/script 버전이라, 둘 중 하나가 바뀌면 자연히 새 캐시를 쓴다.
+cpplint key 에는 파일 경로와 그 파일에 적용되는 CPPLINT.cfg 들의 blob hash 도 들어간다.
+"""
+
+import csv
+import hashlib
+import json
+import posixpath
+from pathlib import Path
+
+from django.conf import settings
+
+from . import result_cache, step_runs
+from .cpplint_runner import FILES_PER_INVOCATION, is_cpp_source, lint_files
+from .script.lizard_preprocessing import parse_lizard_rows
+from .stream_runner import iter_process_lines
+
+CPPLINT_CONFIG = "CPPLINT.cfg"
+
+
+def list_blobs(repo_dir: Path):
+    """repo 에 커밋된 일반 파일의 (path, blob hash) 목록 (path 순)."""
+    proc = step_runs.run(
+        ["git", "ls-files", "-s", "-z"],
+        cwd=str(repo_dir),
+        check=True,
+        capture_output=True,
+    )
+    blobs = []
+    for entry in proc.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        mode, blob, _stage = meta.split()
+        # submodule(160000) / symlink(120000) 은 제외
+        if not mode.startswith("100"):
+            continue
+        blobs.append((path, blob))
+    blobs.sort()
+    return blobs
+
+
+def list_source_blobs(repo_dir: Path, match=is_cpp_source):
+    """list_blobs() 중 match(path) 가 참인 소스만."""
+    return [(path, blob) for path, blob in list_blobs(repo_dir) if match(path)]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class BlobCache:
+    def __init__(self, tool: str):
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [result_cache.probe_tool_versions().get(tool), result_cache.preprocessing_version()]
+            ).encode("utf-8")
+        ).hexdigest()[:16]
+        self.root = Path(settings.ANALYSIS_CACHE_DIR) / "blobs" / tool / fingerprint
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, records):
+        result_cache.write_atomic(
+            self._path(key),
+            json.dumps(records, ensure_ascii=False).encode("utf-8"),
+        )
+
+
+def _run_incremental(repo_dir, tool, blobs, key_func, analyze, attach):
+    """
+    공통 흐름: blobs 의 (path, blob) 별로 캐시를 조회하고, miss 난 파일만 analyze(paths) 로 분석해
+    {path: records} 를 받아 캐시에 넣은 뒤 path 순서대로 합친다.
+    """
+    repo_dir = Path(repo_dir)
+    cache = BlobCache(tool)
+
+    per_file = {}
+    missing = []
+    for path, blob in blobs:
+        cached = cache.get(key_func(path, blob))
+        if cached is None:
+            missing.append(path)
+        else:
+            per_file[path] = cached
+
+    if missing:
+        fresh = analyze(repo_dir, missing)
+        for path, blob in blobs:
+            if path in per_file:
+                continue
+            records = fresh.get(path, [])
+            cache.put(key_func(path, blob), records)
+            per_file[path] = records
+
+    print(f"[incremental] {tool}: {len(blobs) - len(missing)} cached, {len(missing)} analyzed")
+
+    merged = []
+    for path, _blob in blobs:
+        merged.extend(attach(path, per_file[path]))
+    return merged
+
+
+# --- cpplint ---
+
+def _cpplint_key_func(blobs):
+    """
+    cpplint 는 파일 디렉토리부터 위로 올라가며 CPPLINT.cfg 를 읽으므로 (filter, linelength, exclude_files ...)
+    repo 루트부터 파일 디렉토리까지의 CPPLINT.cfg blob hash 를 key 에 넣는다.
+    header guard 등 cpplint 결과는 파일 경로에도 의존하므로 path 도 key 에 포함한다.
+    """
+    configs = {
+        posixpath.dirname(path): blob
+        for path, blob in blobs
+        if posixpath.basename(path) == CPPLINT_CONFIG
+    }
+
+    def key(path, blob):
+        parts = [blob, path]
+        directory = posixpath.dirname(path)
+        while True:
+            if directory in configs:
+                parts.append(f"{directory}/{configs[directory]}")
+            if not directory:
+                break
+            directory = posixpath.dirname(directory)
+        return hashlib.sha1("\0".join(parts).encode("utf-8", errors="surrogateescape")).hexdigest()
+
+    return key
+
+
+def run_cpplint_incremental(repo_dir: Path):
+    blobs = list_blobs(repo_dir)
+    return _run_incremental(
+        repo_dir,
+        "cpplint",
+        [(path, blob) for path, blob in blobs if is_cpp_source(path)],
+        _cpplint_key_func(blobs),
+        lint_files,  # 바뀐 파일들도 shard 로 나눠 병렬 검사
+        lambda path, records: records,
+    )
+
+
+# --- lizard ---
+
+def _lizard_key(path, blob):
+    # lizard 결과는 파일 내용에만 의존하므로 blob hash 만으로 key 를 만든다
+    return blob
+
+
+def measure_files(repo_dir: Path, paths):
+    """paths 를 lizard 로 분석해 {path: [function record ...]} 를 반환한다."""
+    by_file = {}
+    for chunk in _chunks(paths, FILES_PER_INVOCATION):
+        lines = iter_process_lines(["lizard", "--csv", *chunk], repo_dir, check=False)
+        for rec in parse_lizard_rows(csv.reader(lines)):
+            by_file.setdefault(rec["file"], []).append(rec)
+    return by_file
+
+
+def is_lizard_source(path: str) -> bool:
+    """lizard 가 언어를 인식하는 파일인지 (lizard 를 전체 repo 에 돌릴 때와 같은 기준)."""
+    # lizard 는 worker 이미지에만 설치되어 있으므로 여기서 import 한다
+    from lizard_languages import get_reader_for
+
+    return get_reader_for(path) is not None
+
+
+def run_lizard_incremental(repo_dir: Path):
+    # 같은 내용의 파일이 다른 경로에 있을 수 있으므로 file 은 merge 할 때 현재 경로로 덮어쓴다
+    return _run_incremental(
+        repo_dir,
+        "lizard",
+        list_source_blobs(repo_dir, match=is_lizard_source),
+        _lizard_key,
+        measure_files,
+        lambda path, records: [{**rec, "file": path} for rec in records],
+    )
@@ -0,0 +1,174 @@
+# core/lod_query.py
+"""
+전처리 때 만든 cg_lod.json (core/script/cg_lod.py) 조회.
+
+- level(): directory / file / function 중 한 단계 전체
+- expand(): 묶음 하나를 한 단계 아래로 펼친 자식 node 들, 자식끼리의 edge,
+  그리고 자식과 바깥 (펼친 묶음과 같은 단계의) 묶음 사이 edge
+
+cg_lod.json 은 web worker 프로세스마다 LRU 로 메모리에 올려 두고 (settings.CG_INDEX_CACHE_SIZE 개),
+파일이 다시 만들어지면 (mtime / size 가 바뀌면) 새로 읽는다.
+"""
+
+import json
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .result_cache import write_atomic
+from .result_query import QueryError
+from .script.cg_lod import LEVELS, LOD_FILENAME, build_lod
+
+
+def ensure_lod(repo_dir: Path) -> Path:
+    """cg_lod.json 이 없으면 (결과 캐시에서 복원한 경우 등) cg_filtered.json / functions.json 에서 한 번 만든다."""
+    repo_dir = Path(repo_dir)
+    path = repo_dir / LOD_FILENAME
+    if path.is_file():
+        return path
+
+    data = {}
+    for name in ("cg_filtered.json", "functions.json"):
+        src = repo_dir / name
+        if not src.is_file():
+            raise FileNotFoundError(f"{name} not found at {src}")
+        with src.open("r", encoding="utf-8") as f:
+            data[name] = json.load(f)
+    lod = build_lod(data["cg_filtered.json"], data["functions.json"])
+    write_atomic(path, json.dumps(lod, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    return path
+
+
+class LodIndex:
+    def __init__(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            self.levels = json.load(f)["levels"]
+
+        self.level_of = {}
+        self.nodes = {}
+        self.parent = {}
+        self.children = defaultdict(list)
+        # 단계별 node id -> [(상대 id, weight, 나가는 edge 여부)]
+        self.adjacent = {level: defaultdict(list) for level in LEVELS}
+        for level in LEVELS[:-1]:
+            for node in self.levels[level]["nodes"]:
+                self.level_of[node["id"]] = level
+                self.nodes[node["id"]] = node
+                self.parent[node["id"]] = node["parent"]
+                if node["parent"] is not None:
+                    self.children[node["parent"]].append(node["id"])
+            for e in self.levels[level]["edges"]:
+                self.adjacent[level][e["source"]].append((e["target"], e["weight"], True))
+                self.adjacent[level][e["target"]].append((e["source"], e["weight"], False))
+
+        # function 단계는 id 참조 + column 배열이라 (core/script/cg_lod.py) node dict 는 필요할 때 만든다
+        functions = self.levels[LEVELS[-1]]
+        file_ids = [node["id"] for node in self.levels["file"]["nodes"]]
+        self.function_row = {}
+        for i, (function_id, p) in enumerate(zip(functions["ids"], functions["parents"])):
+            self.level_of[function_id] = LEVELS[-1]
+            self.function_row[function_id] = i
+            self.parent[function_id] = file_ids[p]
+            self.children[file_ids[p]].append(function_id)
+        ids = functions["ids"]
+        adjacent = self.adjacent[LEVELS[-1]]
+        for s, t in functions["edges"]:
+            adjacent[ids[s]].append((ids[t], 1, True))
+            adjacent[ids[t]].append((ids[s], 1, False))
+
+    def node(self, node_id):
+        if node_id not in self.function_row:
+            return self.nodes[node_id]
+        i = self.function_row[node_id]
+        functions = self.levels[LEVELS[-1]]
+        return {
+            "id": node_id,
+            "name": node_id,
+            "parent": self.parent[node_id],
+            "functions": 1,
+            "nloc": functions["nloc"][i],
+            "ccn": functions["ccn"][i],
+            "ccn_max": functions["ccn"][i],
+            "warning": {level: values[i] for level, values in functions["warning"].items()},
+            "internal_edges": functions["internal_edges"][i],
+        }
+
+    def _ancestor(self, node_id, level):
+        while self.level_of.get(node_id) != level:
+            node_id = self.parent[node_id]
+        return node_id
+
+    def level(self, level):
+        if level != LEVELS[-1]:
+            return {"level": level, **self.levels[level]}
+        functions = self.levels[level]
+        ids = functions["ids"]
+        return {
+            "level": level,
+            "nodes": [self.node(function_id) for function_id in ids],
+            "edges": [{"source": ids[s], "target": ids[t], "weight": 1} for s, t in functions["edges"]],
+        }
+
+    def expand(self, cluster):
+        """cluster 의 자식들. 없는 id 면 KeyError, function 이면 QueryError."""
+        level = self.level_of[cluster]
+        child_level = LEVELS[LEVELS.index(level) + 1] if level != LEVELS[-1] else None
+        if child_level is None:
+            raise QueryError("function nodes cannot be expanded")
+
+        children = self.children.get(cluster, [])
+        inside = set(children)
+
+        edges = []
+        external = defaultdict(int)
+        for child in children:
+            for other, weight, outgoing in self.adjacent[child_level].get(child, ()):
+                if other in inside:
+                    if outgoing:
+                        edges.append({"source": child, "target": other, "weight": weight})
+                    continue
+                # 바깥 쪽은 펼친 묶음과 같은 단계의 묶음으로 합친다
+                outer = self._ancestor(other, level)
+                key = (child, outer) if outgoing else (outer, child)
+                external[key] += weight
+
+        return {
+            "cluster": cluster,
+            "level": child_level,
+            "nodes": [self.node(child) for child in children],
+            "edges": edges,
+            "external_edges": [
+                {"source": s, "target": t, "weight": w} for (s, t), w in sorted(external.items())
+            ],
+        }
+
+
+@lru_cache(maxsize=settings.CG_INDEX_CACHE_SIZE)
+def _load(path: str, mtime_ns: int, size: int) -> LodIndex:
+    return LodIndex(path)
+
+
+def load_lod(path: Path) -> LodIndex:
+    stat = Path(path).stat()
+    return _load(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def query(lod_path: Path, params):
+    """
+    params (request.query_params 와 같은 mapping):
+      - expand=<묶음 id> : 그 묶음을 한 단계 아래로 펼친다 ("dir:src", "file:src/a.c")
+      - level=directory|file|function (기본 directory) : expand 가 없을 때 돌려줄 단계
+    없는 묶음 id 면 KeyError.
+    """
+    lod = load_lod(lod_path)
+
+    cluster = params.get("expand")
+    if cluster:
+        return lod.expand(cluster)
+
+    level = params.get("level") or LEVELS[0]
+    if level not in LEVELS:
+        raise QueryError(f"level must be one of {', '.join(LEVELS)}")
+    return lod.level(level)
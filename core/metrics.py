@@ -0,0 +1,72 @@
+# core/metrics.py
+"""
+StepRun 기록을 Prometheus text format (0.0.4) 으로 내보낸다. (/api/metrics/)
+
+- infovis_step_runs_total{step, status}: 단계 실행 횟수
+- infovis_step_*: 단계 (tool) 별 histogram. bucket 별 개수는 DB 에서 조건부 COUNT 로 한 번에 센다.
+"""
+
+from django.db.models import Count, F, Q, Sum
+
+from .models import StepRun
+
+SECONDS_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+RSS_BUCKETS = tuple(2 ** p for p in range(26, 35))  # 64 MiB .. 16 GiB
+SIZE_BUCKETS = tuple(10 ** p for p in range(4, 11))  # 10 kB .. 10 GB
+
+# (이름, 설명, 값 expression, bucket 경계)
+HISTOGRAMS = (
+    ("infovis_step_wall_seconds", "Wall-clock time of one analysis step run.",
+     F("wall_seconds"), SECONDS_BUCKETS),
+    ("infovis_step_cpu_seconds", "User + system CPU time of the worker and its tool processes during one step run.",
+     F("cpu_user_seconds") + F("cpu_system_seconds"), SECONDS_BUCKETS),
+    ("infovis_step_max_rss_bytes", "Peak resident set size of the worker or one of its tool processes during one step run.",
+     F("max_rss_bytes"), RSS_BUCKETS),
+    ("infovis_step_input_bytes", "Total size of the files a step run read.",
+     F("input_bytes"), SIZE_BUCKETS),
+    ("infovis_step_output_bytes", "Total size of the files a step run produced.",
+     F("output_bytes"), SIZE_BUCKETS),
+)
+
+
+def _number(value) -> str:
+    value = float(value or 0)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _histogram(name, help_text, expression, buckets):
+    rows = (
+        StepRun.objects.alias(value=expression)
+        .filter(value__isnull=False)
+        .values("step")
+        .annotate(
+            count=Count("id"),
+            total=Sum("value"),
+            **{f"le_{i}": Count("id", filter=Q(value__lte=bound)) for i, bound in enumerate(buckets)},
+        )
+        .order_by("step")
+    )
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for row in rows:
+        for i, bound in enumerate(buckets):
+            lines.append(f"{name}_bucket{_labels(step=row['step'], le=_number(bound))} {row[f'le_{i}']}")
+        lines.append(f"{name}_bucket{_labels(step=row['step'], le='+Inf')} {row['count']}")
+        lines.append(f"{name}_sum{_labels(step=row['step'])} {_number(row['total'])}")
+        lines.append(f"{name}_count{_labels(step=row['step'])} {row['count']}")
+    return lines
+
+
+def render() -> str:
+    name = "infovis_step_runs_total"
+    lines = [f"# HELP {name} Number of analysis step runs.", f"# TYPE {name} counter"]
+    for row in StepRun.objects.values("step", "status").annotate(count=Count("id")).order_by("step", "status"):
+        lines.append(f"{name}{_labels(step=row['step'], status=row['status'])} {row['count']}")
+
+    for histogram in HISTOGRAMS:
+        lines.extend(_histogram(*histogram))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_analysistask_clang_path_analysistask_cpplint_path_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysistask',
+            name='current_step',
+            field=models.CharField(choices=[('NONE', '시작 전'), ('CLONING', 'GIT Clone'), ('CLANG', 'Clang Build'), ('INFER', 'Infer 분석'), ('CPPLINT', 'Cpplint 분석'), ('LIZARD', 'Lizard 분석'), ('PREPROCESSING', '전처리'), ('CLEANUP', 'Repo 삭제')], default='NONE', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='AnalysisStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.CharField(choices=[('NONE', '시작 전'), ('CLONING', 'GIT Clone'), ('CLANG', 'Clang Build'), ('INFER', 'Infer 분석'), ('CPPLINT', 'Cpplint 분석'), ('LIZARD', 'Lizard 분석'), ('PREPROCESSING', '전처리'), ('CLEANUP', 'Repo 삭제')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', '대기 중'), ('RUNNING', '실행 중'), ('COMPLETED', '완료'), ('FAILED', '실패')], default='PENDING', max_length=20)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='core.analysistask')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='analysisstep',
+            constraint=models.UniqueConstraint(fields=('task', 'step'), name='unique_task_step'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_analysisstep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysistask',
+            name='commit_sha',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_analysistask_commit_sha'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CallEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=500)),
+                ('target', models.CharField(max_length=500)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='call_edges', to='core.analysistask')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'source'], name='core_called_task_id_750cfa_idx'), models.Index(fields=['task', 'target'], name='core_called_task_id_d3fa87_idx'), models.Index(fields=['target'], name='core_called_target_3e854d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Function',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(max_length=500)),
+                ('function', models.CharField(max_length=500)),
+                ('nloc', models.IntegerField(null=True)),
+                ('ccn', models.IntegerField(null=True)),
+                ('param', models.IntegerField(null=True)),
+                ('length', models.IntegerField(null=True)),
+                ('start_line', models.IntegerField(null=True)),
+                ('end_line', models.IntegerField(null=True)),
+                ('in_degree', models.IntegerField(default=0)),
+                ('out_degree', models.IntegerField(default=0)),
+                ('degree', models.IntegerField(default=0)),
+                ('warning_high', models.IntegerField(default=0)),
+                ('warning_mid', models.IntegerField(default=0)),
+                ('warning_low', models.IntegerField(default=0)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='functions', to='core.analysistask')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'file', 'start_line'], name='core_functi_task_id_e08891_idx'), models.Index(fields=['task', 'function'], name='core_functi_task_id_6b3208_idx'), models.Index(fields=['function'], name='core_functi_functio_9845af_idx'), models.Index(fields=['ccn'], name='core_functi_ccn_b4b773_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Warning',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('warning_id', models.TextField()),
+                ('file', models.CharField(max_length=500)),
+                ('function', models.CharField(blank=True, max_length=500, null=True)),
+                ('line', models.IntegerField(null=True)),
+                ('column', models.IntegerField(null=True)),
+                ('tool', models.CharField(max_length=20)),
+                ('severity_level', models.CharField(max_length=10)),
+                ('severity', models.CharField(blank=True, max_length=50, null=True)),
+                ('category', models.CharField(blank=True, max_length=200, null=True)),
+                ('warning', models.CharField(blank=True, max_length=200, null=True)),
+                ('detail', models.TextField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='warnings', to='core.analysistask')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'file', 'line'], name='core_warnin_task_id_328cec_idx'), models.Index(fields=['task', 'function'], name='core_warnin_task_id_36d2aa_idx'), models.Index(fields=['task', 'severity_level'], name='core_warnin_task_id_4bfe18_idx'), models.Index(fields=['tool', 'warning'], name='core_warnin_tool_21e233_idx')],
+            },
+        ),
+    ]
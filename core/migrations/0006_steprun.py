@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_calledge_function_warning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StepRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.CharField(choices=[('NONE', '시작 전'), ('CLONING', 'GIT Clone'), ('CLANG', 'Clang Build'), ('INFER', 'Infer 분석'), ('CPPLINT', 'Cpplint 분석'), ('LIZARD', 'Lizard 분석'), ('PREPROCESSING', '전처리'), ('CLEANUP', 'Repo 삭제')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', '대기 중'), ('RUNNING', '실행 중'), ('COMPLETED', '완료'), ('FAILED', '실패')], max_length=20)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('wall_seconds', models.FloatField()),
+                ('cpu_user_seconds', models.FloatField()),
+                ('cpu_system_seconds', models.FloatField()),
+                ('max_rss_bytes', models.BigIntegerField()),
+                ('input_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('output_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('exit_code', models.IntegerField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='core.analysistask')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['step', 'finished_at'], name='core_stepru_step_508943_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_steprun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysistask',
+            name='profile',
+            field=models.BooleanField(default=False),
+        ),
+    ]
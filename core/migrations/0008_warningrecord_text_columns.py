@@ -0,0 +1,77 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_analysistask_profile'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='Warning',
+            new_name='WarningRecord',
+        ),
+        migrations.AlterField(
+            model_name='calledge',
+            name='source',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='calledge',
+            name='target',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='function',
+            name='file',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='function',
+            name='function',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='warningrecord',
+            name='file',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='warningrecord',
+            name='function',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='warningrecord',
+            name='category',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='warningrecord',
+            name='warning',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RenameIndex(
+            model_name='warningrecord',
+            new_name='core_warnin_task_id_739849_idx',
+            old_name='core_warnin_task_id_328cec_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='warningrecord',
+            new_name='core_warnin_task_id_6060c5_idx',
+            old_name='core_warnin_task_id_36d2aa_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='warningrecord',
+            new_name='core_warnin_task_id_59eba7_idx',
+            old_name='core_warnin_task_id_4bfe18_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='warningrecord',
+            new_name='core_warnin_tool_225af5_idx',
+            old_name='core_warnin_tool_21e233_idx',
+        ),
+    ]
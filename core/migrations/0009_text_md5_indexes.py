@@ -0,0 +1,86 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_warningrecord_text_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='calledge',
+            name='core_called_task_id_750cfa_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='calledge',
+            name='core_called_task_id_d3fa87_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='calledge',
+            name='core_called_target_3e854d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='function',
+            name='core_functi_task_id_e08891_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='function',
+            name='core_functi_task_id_6b3208_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='function',
+            name='core_functi_functio_9845af_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='warningrecord',
+            name='core_warnin_task_id_739849_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='warningrecord',
+            name='core_warnin_task_id_6060c5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='warningrecord',
+            name='core_warnin_tool_225af5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='calledge',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('source'), name='core_edge_task_src_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calledge',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('target'), name='core_edge_task_tgt_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calledge',
+            index=models.Index(django.db.models.functions.text.MD5('target'), name='core_edge_tgt_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='function',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('file'), models.F('start_line'), name='core_func_task_file_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='function',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('function'), name='core_func_task_func_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='function',
+            index=models.Index(django.db.models.functions.text.MD5('function'), name='core_func_func_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warningrecord',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('file'), models.F('line'), name='core_warn_task_file_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warningrecord',
+            index=models.Index(models.F('task'), django.db.models.functions.text.MD5('function'), name='core_warn_task_func_md5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warningrecord',
+            index=models.Index(models.F('tool'), django.db.models.functions.text.MD5('warning'), name='core_warn_tool_warn_md5_idx'),
+        ),
+    ]
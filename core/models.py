@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import MD5
 
 class AnalysisTask(models.Model):
     # 1. 상태 필드 (결과 상태만 명확히 표시)
@@ -22,6 +24,8 @@ class AnalysisTask(models.Model):
     ]
     
     github_url = models.URLField(max_length=500)
+    # 분석한 HEAD commit (결과 캐시 key)
+    commit_sha = models.CharField(max_length=40, null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     current_step = models.CharField(max_length=20, choices=STEP_CHOICES, default='NONE')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -33,9 +37,146 @@ class AnalysisTask(models.Model):
     lizard_path = models.CharField(max_length=255, null=True, blank=True)
     clang_path = models.CharField(max_length=255, null=True, blank=True)
 
+    # True 이면 전처리 stage 마다 cProfile / tracemalloc 결과를 남긴다 (시작할 때만 지정)
+    profile = models.BooleanField(default=False)
+
     # 최종 시각화 데이터 저장 (PostgreSQL의 JSONField 사용)
     result_data = models.JSONField(null=True, blank=True) 
     error_message = models.TextField(null=True, blank=True)
     
     def __str__(self):
         return f"Task {self.id} - {self.status}"
+
+
+class AnalysisStep(models.Model):
+    """
+    Task 의 단계별 상태.
+    여러 분석 단계가 동시에 실행될 때 AnalysisTask 한 row 의 status/current_step 을
+    서로 덮어쓰지 않도록 단계마다 별도 row 에 기록한다.
+    """
+    task = models.ForeignKey(AnalysisTask, on_delete=models.CASCADE, related_name='steps')
+    step = models.CharField(max_length=20, choices=AnalysisTask.STEP_CHOICES)
+    status = models.CharField(max_length=20, choices=AnalysisTask.STATUS_CHOICES, default='PENDING')
+    error_message = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'step'], name='unique_task_step'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} - {self.step} - {self.status}"
+
+
+class StepRun(models.Model):
+    """
+    단계 한 번 실행의 자원 사용 기록 (같은 단계를 다시 실행하면 row 가 하나 더 생긴다).
+    worker pool 용량 산정용: 시간 / CPU / 메모리 / 입출력 크기를 tool 별로 비교한다.
+    """
+    task = models.ForeignKey(AnalysisTask, on_delete=models.CASCADE, related_name='runs')
+    step = models.CharField(max_length=20, choices=AnalysisTask.STEP_CHOICES)
+    status = models.CharField(max_length=20, choices=AnalysisTask.STATUS_CHOICES)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    wall_seconds = models.FloatField()
+    # worker 프로세스 자신 + 기다린 자식 프로세스들의 CPU 시간 (getrusage 차이)
+    cpu_user_seconds = models.FloatField()
+    cpu_system_seconds = models.FloatField()
+    # 단계가 끝난 시점의 최대 RSS (worker / 자식 프로세스 중 큰 쪽, byte)
+    max_rss_bytes = models.BigIntegerField()
+    # 단계가 읽은 입력 / 남긴 산출물 파일 크기 합 (해당 없으면 None)
+    input_bytes = models.BigIntegerField(null=True, blank=True)
+    output_bytes = models.BigIntegerField(null=True, blank=True)
+    # 외부 tool 프로세스의 종료 코드 (worker 안에서만 실행한 단계는 None)
+    exit_code = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['step', 'finished_at']),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} - {self.step} run ({self.wall_seconds:.1f}s)"
+
+
+# --- 분석 결과 (전처리 결과 파일을 DB 에 적재, repo 디렉토리를 지워도 조회 가능) ---
+# 이름 / 경로 / 메시지 TextField 는 길이 제한이 없어 btree 에 그대로 넣으면 PostgreSQL 의 index row 크기
+# 제한(약 2.7KB)을 넘을 수 있으므로 MD5(column) expression 으로 index 한다.
+# 조회는 result_store.filter_text() 로 같은 expression 을 거쳐야 index 를 탄다.
+
+class Function(models.Model):
+    """functions.json 의 function 한 개 (lizard 지표 + call graph degree + warning 수)."""
+    task = models.ForeignKey(AnalysisTask, on_delete=models.CASCADE, related_name='functions')
+    # C++ template / lambda 이름은 수천 자가 되기도 하므로 길이 제한 없는 TextField
+    file = models.TextField()
+    function = models.TextField()
+    nloc = models.IntegerField(null=True)
+    ccn = models.IntegerField(null=True)
+    param = models.IntegerField(null=True)
+    length = models.IntegerField(null=True)
+    start_line = models.IntegerField(null=True)
+    end_line = models.IntegerField(null=True)
+    in_degree = models.IntegerField(default=0)
+    out_degree = models.IntegerField(default=0)
+    degree = models.IntegerField(default=0)
+    warning_high = models.IntegerField(default=0)
+    warning_mid = models.IntegerField(default=0)
+    warning_low = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(F('task'), MD5('file'), F('start_line'), name='core_func_task_file_md5_idx'),
+            models.Index(F('task'), MD5('function'), name='core_func_task_func_md5_idx'),
+            models.Index(MD5('function'), name='core_func_func_md5_idx'),
+            models.Index(fields=['ccn']),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} - {self.file}:{self.function}"
+
+
+class WarningRecord(models.Model):
+    """warnings.json 의 warning 한 개 (cpplint / infer). builtin Warning 과 겹치지 않는 이름."""
+    task = models.ForeignKey(AnalysisTask, on_delete=models.CASCADE, related_name='warnings')
+    # merge_warnings 가 만든 "file@function@line@warning" id
+    warning_id = models.TextField()
+    file = models.TextField()
+    function = models.TextField(null=True, blank=True)
+    line = models.IntegerField(null=True)
+    column = models.IntegerField(null=True)
+    tool = models.CharField(max_length=20)
+    severity_level = models.CharField(max_length=10)
+    severity = models.CharField(max_length=50, null=True, blank=True)
+    category = models.TextField(null=True, blank=True)
+    warning = models.TextField(null=True, blank=True)
+    detail = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(F('task'), MD5('file'), F('line'), name='core_warn_task_file_md5_idx'),
+            models.Index(F('task'), MD5('function'), name='core_warn_task_func_md5_idx'),
+            models.Index(fields=['task', 'severity_level']),
+            models.Index(F('tool'), MD5('warning'), name='core_warn_tool_warn_md5_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} - {self.warning_id}"
+
+
+class CallEdge(models.Model):
+    """cg_filtered.json 의 edge 한 개 (caller -> callee 함수 이름)."""
+    task = models.ForeignKey(AnalysisTask, on_delete=models.CASCADE, related_name='call_edges')
+    source = models.TextField()
+    target = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(F('task'), MD5('source'), name='core_edge_task_src_md5_idx'),
+            models.Index(F('task'), MD5('target'), name='core_edge_task_tgt_md5_idx'),
+            models.Index(MD5('target'), name='core_edge_tgt_md5_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} - {self.source} -> {self.target}"
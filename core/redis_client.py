@@ -0,0 +1,21 @@
+# core/redis_client.py
+"""
+events (pub/sub publish) 와 status_cache 가 같이 쓰는 sync Redis client.
+
+프로세스마다 하나만 만들어 connection pool 을 공유한다. 연결 / 응답이 늦으면 SOCKET_TIMEOUT 초 뒤
+redis.RedisError 를 던지므로, 쓰는 쪽은 그 예외를 잡아 Redis 없이 계속 동작한다.
+"""
+
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+SOCKET_TIMEOUT = 5
+
+
+@lru_cache(maxsize=1)
+def get_client() -> redis.Redis:
+    return redis.Redis.from_url(
+        settings.REDIS_URL, socket_timeout=SOCKET_TIMEOUT, socket_connect_timeout=SOCKET_TIMEOUT,
+    )
@@ -0,0 +1,22 @@
+# core/renderers.py
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from .script.columnar import CONTENT_TYPE
+
+
+class ColumnarRenderer(BaseRenderer):
+    """
+    Accept: application/vnd.infovis.columnar 요청에 .bin (core/script/columnar.py 형식) 을 그대로 내려준다.
+    에러 응답처럼 bytes 가 아닌 데이터는 JSON 으로 직렬화한다.
+    """
+    media_type = CONTENT_TYPE
+    format = 'bin'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
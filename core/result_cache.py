@@ -0,0 +1,266 @@
+# core/result_cache.py
+"""
+(github_url, commit SHA, tool 버전) 단위의 최종 결과 캐시.
+
+디렉토리 구조 (ANALYSIS_CACHE_DIR/results):
+  objects/<sha256 앞 2자리>/<sha256>   결과 파일 내용 (content-addressed, 동일 내용은 한 번만 저장)
+  entries/<cache key>.json             결과 파일 이름 -> object hash manifest
+  tool_versions.json                   worker 가 마지막으로 확인한 분석 tool 버전
+
+저장과 조회 모두 worker 에서 한다. tool 버전은 결과를 저장할 때 확인해 tool_versions.json 에 남기고,
+조회할 때는 tool 을 다시 실행하지 않고 그 파일을 읽어 key 를 만든다.
+
+전체 크기 상한은 RESULT_CACHE_MAX_BYTES. 넘으면 가장 오래 쓰이지 않은(manifest mtime 기준) entry 부터 지우고,
+어느 entry 도 참조하지 않는 object 를 정리한다.
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .script.file_cache import touch, write_atomic
+
+RESULT_FILES = [
+    "cg_filtered.json", "warnings.json", "functions.json",
+    "cg_filtered.bin", "functions.bin", "cg_lod.json",
+]
+
+TOOL_VERSION_COMMANDS = {
+    "clang": ["clang", "--version"],
+    "opt": ["opt", "--version"],
+    "infer": ["infer", "--version"],
+    "cpplint": ["cpplint", "--version"],
+    "lizard": ["lizard", "--version"],
+}
+
+SCRIPT_DIR = Path(__file__).resolve().parent / "script"
+
+
+def get_cache_root() -> Path:
+    return Path(settings.ANALYSIS_CACHE_DIR) / "results"
+
+
+def normalize_github_url(github_url: str) -> str:
+    url = github_url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+    return url
+
+
+def resolve_commit_sha(github_url: str, timeout: int = 30):
+    """clone 없이 원격 HEAD 의 commit SHA 를 조회한다. 실패하면 None."""
+    try:
+        proc = subprocess.run(
+            ["git", "ls-remote", github_url, "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1] == "HEAD":
+            return parts[0]
+    return None
+
+
+def read_commit_sha(repo_dir: Path):
+    """clone 된 repo 의 HEAD commit SHA. 실패하면 None."""
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(repo_dir),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    return proc.stdout.strip() or None
+
+
+@lru_cache(maxsize=1)
+def preprocessing_version() -> str:
+    """core/script 소스가 바뀌면 결과도 바뀌므로 스크립트 내용 hash 를 버전으로 쓴다."""
+    h = hashlib.sha256()
+    for path in sorted(SCRIPT_DIR.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def probe_tool_versions() -> dict:
+    """worker 에 설치된 분석 tool 들의 버전 문자열 (첫 줄)."""
+    versions = {}
+    for tool, cmd in TOOL_VERSION_COMMANDS.items():
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            out = (proc.stdout or proc.stderr).strip()
+            versions[tool] = out.splitlines()[0] if out else ""
+        except (OSError, subprocess.TimeoutExpired):
+            versions[tool] = None
+    return versions
+
+
+def load_tool_versions():
+    path = get_cache_root() / "tool_versions.json"
+    if not path.is_file():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cache_key(github_url: str, commit_sha: str, tool_versions: dict) -> str:
+    payload = json.dumps(
+        {
+            "github_url": normalize_github_url(github_url),
+            "commit_sha": commit_sha,
+            "tools": tool_versions,
+            "preprocessing": preprocessing_version(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _object_path(digest: str) -> Path:
+    return get_cache_root() / "objects" / digest[:2] / digest
+
+
+def store_results(github_url: str, commit_sha: str, repo_dir: Path) -> str:
+    """repo_dir 의 최종 결과 파일들을 캐시에 저장하고 cache key 를 반환한다. (worker 에서 호출)"""
+    root = get_cache_root()
+    tool_versions = probe_tool_versions()
+    write_atomic(
+        root / "tool_versions.json",
+        json.dumps(tool_versions, sort_keys=True, indent=2).encode("utf-8"),
+    )
+
+    files = {}
+    for filename in RESULT_FILES:
+        src = Path(repo_dir) / filename
+        if not src.is_file():
+            continue
+        data = src.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        obj = _object_path(digest)
+        if not obj.is_file():
+            write_atomic(obj, data)
+        files[filename] = digest
+
+    key = cache_key(github_url, commit_sha, tool_versions)
+    manifest = {
+        "github_url": normalize_github_url(github_url),
+        "commit_sha": commit_sha,
+        "tools": tool_versions,
+        "preprocessing": preprocessing_version(),
+        "files": files,
+    }
+    write_atomic(
+        root / "entries" / f"{key}.json",
+        json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"),
+    )
+    return key
+
+
+def restore_results(github_url: str, commit_sha: str, repo_dir: Path) -> bool:
+    """캐시에 결과가 있으면 repo_dir 로 복사하고 True 를 반환한다. (worker 에서 호출)"""
+    tool_versions = load_tool_versions()
+    if tool_versions is None:
+        return False
+
+    manifest_path = get_cache_root() / "entries" / f"{cache_key(github_url, commit_sha, tool_versions)}.json"
+    if not manifest_path.is_file():
+        return False
+
+    with manifest_path.open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    files = manifest.get("files", {})
+    if not files or not all(_object_path(d).is_file() for d in files.values()):
+        return False
+
+    repo_dir = Path(repo_dir)
+    repo_dir.mkdir(parents=True, exist_ok=True)
+    for filename, digest in files.items():
+        shutil.copyfile(_object_path(digest), repo_dir / filename)
+
+    # hit 이면 manifest mtime 을 갱신해 evict() 의 LRU 순서에 반영
+    touch(manifest_path)
+    return True
+
+
+def _referenced_objects(manifest_path: Path):
+    try:
+        with manifest_path.open("r", encoding="utf-8") as f:
+            return set(json.load(f).get("files", {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def evict(max_bytes: int = None):
+    """캐시 전체 크기가 max_bytes 를 넘으면 오래된 entry 부터 90% 이하가 될 때까지 지운다. (worker 에서 호출)"""
+    if max_bytes is None:
+        max_bytes = settings.RESULT_CACHE_MAX_BYTES
+    root = get_cache_root()
+
+    entries = []
+    for path in (root / "entries").glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    objects = {}
+    for path in (root / "objects").glob("*/*"):
+        try:
+            objects[path.name] = (path, path.stat().st_size)
+        except OSError:
+            continue
+
+    total = sum(size for _path, size in objects.values())
+    if total <= max_bytes:
+        return
+
+    # 오래된 entry 부터, 그 entry 만 쓰던 object 가 풀리면서 목표 크기 아래로 내려갈 때까지 지운다
+    entries.sort()
+    refcount = {}
+    refs = {}
+    for _mtime, path in entries:
+        refs[path] = _referenced_objects(path)
+        for digest in refs[path]:
+            refcount[digest] = refcount.get(digest, 0) + 1
+
+    target = int(max_bytes * 0.9)
+    for _mtime, path in entries:
+        if total <= target:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        for digest in refs[path]:
+            refcount[digest] -= 1
+            if refcount[digest] == 0 and digest in objects:
+                obj, size = objects.pop(digest)
+                try:
+                    obj.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+    # 어느 entry 에도 없는 object (저장 도중 실패 등) 도 함께 정리
+    for digest, (obj, _size) in objects.items():
+        if refcount.get(digest, 0) == 0:
+            try:
+                obj.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,211 @@
+# core/result_query.py
+"""
+전처리 때 만든 results.sqlite3 (core/script/result_index.py) 에 대한 필터 / 필드 선택 / 정렬 / cursor 페이지네이션.
+
+cursor 는 마지막으로 내려준 row 의 (값 없음 여부, 정렬 key, rowid) 를 base64 로 감싼 값이라
+몇 번째 페이지든 OFFSET 없이 index 를 타고 바로 이어서 읽는다.
+값이 있는 row 와 NULL row 는 따로 조회해 이어 붙인다. 각각 (column, rowid) index 순서 그대로라
+페이지마다 전체를 정렬하지 않는다.
+"""
+
+import base64
+import json
+import sqlite3
+from pathlib import Path
+
+from .script.result_index import (
+    FUNCTION_COLUMNS, FUNCTION_SORTABLE, INDEX_FILENAME, WARNING_COLUMNS, WARNING_SORTABLE,
+    build_result_index, quote,
+)
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class QueryError(ValueError):
+    """잘못된 query parameter (400 으로 응답)."""
+
+
+# table 별: 응답 field -> column, 필터 parameter -> (column, SQL 연산자)
+TABLES = {
+    "warnings": {
+        "fields": [c for c, _ in WARNING_COLUMNS],
+        "filters": {
+            "file": ("file", "="),
+            "function": ("function", "="),
+            "tool": ("tool", "="),
+            "severity_level": ("severity_level", "="),
+            "line_min": ("line", ">="),
+            "line_max": ("line", "<="),
+        },
+        "sortable": WARNING_SORTABLE,
+        "default_sort": "file",
+    },
+    "functions": {
+        "fields": [c for c, _ in FUNCTION_COLUMNS if not c.startswith("warning_")] + ["warning"],
+        "filters": {
+            "file": ("file", "="),
+            "function": ("function", "="),
+            "ccn_min": ("CCN", ">="),
+            "ccn_max": ("CCN", "<="),
+            "recursive": ("recursive", "="),
+            "call_depth_min": ("call_depth", ">="),
+            "call_depth_max": ("call_depth", "<="),
+        },
+        "sortable": FUNCTION_SORTABLE,
+        "default_sort": "file",
+    },
+}
+
+INT_FILTERS = {"line_min", "line_max", "ccn_min", "ccn_max", "recursive", "call_depth_min", "call_depth_max"}
+WARNING_LEVELS = {"warning_high": "HIGH", "warning_mid": "MID", "warning_low": "LOW"}
+
+
+def ensure_index(repo_dir: Path) -> Path:
+    """results.sqlite3 가 없으면 (결과 캐시에서 복원한 경우 등) JSON 에서 한 번 만든다."""
+    repo_dir = Path(repo_dir)
+    path = repo_dir / INDEX_FILENAME
+    if path.is_file():
+        return path
+
+    data = {}
+    for name in ("warnings.json", "functions.json"):
+        src = repo_dir / name
+        if not src.is_file():
+            raise FileNotFoundError(f"{name} not found at {src}")
+        with src.open("r", encoding="utf-8") as f:
+            data[name] = json.load(f)
+    build_result_index(data["warnings.json"], data["functions.json"], repo_dir)
+    return path
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise QueryError("invalid cursor")
+    if not isinstance(values, list) or len(values) != 3:
+        raise QueryError("invalid cursor")
+    return values
+
+
+def _columns_for(table, fields):
+    columns = []
+    for field in fields:
+        if table == "functions" and field == "warning":
+            columns.extend(WARNING_LEVELS)
+        else:
+            columns.append(field)
+    return columns
+
+
+def _to_record(table, fields, row):
+    rec = {}
+    for field in fields:
+        if table == "functions" and field == "warning":
+            rec["warning"] = {level: row[col] for col, level in WARNING_LEVELS.items()}
+        else:
+            rec[field] = row[field]
+    return rec
+
+
+def query(db_path: Path, table: str, params):
+    """
+    params (request.query_params 와 같은 mapping) 으로 table 을 조회한다.
+      - 필터: TABLES[table]["filters"] 의 key
+      - fields=a,b,c : 응답에 포함할 field
+      - sort=field 또는 sort=-field : 정렬 (값이 없는 row 는 오름차순에서 마지막)
+      - limit (기본 100, 최대 1000), cursor : 페이지네이션
+    반환: {"results": [...], "next_cursor": str | None}
+    """
+    spec = TABLES[table]
+
+    fields = spec["fields"]
+    if params.get("fields"):
+        fields = [f.strip() for f in params["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in spec["fields"]]
+        if unknown:
+            raise QueryError(f"unknown fields: {', '.join(unknown)}")
+
+    sort = params.get("sort") or spec["default_sort"]
+    descending = sort.startswith("-")
+    sort_field = sort.lstrip("-")
+    if sort_field not in spec["sortable"]:
+        raise QueryError(f"cannot sort by {sort_field}")
+
+    try:
+        limit = int(params.get("limit") or DEFAULT_LIMIT)
+    except ValueError:
+        raise QueryError("limit must be an integer")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    where = []
+    args = []
+    for name, (column, op) in spec["filters"].items():
+        value = params.get(name)
+        if value is None or value == "":
+            continue
+        if name in INT_FILTERS:
+            try:
+                value = int(value)
+            except ValueError:
+                raise QueryError(f"{name} must be an integer")
+        where.append(f"{quote(column)} {op} ?")
+        args.append(value)
+
+    # 오름차순: 값이 있는 row (column, rowid 순) 다음에 NULL row (rowid 순). 내림차순은 그 반대.
+    # 두 구간 모두 (column, rowid) index 를 그대로 읽는다.
+    col = quote(sort_field)
+    segments = [1, 0] if descending else [0, 1]
+    after = None
+    if params.get("cursor"):
+        after = decode_cursor(params["cursor"])
+        if after[0] not in segments:
+            raise QueryError("invalid cursor")
+        segments = segments[segments.index(after[0]):]
+
+    op = "<" if descending else ">"
+    direction = "DESC" if descending else "ASC"
+    select = ", ".join(quote(c) for c in _columns_for(table, fields))
+
+    rows = []
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        for is_null in segments:
+            seg_where = where + [f"{col} IS NULL" if is_null else f"{col} IS NOT NULL"]
+            seg_args = list(args)
+            if after is not None and after[0] == is_null:
+                if is_null:
+                    seg_where.append(f"rowid {op} ?")
+                    seg_args.append(after[2])
+                else:
+                    seg_where.append(f"({col}, rowid) {op} (?, ?)")
+                    seg_args.extend(after[1:])
+            order_by = f"rowid {direction}" if is_null else f"{col} {direction}, rowid {direction}"
+            sql = (
+                f"SELECT {select}, {col} AS _k1, rowid AS _k2 FROM {table}"
+                f" WHERE {' AND '.join(seg_where)} ORDER BY {order_by} LIMIT ?"
+            )
+            seg_args.append(limit + 1 - len(rows))
+            rows.extend((is_null, row) for row in conn.execute(sql, seg_args))
+            if len(rows) > limit:
+                break
+    finally:
+        conn.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        is_null, last = rows[-1]
+        next_cursor = encode_cursor([is_null, last["_k1"], last["_k2"]])
+
+    return {
+        "results": [_to_record(table, fields, row) for _, row in rows],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,136 @@
+# core/result_store.py
+"""
+전처리 결과 파일(functions.json / warnings.json / cg_filtered.json)을 Function / WarningRecord / CallEdge 테이블에 적재.
+
+- 한 task 의 적재는 한 transaction 이다. 다시 적재하면 이전 row 를 지우고 새로 넣는다.
+- PostgreSQL 에서는 COPY FROM STDIN 으로 한 번에 넣고, 그 외 DB(sqlite 개발 환경)는 batch bulk_create 를 쓴다.
+- 이름 / 경로 같은 TextField 는 MD5 expression index 만 있으므로 filter_text() 로 조회한다.
+"""
+
+import hashlib
+import io
+
+from django.db import connection, transaction
+from django.db.models.functions import MD5
+
+from .models import CallEdge, Function, WarningRecord
+
+BULK_BATCH_SIZE = 5000
+
+
+def filter_text(queryset, **values):
+    """
+    queryset.filter(field=value) 와 같은 결과를, TextField 의 MD5(field) index 를 타도록 조회한다.
+    예: filter_text(CallEdge.objects.filter(task_id=1), target="main")
+    """
+    aliases = {}
+    lookups = {}
+    for field, value in values.items():
+        aliases[f"{field}_md5"] = MD5(field)
+        lookups[f"{field}_md5"] = hashlib.md5(value.encode("utf-8", errors="surrogatepass")).hexdigest()
+        # hash 충돌 대비로 원래 값도 비교 (index 로 좁힌 row 에만 적용된다).
+        # sqlite 는 col = 값 조건이 있으면 MD5(col) 을 상수로 바꿔 버려 index 를 못 타므로 PostgreSQL 에서만.
+        if connection.vendor == "postgresql":
+            lookups[field] = value
+    return queryset.alias(**aliases).filter(**lookups)
+
+
+def _function_rows(task_id, functions_data):
+    for f in functions_data:
+        counts = f.get("warning") or {}
+        yield {
+            "task_id": task_id,
+            "file": f.get("file") or "",
+            "function": f.get("function") or "",
+            "nloc": f.get("NLOC"),
+            "ccn": f.get("CCN"),
+            "param": f.get("param"),
+            "length": f.get("length"),
+            "start_line": f.get("start_line"),
+            "end_line": f.get("end_line"),
+            "in_degree": f.get("in_degree") or 0,
+            "out_degree": f.get("out_degree") or 0,
+            "degree": f.get("degree") or 0,
+            "warning_high": counts.get("HIGH", 0),
+            "warning_mid": counts.get("MID", 0),
+            "warning_low": counts.get("LOW", 0),
+        }
+
+
+def _warning_rows(task_id, warnings_data):
+    for w in warnings_data:
+        yield {
+            "task_id": task_id,
+            "warning_id": w.get("id") or "",
+            "file": w.get("file") or "",
+            "function": w.get("function") or None,
+            "line": w.get("line"),
+            "column": w.get("column"),
+            "tool": w.get("tool") or "",
+            "severity_level": w.get("severity_level") or "",
+            "severity": w.get("severity"),
+            "category": w.get("category"),
+            "warning": w.get("warning"),
+            "detail": w.get("detail"),
+        }
+
+
+def _edge_rows(task_id, cg_data):
+    for e in cg_data.get("edges", []):
+        yield {"task_id": task_id, "source": e["source"], "target": e["target"]}
+
+
+# --- PostgreSQL COPY ---
+
+def _copy_value(value):
+    """COPY text 형식 한 칸 (NULL 은 \\N, 구분자 / 줄바꿈 / backslash 는 escape)."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_rows(model, rows):
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    buf = io.StringIO()
+    count = 0
+    for row in rows:
+        buf.write("\t".join(_copy_value(row[f.attname]) for f in fields))
+        buf.write("\n")
+        count += 1
+    buf.seek(0)
+
+    columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+    with connection.cursor() as cursor:
+        # Django cursor wrapper 안의 psycopg2 cursor
+        cursor.cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN",
+            buf,
+        )
+    return count
+
+
+def _bulk_create_rows(model, rows):
+    objs = [model(**row) for row in rows]
+    model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+    return len(objs)
+
+
+def ingest_results(task_id: int, functions_data, warnings_data, cg_data) -> dict:
+    """전처리 결과(파싱된 JSON)를 DB 에 적재하고 테이블별 row 수를 반환한다. (worker 에서 호출)"""
+    insert = _copy_rows if connection.vendor == "postgresql" else _bulk_create_rows
+
+    with transaction.atomic():
+        for model in (Function, WarningRecord, CallEdge):
+            model.objects.filter(task_id=task_id).delete()
+
+        return {
+            "functions": insert(Function, _function_rows(task_id, functions_data)),
+            "warnings": insert(WarningRecord, _warning_rows(task_id, warnings_data)),
+            "call_edges": insert(CallEdge, _edge_rows(task_id, cg_data)),
+        }
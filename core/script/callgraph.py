@@ -0,0 +1,123 @@
+"""
+callgraph.py
+cg_preprocessing / cg_filter 가 같이 쓰는 정수 id 기반 call graph.
+
+- node 는 0..n-1 정수 id, 이름은 names[id]
+- edge 는 NumPy int32 배열 src / dst 로 (src, dst) 순으로 정렬해 두고,
+  indptr 로 CSR 을 만든다: node i 의 callee 들은 dst[indptr[i]:indptr[i + 1]]
+- degree 는 np.bincount, 필터링은 node boolean mask 로 처리한다
+- to_json() 은 기존 cg.json 스키마 (nodes: id/name/in_degree/out_degree/degree, edges: source/target) 로 내보낸다
+
+edge 하나에 int32 두 개(8 bytes)만 쓰므로 이름 문자열 tuple 을 들고 있는 것보다 메모리가 훨씬 적다.
+"""
+
+from itertools import repeat
+from operator import itemgetter
+
+import numpy as np
+
+
+class CallGraph:
+    def __init__(self, names, src, dst, node_attrs=None):
+        """
+        names: node id -> 함수 이름
+        src / dst: edge 배열 (중복 / 정렬 여부 상관없음, 여기서 정리한다)
+        node_attrs: node id -> 추가 필드 dict (to_json 에서 node 에 덧붙임), 없으면 None
+        """
+        self.names = list(names)
+        n = len(self.names)
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        # (src, dst) 순 정렬 + 중복 제거를 packed key 한 번의 unique 로 처리
+        # (cg.json 처럼 이미 정렬 / 중복 제거된 입력이면 unique 를 건너뛴다)
+        keys = src * max(n, 1) + dst
+        if not np.all(keys[1:] > keys[:-1]):
+            keys = np.unique(keys)
+        self.src = (keys // max(n, 1)).astype(np.int32)
+        self.dst = (keys % max(n, 1)).astype(np.int32)
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=n), out=self.indptr[1:])
+
+        self.node_attrs = node_attrs
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    # --- 생성 ---
+
+    @classmethod
+    def from_json(cls, cg_data):
+        """cg.json / cg_filtered.json 형식 dict 로부터 만든다. (node 순서 유지)"""
+        nodes = cg_data.get("nodes", [])
+        names = [node.get("name") or node.get("id") for node in nodes]
+        ids = {node["id"]: i for i, node in enumerate(nodes)}
+
+        edges = cg_data.get("edges", [])
+        missing = repeat(-1)
+        src = np.fromiter(map(ids.get, map(itemgetter("source"), edges), missing), dtype=np.int64, count=len(edges))
+        dst = np.fromiter(map(ids.get, map(itemgetter("target"), edges), missing), dtype=np.int64, count=len(edges))
+        # node 목록에 없는 함수를 가리키는 edge 는 버린다
+        known = (src >= 0) & (dst >= 0)
+        return cls(names, src[known], dst[known])
+
+    def sorted_by_name(self):
+        """node id 를 이름순으로 다시 매긴 graph (edge 도 (source 이름, target 이름) 순이 된다)."""
+        order = sorted(range(self.num_nodes), key=self.names.__getitem__)
+        rank = np.empty(self.num_nodes, dtype=np.int64)
+        rank[order] = np.arange(self.num_nodes)
+        attrs = None if self.node_attrs is None else [self.node_attrs[i] for i in order]
+        return CallGraph([self.names[i] for i in order], rank[self.src], rank[self.dst], attrs)
+
+    # --- 계산 ---
+
+    def in_degree(self):
+        return np.bincount(self.dst, minlength=self.num_nodes)
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def successors(self, node):
+        return self.dst[self.indptr[node]:self.indptr[node + 1]]
+
+    def subgraph(self, mask, node_attrs=None):
+        """mask[i] 가 True 인 node 들과 그 사이 edge 만 남긴 graph. node 순서는 유지된다."""
+        mask = np.asarray(mask, dtype=bool)
+        new_id = np.cumsum(mask) - 1
+        keep = mask[self.src] & mask[self.dst]
+        names = [name for name, m in zip(self.names, mask) if m]
+        return CallGraph(names, new_id[self.src[keep]], new_id[self.dst[keep]], node_attrs)
+
+    # --- 내보내기 ---
+
+    def to_json(self):
+        in_deg = self.in_degree().tolist()
+        out_deg = self.out_degree().tolist()
+        names = self.names
+
+        nodes = []
+        for i, name in enumerate(names):
+            node = {
+                "id": name,
+                "name": name,
+                "in_degree": in_deg[i],
+                "out_degree": out_deg[i],
+                "degree": in_deg[i] + out_deg[i],
+            }
+            if self.node_attrs is not None:
+                node.update(self.node_attrs[i])
+            nodes.append(node)
+
+        return {
+            "nodes": nodes,
+            "edges": [
+                {"source": names[s], "target": names[t]}
+                for s, t in zip(self.src.tolist(), self.dst.tolist())
+            ],
+        }
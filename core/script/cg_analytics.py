@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+cg_analytics.py
+cg_filtered.json 의 node 마다 graph 지표를 계산해 붙이는 stage.
+
+  scc          강하게 연결된 성분(SCC) 번호. 같은 번호끼리 서로 호출하는 재귀 cycle
+  scc_size     그 SCC 의 node 수
+  recursive    재귀 여부 (scc_size > 1 이거나 자기 자신을 호출)
+  call_depth   SCC 를 하나로 합친 condensation DAG 에서의 층 번호
+               (caller 가 없는 SCC 가 0, 그 외는 caller 들 중 가장 깊은 층 + 1)
+  pagerank     PageRank (damping 0.85, 합이 1)
+  betweenness  근사 betweenness centrality (표본 source BETWEENNESS_SAMPLES 개로 Brandes 를 돌려 n / k 배)
+
+PageRank / call_depth / betweenness 는 CSR 배열 위에서 frontier 단위로 NumPy 연산을 하고,
+SCC 는 반복문 Tarjan 으로 O(V + E) 에 한 번 훑는다.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .callgraph import CallGraph
+except ImportError:  # python3 cg_analytics.py 로 직접 실행한 경우
+    from callgraph import CallGraph
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 100
+
+BETWEENNESS_SAMPLES = 64
+BETWEENNESS_SEED = 0
+
+
+def load_json(path: Path):
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gather(indptr, indices, frontier):
+    """frontier node 들의 CSR 이웃을 (parent, neighbor) 두 배열로 한 번에 꺼낸다."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    # 각 frontier node 의 [start, start + count) 구간을 이어 붙인 index
+    seg_begin = np.cumsum(counts) - counts
+    idx = np.arange(total, dtype=np.int64) + np.repeat(starts - seg_begin, counts)
+    return np.repeat(frontier, counts), indices[idx].astype(np.int64)
+
+
+def strongly_connected_components(graph: CallGraph):
+    """node -> SCC 번호 배열. (반복문 Tarjan, 번호는 역 위상 순서)"""
+    n = graph.num_nodes
+    indptr = graph.indptr.tolist()
+    dst = graph.dst.tolist()
+
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    comp = [-1] * n
+    stack = []
+    counter = 0
+    n_comp = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        # (node, 다음에 볼 edge 위치)
+        work = [(root, indptr[root])]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            v, pos = work[-1]
+            end = indptr[v + 1]
+            while pos < end:
+                w = dst[pos]
+                pos += 1
+                if index[w] == -1:
+                    work[-1] = (v, pos)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, indptr[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = n_comp
+                        if w == v:
+                            break
+                    n_comp += 1
+
+    return np.asarray(comp, dtype=np.int64)
+
+
+def condensation_layers(graph: CallGraph, comp):
+    """SCC 를 합친 DAG 에서 Kahn 방식으로 층을 매기고, node -> 층 번호 배열을 반환한다."""
+    n_comp = int(comp.max()) + 1 if len(comp) else 0
+    c_src = comp[graph.src]
+    c_dst = comp[graph.dst]
+    inter = c_src != c_dst
+    keys = np.unique(c_src[inter] * max(n_comp, 1) + c_dst[inter])
+    e_src = keys // max(n_comp, 1)
+    e_dst = keys % max(n_comp, 1)
+
+    indptr = np.zeros(n_comp + 1, dtype=np.int64)
+    np.cumsum(np.bincount(e_src, minlength=n_comp), out=indptr[1:])
+    remaining = np.bincount(e_dst, minlength=n_comp)
+
+    layer = np.zeros(n_comp, dtype=np.int64)
+    frontier = np.flatnonzero(remaining == 0)
+    depth = 0
+    while len(frontier):
+        layer[frontier] = depth
+        _, targets = _gather(indptr, e_dst, frontier)
+        remaining -= np.bincount(targets, minlength=n_comp)
+        # 이번에 남은 caller 가 0 이 된 SCC 만 다음 층 (가장 깊은 caller 기준)
+        touched = np.unique(targets)
+        frontier = touched[remaining[touched] == 0]
+        depth += 1
+
+    return layer[comp]
+
+
+def pagerank(graph: CallGraph, damping=PAGERANK_DAMPING, tol=PAGERANK_TOL, max_iter=PAGERANK_MAX_ITER):
+    n = graph.num_nodes
+    if n == 0:
+        return np.zeros(0)
+    out_deg = graph.out_degree().astype(np.float64)
+    dangling = out_deg == 0
+    inv_out = np.divide(1.0, out_deg, out=np.zeros(n), where=~dangling)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        flow = np.bincount(graph.dst, weights=(rank * inv_out)[graph.src], minlength=n)
+        # callee 가 없는 node 의 값은 모든 node 에 고르게 나눈다
+        new = damping * (flow + rank[dangling].sum() / n) + (1.0 - damping) / n
+        converged = np.abs(new - rank).sum() < tol
+        rank = new
+        if converged:
+            break
+    return rank
+
+
+def approximate_betweenness(graph: CallGraph, samples=BETWEENNESS_SAMPLES, seed=BETWEENNESS_SEED):
+    """
+    표본 source 들에서만 Brandes 알고리즘(BFS + 역순 의존도 누적)을 돌린 근사 betweenness.
+    (n - 1)(n - 2) 로 정규화한다 (방향 graph 기준, networkx normalized=True 와 같은 척도).
+    """
+    n = graph.num_nodes
+    bc = np.zeros(n)
+    if n < 3:
+        return bc
+
+    k = min(samples, n)
+    sources = np.random.default_rng(seed).choice(n, size=k, replace=False) if k < n else np.arange(n)
+    indptr, indices = graph.indptr, graph.dst
+
+    # 배열은 한 번만 만들고, 표본마다 방문한 node 만 되돌린다.
+    # 층마다 다루는 것도 새 frontier 와 그 층의 edge 뿐이라 한 표본의 비용이 O(n) x 층 수가 아니라 O(방문한 V + E).
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    delta = np.zeros(n)
+    for s in sources.tolist():
+        dist[s] = 0
+        sigma[s] = 1.0
+        frontier = np.array([s], dtype=np.int64)
+        visited = [frontier]
+        levels = []  # 층마다 최단 경로 DAG 의 (v, w) edge 들
+
+        d = 0
+        while len(frontier):
+            parents, nbrs = _gather(indptr, indices, frontier)
+            frontier = np.unique(nbrs[dist[nbrs] == -1])
+            dist[frontier] = d + 1
+            on_path = dist[nbrs] == d + 1
+            v, w = parents[on_path], nbrs[on_path]
+            np.add.at(sigma, w, sigma[v])
+            levels.append((v, w))
+            visited.append(frontier)
+            d += 1
+
+        for v, w in reversed(levels):
+            np.add.at(delta, v, sigma[v] / sigma[w] * (1.0 + delta[w]))
+        delta[s] = 0.0
+
+        touched = np.concatenate(visited)
+        bc[touched] += delta[touched]
+        dist[touched] = -1
+        sigma[touched] = 0.0
+        delta[touched] = 0.0
+
+    return bc * (n / k) / ((n - 1) * (n - 2))
+
+
+def annotate_cg(cg_data):
+    """cg_filtered.json 형식 dict 의 node 에 scc / call_depth / pagerank / betweenness 등을 붙이는 stage 함수."""
+    nodes = cg_data.get("nodes", [])
+    graph = CallGraph.from_json(cg_data)
+
+    comp = strongly_connected_components(graph)
+    sizes = np.bincount(comp, minlength=int(comp.max()) + 1 if len(comp) else 0)[comp]
+    # 자기 호출은 cg_preprocessing 이 edge 대신 node 의 self_call 로 남긴다
+    self_loop = np.fromiter((bool(node.get("self_call")) for node in nodes), dtype=bool, count=len(nodes))
+    self_loop[graph.src[graph.src == graph.dst]] = True
+
+    columns = {
+        "scc": comp.tolist(),
+        "scc_size": sizes.tolist(),
+        "recursive": ((sizes > 1) | self_loop).tolist(),
+        "call_depth": condensation_layers(graph, comp).tolist(),
+        "pagerank": pagerank(graph).tolist(),
+        "betweenness": approximate_betweenness(graph).tolist(),
+    }
+    for i, node in enumerate(nodes):
+        for key, values in columns.items():
+            node[key] = values[i]
+    return cg_data
+
+
+def main():
+    repo_root = Path.cwd()
+    cg_path = repo_root / "cg_filtered.json"
+
+    print(f"[cg_analytics] cg input/output = {cg_path}")
+
+    if not cg_path.is_file():
+        raise FileNotFoundError(f"cg_filtered.json not found at {cg_path}")
+
+    result = annotate_cg(load_json(cg_path))
+
+    with cg_path.open("w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"[cg_analytics] Wrote {cg_path}: {len(result['nodes'])} nodes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,13 @@
 
 import json
 from pathlib import Path
-from collections import defaultdict
+
+import numpy as np
+
+try:
+    from .callgraph import CallGraph
+except ImportError:  # python3 cg_filter.py 로 직접 실행한 경우
+    from callgraph import CallGraph
 
 
 def load_json(path: Path):
@@ -10,6 +16,36 @@ def load_json(path: Path):
         return json.load(f)
 
 
+def filter_cg(cg_data, lizard_data):
+    """cg.json 을 lizard_result.json 에 있는 함수로 필터링하는 stage 함수."""
+    # 1) lizard_result.json 에서 function -> (file, start_line, end_line) 매핑 만들기
+    func_map = {}
+    for rec in lizard_data:
+        func_name = rec.get("function")
+        if not func_name:
+            continue
+        # 동일한 function 이름이 여러 파일에 있을 수도 있지만,
+        # 여기서는 일단 첫 번째 걸 쓰거나 덮어써도 됨.
+        func_map[func_name] = {
+            "file": rec.get("file"),
+            "start_line": rec.get("start_line"),
+            "end_line": rec.get("end_line"),
+        }
+
+    # 2) lizard 에 있는 함수만 남기는 node mask + file 정보
+    graph = CallGraph.from_json(cg_data)
+    mask = np.fromiter((name in func_map for name in graph.names), dtype=bool, count=graph.num_nodes)
+    # cg_preprocessing 이 node 에 남긴 self_call 표시는 그대로 넘긴다 (cg_analytics 의 recursive)
+    self_calls = {node["id"] for node in cg_data.get("nodes", []) if node.get("self_call")}
+    node_attrs = [
+        {**func_map[name], "self_call": True} if name in self_calls else func_map[name]
+        for name, keep in zip(graph.names, mask) if keep
+    ]
+
+    # 3) edges 도 허용된 노드만 남기기 + 4) degree 재계산 (CallGraph 에서 한 번에)
+    return graph.subgraph(mask, node_attrs).to_json()
+
+
 def main():
     repo_root = Path.cwd()
     cg_path = repo_root / "cg.json"
@@ -28,75 +64,14 @@ def main():
     cg_data = load_json(cg_path)
     lizard_data = load_json(lizard_path)
 
-    nodes = cg_data.get("nodes", [])
-    edges = cg_data.get("edges", [])
-
-    # 1) lizard_result.json 에서 function -> (file, start_line, end_line) 매핑 만들기
-    func_map = {}
-    for rec in lizard_data:
-        func_name = rec.get("function")
-        if not func_name:
-            continue
-        # 동일한 function 이름이 여러 파일에 있을 수도 있지만,
-        # 여기서는 일단 첫 번째 걸 쓰거나 덮어써도 됨.
-        func_map[func_name] = {
-            "file": rec.get("file"),
-            "start_line": rec.get("start_line"),
-            "end_line": rec.get("end_line"),
-        }
-
-    # 2) node 필터링 + file 정보 붙이기
-    filtered_nodes = []
-    allowed_ids = set()
-
-    for node in nodes:
-        name = node.get("name") or node.get("id")
-        if name in func_map:
-            info = func_map[name]
-            node_with_file = dict(node)
-            node_with_file["file"] = info.get("file")
-            node_with_file["start_line"] = info.get("start_line")
-            node_with_file["end_line"] = info.get("end_line")
-            filtered_nodes.append(node_with_file)
-            allowed_ids.add(node_with_file["id"])
-
-    # 3) edges 도 허용된 노드만 남기기
-    filtered_edges = []
-    for e in edges:
-        s = e.get("source")
-        t = e.get("target")
-        if s in allowed_ids and t in allowed_ids:
-            filtered_edges.append(e)
-
-    # 4) degree 재계산
-    out_deg = defaultdict(int)
-    in_deg = defaultdict(int)
-
-    for e in filtered_edges:
-        s = e["source"]
-        t = e["target"]
-        out_deg[s] += 1
-        in_deg[t] += 1
-
-    for n in filtered_nodes:
-        nid = n["id"]
-        indeg = in_deg.get(nid, 0)
-        outdeg = out_deg.get(nid, 0)
-        n["in_degree"] = indeg
-        n["out_degree"] = outdeg
-        n["degree"] = indeg + outdeg
-
-    result = {
-        "nodes": filtered_nodes,
-        "edges": filtered_edges,
-    }
+    result = filter_cg(cg_data, lizard_data)
 
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(result, f, indent=2, ensure_ascii=False)
 
     print(
         f"[cg_filter_by_lizard] Wrote {out_path}: "
-        f"{len(filtered_nodes)} nodes, {len(filtered_edges)} edges."
+        f"{len(result['nodes'])} nodes, {len(result['edges'])} edges."
     )
 
 
@@ -0,0 +1,153 @@
+"""
+cg_index.py
+cg_filtered.json 의 정방향(callee) / 역방향(caller) adjacency index.
+
+전처리 마지막에 cg_adjacency.npz 로 한 번 만들어 두고, web 프로세스는 이 파일을 읽어
+함수 하나를 중심으로 k-hop 이웃만 잘라서 내려준다. (cg_filtered.json 전체를 파싱하지 않음)
+
+npz 배열:
+  names_offsets / names_data   함수 이름 (UTF-8 blob + offset, 길이 n + 1)
+  files_offsets / files_data   node 별 file
+  start_line / end_line        node 별 줄 번호 (없으면 -1)
+  fwd_indptr / fwd_indices     callee CSR: node i 의 callee 들은 fwd_indices[fwd_indptr[i]:fwd_indptr[i + 1]]
+  rev_indptr / rev_indices     caller CSR
+"""
+
+import io
+
+import numpy as np
+
+try:
+    from .callgraph import CallGraph
+except ImportError:  # python3 로 직접 실행한 경우
+    from callgraph import CallGraph
+
+INDEX_FILENAME = "cg_adjacency.npz"
+
+DIRECTIONS = ("both", "callees", "callers")
+
+
+def _pack_strings(values):
+    data = [(v or "").encode("utf-8") for v in values]
+    offsets = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in data], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(data), dtype=np.uint8)
+
+
+def _unpack_strings(offsets, data):
+    blob = data.tobytes()
+    offsets = offsets.tolist()
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def build_adjacency_index(cg_data):
+    """cg_filtered.json 형식 dict -> cg_adjacency.npz bytes 를 반환하는 stage 함수."""
+    nodes = cg_data.get("nodes", [])
+    graph = CallGraph.from_json(cg_data)
+
+    # 역방향 CSR: target 순으로 (stable) 정렬한 source 들
+    order = np.argsort(graph.dst, kind="stable")
+    rev_indptr = np.zeros(graph.num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(graph.dst, minlength=graph.num_nodes), out=rev_indptr[1:])
+
+    names_offsets, names_data = _pack_strings(graph.names)
+    files_offsets, files_data = _pack_strings([node.get("file") for node in nodes])
+
+    def lines(key):
+        return np.array([node.get(key) if node.get(key) is not None else -1 for node in nodes], dtype=np.int64)
+
+    buf = io.BytesIO()
+    np.savez(
+        buf,
+        names_offsets=names_offsets,
+        names_data=names_data,
+        files_offsets=files_offsets,
+        files_data=files_data,
+        start_line=lines("start_line"),
+        end_line=lines("end_line"),
+        fwd_indptr=graph.indptr,
+        fwd_indices=graph.dst,
+        rev_indptr=rev_indptr,
+        rev_indices=graph.src[order],
+    )
+    return buf.getvalue()
+
+
+class AdjacencyIndex:
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as z:
+            self.names = _unpack_strings(z["names_offsets"], z["names_data"])
+            self.files = _unpack_strings(z["files_offsets"], z["files_data"])
+            self.start_line = z["start_line"]
+            self.end_line = z["end_line"]
+            self.fwd_indptr = z["fwd_indptr"]
+            self.fwd_indices = z["fwd_indices"]
+            self.rev_indptr = z["rev_indptr"]
+            self.rev_indices = z["rev_indices"]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    def _neighbors(self, node, direction):
+        if direction in ("both", "callees"):
+            yield from self.fwd_indices[self.fwd_indptr[node]:self.fwd_indptr[node + 1]].tolist()
+        if direction in ("both", "callers"):
+            yield from self.rev_indices[self.rev_indptr[node]:self.rev_indptr[node + 1]].tolist()
+
+    def neighborhood(self, function, depth=1, direction="both", limit=200):
+        """
+        function 에서 depth hop 안의 callee / caller 들과 그 사이 edge 를 cg_filtered.json 형식으로 반환한다.
+        node 가 limit 개가 되면 BFS 를 멈추고 truncated=True 로 표시한다. 없는 함수면 KeyError.
+        """
+        center = self.ids[function]
+
+        depth_of = {center: 0}
+        frontier = [center]
+        truncated = False
+        for d in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for nb in self._neighbors(node, direction):
+                    if nb in depth_of:
+                        continue
+                    if len(depth_of) >= limit:
+                        truncated = True
+                        break
+                    depth_of[nb] = d
+                    next_frontier.append(nb)
+                if truncated:
+                    break
+            if truncated or not next_frontier:
+                break
+            frontier = next_frontier
+
+        # 남은 node 들 사이의 edge (callee 방향) 를 모두 포함
+        visited = sorted(depth_of)
+        in_set = np.zeros(len(self.names), dtype=bool)
+        in_set[visited] = True
+        edges = []
+        for node in visited:
+            callees = self.fwd_indices[self.fwd_indptr[node]:self.fwd_indptr[node + 1]]
+            for callee in callees[in_set[callees]].tolist():
+                edges.append({"source": self.names[node], "target": self.names[callee]})
+
+        out_deg = np.diff(self.fwd_indptr)
+        in_deg = np.diff(self.rev_indptr)
+        nodes = []
+        for node in visited:
+            nodes.append({
+                "id": self.names[node],
+                "name": self.names[node],
+                "in_degree": int(in_deg[node]),
+                "out_degree": int(out_deg[node]),
+                "degree": int(in_deg[node] + out_deg[node]),
+                "file": self.files[node] or None,
+                "start_line": int(self.start_line[node]) if self.start_line[node] >= 0 else None,
+                "end_line": int(self.end_line[node]) if self.end_line[node] >= 0 else None,
+                "depth": depth_of[node],
+            })
+
+        return {
+            "center": function,
+            "nodes": nodes,
+            "edges": edges,
+            "truncated": truncated,
+        }
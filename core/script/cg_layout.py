@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+cg_layout.py
+cg_filtered.json 의 node 마다 2D 좌표(x, y)를 미리 계산해 붙이는 stage.
+
+multilevel force-directed (Fruchterman-Reingold) 방식:
+  1) 방향을 무시한 graph 에서 edge matching 으로 node 를 둘씩 합쳐 작은 graph 들을 만든다
+  2) 가장 작은 graph 를 정확한 O(n^2) 척력으로 배치하고
+  3) 한 단계씩 풀면서 (자식 = 부모 위치 + 약간의 흔들림) 몇 번씩만 다듬는다
+     node 가 많은 단계의 척력은 격자 칸 무게중심에 대해서만 계산한다 (n x GRID^2)
+
+같은 graph (node 순서 + edge) 는 같은 좌표가 나오므로, layout_cache_dir 가 주어지면
+graph hash 별로 좌표(.npy)를 저장해 두고 다시 계산하지 않는다.
+캐시 크기가 layout_cache_max_bytes 를 넘으면 가장 오래 쓰이지 않은 좌표부터 지운다.
+
+x, y 는 [0, 1] 로 정규화한다 (가로 / 세로 비율 유지).
+"""
+
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .callgraph import CallGraph
+    from .file_cache import evict_oldest, touch, write_atomic
+except ImportError:  # python3 cg_layout.py 로 직접 실행한 경우
+    from callgraph import CallGraph
+    from file_cache import evict_oldest, touch, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# 알고리즘이 바뀌면 올려서 이전 캐시를 쓰지 않게 한다
+LAYOUT_VERSION = 1
+
+COARSEST_SIZE = 100     # 이 이하로 줄면 coarsening 을 멈춘다
+MIN_SHRINK = 0.9        # 한 단계에서 이만큼도 안 줄면 멈춘다
+MATCHING_ROUNDS = 3
+EXACT_LIMIT = 1000      # 이 이하 node 수면 척력을 정확히 계산
+GRID = 16               # 근사 척력용 격자 한 변의 칸 수
+CHUNK = 4096            # 근사 척력 계산 시 한 번에 처리할 node 수
+
+COARSEST_ITERATIONS = 200
+LEVEL_ITERATIONS = 30
+MIN_LEVEL_ITERATIONS = 10
+LEVEL_ITERATIONS_FULL_SIZE = 10000  # 이보다 큰 단계는 크기에 반비례해 반복 횟수를 줄인다
+SEED = 0
+
+
+def load_json(path: Path):
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def graph_hash(graph: CallGraph) -> str:
+    h = hashlib.sha256()
+    h.update(f"layout-v{LAYOUT_VERSION}\0{graph.num_nodes}\0".encode())
+    h.update("\0".join(graph.names).encode("utf-8"))
+    h.update(graph.src.astype("<i4").tobytes())
+    h.update(graph.dst.astype("<i4").tobytes())
+    return h.hexdigest()
+
+
+def _undirected_edges(n, src, dst):
+    """self loop 을 빼고 (u < v) 로 정규화 + 중복 제거."""
+    u = np.minimum(src, dst).astype(np.int64)
+    v = np.maximum(src, dst).astype(np.int64)
+    keep = u != v
+    keys = np.unique(u[keep] * max(n, 1) + v[keep])
+    return keys // max(n, 1), keys % max(n, 1)
+
+
+def _coarsen(n, u, v, rng):
+    """
+    handshake matching: 각 node 가 우선순위가 가장 높은 incident edge 를 고르고,
+    양 끝이 같은 edge 를 고른 경우만 합친다 (남은 node 들끼리 MATCHING_ROUNDS 번 반복).
+    그래도 짝이 없는 node 는 짝이 된 이웃의 묶음에 붙인다. 반환: (node -> 부모 id, 부모 수)
+    """
+    m = len(u)
+    rep = np.arange(n)
+    matched_node = np.zeros(n, dtype=bool)
+    eids = np.arange(m)
+
+    for _ in range(MATCHING_ROUNDS):
+        free = ~matched_node[u] & ~matched_node[v]
+        if not free.any():
+            break
+        fu, fv, fe = u[free], v[free], eids[free]
+        priority = rng.random(len(fe))
+        ends = np.concatenate([fu, fv])
+        order = np.lexsort((-np.concatenate([priority, priority]), ends))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ends[order][1:] != ends[order][:-1]
+
+        best = np.full(n, -1, dtype=np.int64)
+        best[ends[order][first]] = np.concatenate([fe, fe])[order][first]
+        hit = (best[fu] == fe) & (best[fv] == fe)
+        # 짝이 된 두 node 는 작은 쪽 id 를 대표로
+        rep[fv[hit]] = fu[hit]
+        matched_node[fu[hit]] = True
+        matched_node[fv[hit]] = True
+
+    # 짝 없는 node -> 짝이 된 이웃 하나의 대표
+    for a, b in ((u, v), (v, u)):
+        loose = ~matched_node[a] & matched_node[b] & (rep[a] == a)
+        rep[a[loose]] = rep[b[loose]]
+
+    _, parent = np.unique(rep, return_inverse=True)
+    return parent, int(parent.max()) + 1 if n else 0
+
+
+def _repulsion(pos, mass, k2):
+    n = len(pos)
+    if n <= EXACT_LIMIT:
+        # 모든 node 쌍 (자기 자신 항은 p - p = 0 이라 빠진다)
+        centers, cmass = pos, mass
+    else:
+        # 격자 칸별 무게중심 / 질량에 대해서만 척력 계산
+        lo = pos.min(axis=0)
+        span = np.maximum(pos.max(axis=0) - lo, 1e-9)
+        cell = np.minimum(((pos - lo) / span * GRID).astype(np.int64), GRID - 1)
+        cid = cell[:, 0] * GRID + cell[:, 1]
+        cmass = np.bincount(cid, weights=mass, minlength=GRID * GRID)
+        occupied = cmass > 0
+        cmass = cmass[occupied]
+        cx = np.bincount(cid, weights=mass * pos[:, 0], minlength=GRID * GRID)[occupied] / cmass
+        cy = np.bincount(cid, weights=mass * pos[:, 1], minlength=GRID * GRID)[occupied] / cmass
+        centers = np.stack([cx, cy], axis=1)
+
+    # sum_c f_c * (p - c) = p * sum_c f_c - f @ c 로 (chunk, center 수) 2차원 배열만 만든다
+    cc = (centers ** 2).sum(axis=1)
+    disp = np.empty_like(pos)
+    for start in range(0, n, CHUNK):
+        p = pos[start:start + CHUNK]
+        dist2 = (p ** 2).sum(axis=1)[:, None] + cc[None, :] - 2.0 * (p @ centers.T)
+        f = cmass[None, :] * k2 / (np.maximum(dist2, 0.0) + k2 * 0.01)
+        disp[start:start + CHUNK] = (p * f.sum(axis=1)[:, None] - f @ centers) * mass[start:start + CHUNK, None]
+    return disp
+
+
+def _force_directed(pos, u, v, weight, mass, iterations, k):
+    k2 = k * k
+    temp = k * max(np.sqrt(len(pos)), 1.0) * 0.1
+    cooling = (0.01) ** (1.0 / max(iterations, 1))
+    n = len(pos)
+    for _ in range(iterations):
+        disp = _repulsion(pos, mass, k2)
+
+        # 인력: edge 길이^2 / k (합쳐진 edge 는 weight 배)
+        delta = pos[v] - pos[u]
+        dist = np.sqrt((delta ** 2).sum(axis=1)) + 1e-9
+        f = (weight * dist / k)[:, None] * delta
+        for axis in (0, 1):
+            disp[:, axis] += np.bincount(u, weights=f[:, axis], minlength=n)
+            disp[:, axis] -= np.bincount(v, weights=f[:, axis], minlength=n)
+
+        length = np.sqrt((disp ** 2).sum(axis=1)) + 1e-9
+        pos += disp / length[:, None] * np.minimum(length, temp)[:, None]
+        temp *= cooling
+    return pos
+
+
+def compute_layout(graph: CallGraph, seed=SEED):
+    """node id 순서의 (n, 2) float32 좌표."""
+    n = graph.num_nodes
+    if n == 0:
+        return np.zeros((0, 2), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+
+    # 1) coarsening: 단계별 (node 수, edge, edge weight, node mass, 부모 mapping)
+    u, v = _undirected_edges(n, graph.src, graph.dst)
+    levels = [(n, u, v, np.ones(len(u)), np.ones(n))]
+    parents = []
+    while levels[-1][0] > COARSEST_SIZE and len(levels[-1][1]):
+        cn, cu, cv, cw, cm = levels[-1]
+        parent, pn = _coarsen(cn, cu, cv, rng)
+        if pn > cn * MIN_SHRINK:
+            break
+        pu, pv = np.minimum(parent[cu], parent[cv]), np.maximum(parent[cu], parent[cv])
+        keep = pu != pv
+        # 같은 부모 쌍으로 합쳐진 edge 들은 weight 를 더해 하나로
+        ukeys, inverse = np.unique(pu[keep] * pn + pv[keep], return_inverse=True)
+        weights = np.bincount(inverse, weights=cw[keep], minlength=len(ukeys))
+        mass = np.bincount(parent, weights=cm, minlength=pn)
+        levels.append((pn, ukeys // pn, ukeys % pn, weights, mass))
+        parents.append(parent)
+
+    # 2) 가장 작은 graph 배치 (이상적인 edge 길이 k = 1)
+    k = 1.0
+    cn, cu, cv, cw, cm = levels[-1]
+    pos = (rng.random((cn, 2)) - 0.5) * np.sqrt(cm.sum())
+    pos = _force_directed(pos, cu, cv, cw, cm, COARSEST_ITERATIONS, k)
+
+    # 3) 한 단계씩 풀면서 다듬기
+    for level, parent in zip(reversed(levels[:-1]), reversed(parents)):
+        ln, lu, lv, lw, lm = level
+        pos = pos[parent] + (rng.random((ln, 2)) - 0.5) * k * 0.1
+        iterations = max(MIN_LEVEL_ITERATIONS, min(LEVEL_ITERATIONS, LEVEL_ITERATIONS * LEVEL_ITERATIONS_FULL_SIZE // ln))
+        pos = _force_directed(pos, lu, lv, lw, lm, iterations, k)
+
+    # [0, 1] 로 정규화 (비율 유지)
+    pos -= pos.min(axis=0)
+    scale = pos.max()
+    if scale > 0:
+        pos /= scale
+    return pos.astype(np.float32)
+
+
+def _cache_path(cache_dir, digest):
+    return Path(cache_dir) / digest[:2] / f"{digest}.npy"
+
+
+def _read_cached(cache_dir, digest, n):
+    path = _cache_path(cache_dir, digest)
+    if not path.is_file():
+        return None
+    try:
+        pos = np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if pos.shape != (n, 2):
+        return None
+    touch(path)
+    return pos
+
+
+def _write_cached(cache_dir, digest, pos, max_bytes=None):
+    buf = io.BytesIO()
+    np.save(buf, pos)
+    write_atomic(_cache_path(cache_dir, digest), buf.getvalue())
+    if max_bytes is not None:
+        evict_oldest(cache_dir, max_bytes)
+
+
+def layout_cg(cg_data, layout_cache_dir=None, layout_max_nodes=None, layout_cache_max_bytes=None):
+    """
+    cg_filtered.json 형식 dict 의 node 에 x / y 를 붙이는 stage 함수.
+    layout_max_nodes 가 0 이거나 node 수가 그보다 많으면 좌표 없이 그대로 반환한다.
+    좌표는 화면 배치용 부가 정보라, 계산이 수치 오류나 메모리 부족으로 실패하면
+    stage 를 실패시키지 않고 좌표 없이 반환한다.
+    """
+    nodes = cg_data.get("nodes", [])
+    if layout_max_nodes is not None and not 0 < len(nodes) <= layout_max_nodes:
+        return cg_data
+
+    graph = CallGraph.from_json(cg_data)
+    digest = graph_hash(graph)
+
+    pos = _read_cached(layout_cache_dir, digest, graph.num_nodes) if layout_cache_dir else None
+    if pos is None:
+        try:
+            pos = compute_layout(graph)
+        except (ArithmeticError, ValueError, MemoryError):
+            logger.exception("layout failed for %d nodes, writing nodes without coordinates", graph.num_nodes)
+            return cg_data
+        if layout_cache_dir:
+            try:
+                _write_cached(layout_cache_dir, digest, pos, layout_cache_max_bytes)
+            except OSError as e:
+                logger.warning("layout cache write failed: %s", e)
+
+    for node, (x, y) in zip(nodes, pos.tolist()):
+        node["x"] = round(x, 5)
+        node["y"] = round(y, 5)
+    return cg_data
+
+
+def main():
+    repo_root = Path.cwd()
+    cg_path = repo_root / "cg_filtered.json"
+
+    print(f"[cg_layout] cg input/output = {cg_path}")
+
+    if not cg_path.is_file():
+        raise FileNotFoundError(f"cg_filtered.json not found at {cg_path}")
+
+    result = layout_cg(load_json(cg_path))
+
+    with cg_path.open("w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"[cg_layout] Wrote {cg_path}: {len(result['nodes'])} nodes.")
+
+
+if __name__ == "__main__":
+    main()
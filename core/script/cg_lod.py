@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+cg_lod.py
+cg_filtered.json 을 directory / file / function 세 단계로 묶은 level-of-detail graph (cg_lod.json) 를 만드는 stage.
+
+- node id: directory 는 "dir:<디렉토리>", file 은 "file:<파일 경로>", function 은 cg_filtered.json 의 id 그대로
+- parent: function -> file, file -> directory (directory 는 None)
+- 각 node 에는 자신 아래 함수들의 합계를 붙인다
+    functions, nloc, ccn (합), ccn_max, warning {HIGH, MID, LOW}, internal_edges (안쪽끼리의 호출 수)
+- 각 단계의 edge 는 (source 묶음, target 묶음) 별로 합친 호출 수 weight. 같은 묶음 안의 호출은 edge 로 내지 않는다.
+
+cg_lod.json:
+  {"levels": {"directory": {"nodes": [...], "edges": [...]}, "file": {...}, "function": {...}}}
+
+function 단계는 함수 수만큼 커지므로 node dict 를 다시 쓰지 않고 cg_filtered.json 의 id 를 가리킨다.
+  {"ids": [함수 id], "parents": [file 단계 node 의 index], "nloc": [...], "ccn": [...],
+   "warning": {"HIGH": [...], "MID": [...], "LOW": [...]}, "internal_edges": [자기 호출 수],
+   "edges": [[source index, target index], ...]}   (index 는 ids 의 위치, 호출 수는 항상 1)
+node dict 형태로 펼치는 것은 조회하는 쪽 (core/lod_query.py) 이 한다.
+"""
+
+import json
+import posixpath
+from pathlib import Path
+
+import numpy as np
+
+LOD_FILENAME = "cg_lod.json"
+
+LEVELS = ("directory", "file", "function")
+
+
+def load_json(path: Path):
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cluster_ids(file_):
+    """함수가 속한 file 의 (directory id, file id)."""
+    file_ = file_ or ""
+    return "dir:" + (posixpath.dirname(file_) or "."), "file:" + file_
+
+
+def _aggregate(members, n_clusters, metrics):
+    """함수별 metric 배열을 cluster 별로 합친다."""
+    counts = np.bincount(members, minlength=n_clusters)
+    rolled = {
+        "functions": counts,
+        "nloc": np.bincount(members, weights=metrics["nloc"], minlength=n_clusters),
+        "ccn": np.bincount(members, weights=metrics["ccn"], minlength=n_clusters),
+    }
+    ccn_max = np.zeros(n_clusters)
+    np.maximum.at(ccn_max, members, metrics["ccn"])
+    rolled["ccn_max"] = ccn_max
+    for level in ("HIGH", "MID", "LOW"):
+        rolled[level] = np.bincount(members, weights=metrics[level], minlength=n_clusters)
+    return {key: values.astype(np.int64).tolist() for key, values in rolled.items()}
+
+
+def _level_edges(ids, members, src, dst):
+    """함수 edge 를 cluster 사이 edge (weight = 호출 수) 로 합치고, 안쪽 호출 수도 함께 반환한다."""
+    n = len(ids)
+    cs, ct = members[src], members[dst]
+    inner = cs == ct
+    internal = np.bincount(cs[inner], minlength=n).tolist()
+    keys, weights = np.unique(cs[~inner] * max(n, 1) + ct[~inner], return_counts=True)
+    edges = [
+        {"source": ids[s], "target": ids[t], "weight": w}
+        for s, t, w in zip((keys // max(n, 1)).tolist(), (keys % max(n, 1)).tolist(), weights.tolist())
+    ]
+    return edges, internal
+
+
+def build_lod(cg_data, functions_data):
+    """cg_filtered.json + functions.json -> cg_lod.json 형식 dict 를 반환하는 stage 함수."""
+    nodes = cg_data.get("nodes", [])
+    row = {node["id"]: i for i, node in enumerate(nodes)}
+    edges = [e for e in cg_data.get("edges", []) if e["source"] in row and e["target"] in row]
+    src = np.array([row[e["source"]] for e in edges], dtype=np.int64)
+    dst = np.array([row[e["target"]] for e in edges], dtype=np.int64)
+
+    # 함수별 metric (functions.json 에 없으면 0)
+    funcs = {(f.get("file"), f.get("function")): f for f in functions_data}
+    metrics = {key: np.zeros(len(nodes)) for key in ("nloc", "ccn", "HIGH", "MID", "LOW")}
+    for i, node in enumerate(nodes):
+        f = funcs.get((node.get("file"), node.get("name") or node.get("id")))
+        if f is None:
+            continue
+        metrics["nloc"][i] = f.get("NLOC") or 0
+        metrics["ccn"][i] = f.get("CCN") or 0
+        for level in ("HIGH", "MID", "LOW"):
+            metrics[level][i] = (f.get("warning") or {}).get(level, 0)
+
+    # 함수 -> file / directory cluster 번호
+    dir_ids, file_ids, file_parent = [], [], []
+    dir_index, file_index = {}, {}
+    file_members = np.zeros(len(nodes), dtype=np.int64)
+    for i, node in enumerate(nodes):
+        dir_id, file_id = cluster_ids(node.get("file"))
+        if file_id not in file_index:
+            file_index[file_id] = len(file_ids)
+            file_ids.append(file_id)
+            if dir_id not in dir_index:
+                dir_index[dir_id] = len(dir_ids)
+                dir_ids.append(dir_id)
+            file_parent.append(dir_index[dir_id])
+        file_members[i] = file_index[file_id]
+    dir_members = np.asarray(file_parent, dtype=np.int64)[file_members] if len(nodes) else file_members
+
+    levels = {}
+    for level, ids, members, parents in (
+        ("directory", dir_ids, dir_members, [None] * len(dir_ids)),
+        ("file", file_ids, file_members, [dir_ids[p] for p in file_parent]),
+    ):
+        rolled = _aggregate(members, len(ids), metrics)
+        level_edges, internal = _level_edges(ids, members, src, dst)
+        level_nodes = []
+        for c, cid in enumerate(ids):
+            level_nodes.append({
+                "id": cid,
+                "name": cid.split(":", 1)[1],
+                "parent": parents[c],
+                "functions": rolled["functions"][c],
+                "nloc": rolled["nloc"][c],
+                "ccn": rolled["ccn"][c],
+                "ccn_max": rolled["ccn_max"][c],
+                "warning": {level_: rolled[level_][c] for level_ in ("HIGH", "MID", "LOW")},
+                "internal_edges": internal[c],
+            })
+        levels[level] = {"nodes": level_nodes, "edges": level_edges}
+
+    # function 단계: id 참조 + column 별 metric + index 쌍 edge
+    n = len(nodes)
+    inner = src == dst
+    edge_keys = np.unique(src[~inner] * max(n, 1) + dst[~inner])
+    levels["function"] = {
+        "ids": [node["id"] for node in nodes],
+        "parents": file_members.tolist(),
+        "nloc": metrics["nloc"].astype(np.int64).tolist(),
+        "ccn": metrics["ccn"].astype(np.int64).tolist(),
+        "warning": {level: metrics[level].astype(np.int64).tolist() for level in ("HIGH", "MID", "LOW")},
+        "internal_edges": np.bincount(src[inner], minlength=n).tolist(),
+        "edges": np.stack([edge_keys // max(n, 1), edge_keys % max(n, 1)], axis=1).tolist(),
+    }
+
+    return {"levels": levels}
+
+
+def main():
+    repo_root = Path.cwd()
+    cg_path = repo_root / "cg_filtered.json"
+    functions_path = repo_root / "functions.json"
+    out_path = repo_root / "cg_lod.json"
+
+    print(f"[cg_lod] cg input        = {cg_path}")
+    print(f"[cg_lod] functions input = {functions_path}")
+    print(f"[cg_lod] output          = {out_path}")
+
+    if not cg_path.is_file():
+        raise FileNotFoundError(f"cg_filtered.json not found at {cg_path}")
+    if not functions_path.is_file():
+        raise FileNotFoundError(f"functions.json not found at {functions_path}")
+
+    result = build_lod(load_json(cg_path), load_json(functions_path))
+
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    sizes = ", ".join(f"{level} {len(result['levels'][level]['nodes'])}" for level in LEVELS[:-1])
+    sizes += f", function {len(result['levels']['function']['ids'])}"
+    print(f"[cg_lod] Wrote {out_path}: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
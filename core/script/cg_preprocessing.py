@@ -11,84 +11,143 @@ The script:
 - Creates directed edges source->target for each "calls function '...'" occurrence
 - Skips edges to special pseudo-targets like "<<null function>>"
 - De-duplicates edges and removes self-loops
+  (자기 자신을 호출하는 함수는 edge 대신 node 에 "self_call": true 로 남긴다 -> cg_analytics 의 recursive)
 - Optionally computes simple metadata (in/out degree)
+
+cg.txt 는 큰 repo 에서 수백 MB 가 되므로 파일 전체를 readlines() 하지 않고
+mmap 으로 한 줄씩 읽으며 CallGraphBuilder 에 흘려 넣는다.
+함수 이름은 정수 id 로 intern 하고 edge 는 (source id, target id) 를 int64 하나로 묶어 array 에 쌓은 뒤,
+마지막에 callgraph.CallGraph (NumPy CSR) 로 정렬 / degree 계산을 한 번에 한다.
+같은 caller 블록 안에서 반복되는 call site (한 함수를 여러 번 호출) 는 쌓을 때 바로 버려서
+array 가 call site 수가 아니라 distinct edge 수만큼만 커지게 한다.
 """
 
-import json, re
-from collections import defaultdict
+import json, mmap, os, re, time
+from array import array
+
+import numpy as np
+
+try:
+    from .callgraph import CallGraph
+except ImportError:  # python3 cg_preprocessing.py 로 직접 실행한 경우
+    from callgraph import CallGraph
 
 NODE_HDR_RE = re.compile(r"^Call graph node for function:\s+'([^']+)'")
 CALL_RE     = re.compile(r"calls function '([^']+)'")
 
 SPECIAL_TARGETS = {"<<null function>>", "external node", "indirect target"}
 
-def parse_cg(lines):
-    current = None
-    edges = set()
-    nodes = set()
-
-    for raw in lines:
-        line = raw.rstrip("\n")
-
+# llvm-link 는 module 간에 이름이 겹치는 static 함수를 'helper.3' 처럼 바꾼다.
+# C 식별자에는 '.' 이 들어갈 수 없으므로 숫자 suffix 를 떼서 원래 이름(lizard 와 같은 이름)으로 되돌린다.
+LINK_SUFFIX_RE = re.compile(r"\.\d+$")
+
+EDGE_SHIFT = 32
+
+def normalize_function_name(name):
+    return LINK_SUFFIX_RE.sub("", name.strip())
+
+class CallGraphBuilder:
+    """cg.txt 의 줄을 하나씩 받아 node / edge 를 점진적으로 쌓는다."""
+
+    def __init__(self):
+        self.ids = {}       # function name -> int id
+        self.names = []     # int id -> function name
+        self.callee_ids = {}  # cg.txt 의 callee 원래 이름 -> int id (edge 로 쓰지 않는 이름이면 None)
+        self.edges = array("q")  # (source id << EDGE_SHIFT) | target id
+        self.current = None
+        self.current_targets = set()  # 현재 caller 블록에서 이미 쌓은 target id
+        self.self_calls = set()  # 자기 자신을 호출하는 함수 id
+        self.bytes_read = 0
+
+    def intern(self, name):
+        nid = self.ids.get(name)
+        if nid is None:
+            nid = len(self.names)
+            self.ids[name] = nid
+            self.names.append(name)
+        return nid
+
+    def lookup_callee(self, raw_name):
+        if raw_name in self.callee_ids:
+            return self.callee_ids[raw_name]
+        callee = normalize_function_name(raw_name)
+        # Filter out special / pseudo targets
+        if callee in SPECIAL_TARGETS or not callee:
+            nid = None
+        else:
+            nid = self.intern(callee)
+        self.callee_ids[raw_name] = nid
+        return nid
+
+    def feed(self, line):
         m = NODE_HDR_RE.match(line)
         if m:
-            current = m.group(1).strip()
-            nodes.add(current)
-            continue
+            self.current = self.intern(normalize_function_name(m.group(1)))
+            self.current_targets.clear()
+            return
 
-        if current is not None:
+        if self.current is not None:
             m2 = CALL_RE.search(line)
             if m2:
-                callee = m2.group(1).strip()
-                # Filter out special / pseudo targets
-                if callee not in SPECIAL_TARGETS:
-                    if callee:  # non-empty
-                        nodes.add(callee)
-                        if callee != current:
-                            edges.add((current, callee))
+                target = self.lookup_callee(m2.group(1))
+                if target == self.current:
+                    self.self_calls.add(target)
+                elif target is not None and target not in self.current_targets:
+                    self.current_targets.add(target)
+                    self.edges.append((self.current << EDGE_SHIFT) | target)
 
         # Detect blank lines separating nodes (optional; safe to ignore)
         # if not line.strip():
         #     current = None
 
-    return nodes, edges
-
-def to_json(nodes, edges):
-    # compute simple degree metadata
-    out_deg = defaultdict(int)
-    in_deg  = defaultdict(int)
-
-    for s, t in edges:
-        out_deg[s] += 1
-        in_deg[t]  += 1
-
-    j = {
-        "nodes": [
-            {
-                "id": n,
-                "name": n,
-                "in_degree": in_deg.get(n, 0),
-                "out_degree": out_deg.get(n, 0),
-                "degree": in_deg.get(n, 0) + out_deg.get(n, 0)
-            }
-            for n in sorted(nodes)
-        ],
-        "edges": [
-            {"source": s, "target": t}
-            for (s, t) in sorted(edges)
-        ]
-    }
-    return j
+    def to_graph(self):
+        """
+        이름순으로 id 를 다시 매긴 CallGraph (기존 cg.json 과 같은 node / edge 순서).
+        llvm-link suffix 를 뗀 이름이 겹쳐 같은 caller 가 여러 블록에 나온 경우의 중복은 CallGraph 가 제거한다.
+        """
+        packed = np.frombuffer(self.edges, dtype=np.int64)
+        node_attrs = [{"self_call": True} if i in self.self_calls else {} for i in range(len(self.names))]
+        graph = CallGraph(self.names, packed >> EDGE_SHIFT, packed & ((1 << EDGE_SHIFT) - 1), node_attrs)
+        return graph.sorted_by_name()
+
+    def to_json(self):
+        return self.to_graph().to_json()
+
+def iter_lines_mmap(path):
+    """파일을 mmap 해서 한 줄씩 (bytes) 돌려준다."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+def build_cg_from_lines(lines):
+    """print-callgraph 출력 줄(str)들을 받아 nodes/edges dict 를 반환한다. (파일 / 프로세스 stdout 공용)"""
+    builder = CallGraphBuilder()
+    started = time.perf_counter()
+    for line in lines:
+        builder.bytes_read += len(line)
+        builder.feed(line)
+    graph = builder.to_graph()
+    elapsed = time.perf_counter() - started
+
+    mb = builder.bytes_read / (1024 * 1024)
+    print(
+        f"[cg_preprocessing] parsed {mb:.1f} MB in {elapsed:.2f}s "
+        f"({mb / elapsed if elapsed > 0 else 0:.1f} MB/s): "
+        f"{graph.num_nodes} nodes, {graph.num_edges} edges"
+    )
+    return graph.to_json()
+
+def build_cg(path):
+    """cg.txt 경로를 받아 nodes/edges dict 를 반환하는 stage 함수."""
+    return build_cg_from_lines(raw.decode("utf-8", errors="ignore") for raw in iter_lines_mmap(path))
 
 def main():
 
     inp = "cg.txt"
     outp = "cg.json"
-    with open(inp, "r", encoding="utf-8", errors="ignore") as f:
-        lines = f.readlines()
-
-    nodes, edges = parse_cg(lines)
-    j = to_json(nodes, edges)
+    j = build_cg(inp)
 
     with open(outp, "w", encoding="utf-8") as f:
         json.dump(j, f, indent=2)
@@ -0,0 +1,238 @@
+"""
+columnar.py
+cg_filtered.json / functions.json 을 브라우저에서 JSON.parse 없이 TypedArray 로 바로 읽을 수 있는
+binary columnar 형식(.bin)으로 바꾼다.
+
+파일 구조 (모든 정수는 little-endian):
+
+  offset 0   magic        4 bytes  b"IVC1"
+  offset 4   header_len   uint32
+  offset 8   header       header_len bytes, UTF-8 JSON
+             (padding)    body 가 8 byte 경계에서 시작하도록 0 으로 채움
+  body       column buffer 들과 string dictionary (각 buffer 는 8 byte 경계에서 시작)
+
+header JSON:
+  {
+    "version": 1,
+    "strings": {"count": N, "offsets": [off, len], "data": [off, len]},
+    "tables": {
+      "<table>": {
+        "rows": R,
+        "columns": [{"name": "...", "type": "u32" | "i32" | "f64" | "str", "offset": off, "length": len}, ...]
+      }
+    }
+  }
+  - offset 은 body 시작 기준 byte 위치, length 는 byte 길이
+  - "u32" / "i32" 는 길이 R 인 Uint32Array / Int32Array, 값이 없으면 i32 는 -2147483648
+  - "f64" 는 길이 R 인 Float64Array, 값이 없으면 NaN
+  - "str" 은 Uint32Array 로 된 string dictionary index, 값이 없으면 0xFFFFFFFF
+  - string dictionary: offsets 는 Uint32Array(count + 1), i 번째 문자열은 data[offsets[i]:offsets[i + 1]] (UTF-8)
+
+테이블:
+  cg_filtered.bin  nodes(name, file, start_line, end_line, in_degree, out_degree, degree,
+                         scc, scc_size, recursive, call_depth, pagerank, betweenness, x, y)
+                   edges(source, target)   <- nodes 테이블의 row 번호 (u32)
+  functions.bin    functions(file, function, NLOC, CCN, param, length, start_line, end_line,
+                             in_degree, out_degree, degree, scc, scc_size, recursive, call_depth,
+                             pagerank, betweenness, warning_high, warning_mid, warning_low)
+  (recursive 는 0 / 1 인 i32, graph 지표가 없는 이전 결과면 null)
+"""
+
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"IVC1"
+VERSION = 1
+ALIGN = 8
+
+I32_NULL = -(1 << 31)
+STR_NULL = 0xFFFFFFFF
+
+DTYPES = {"u32": "<u4", "i32": "<i4", "f64": "<f8", "str": "<u4"}
+
+CONTENT_TYPE = "application/vnd.infovis.columnar"
+
+
+class StringTable:
+    """문자열 -> dictionary index (같은 문자열은 한 번만 저장)."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def index(self, value):
+        if value is None:
+            return STR_NULL
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.ids[value] = idx
+            self.values.append(value)
+        return idx
+
+    def encode(self):
+        data = [v.encode("utf-8") for v in self.values]
+        offsets = np.zeros(len(data) + 1, dtype="<u4")
+        np.cumsum([len(b) for b in data], out=offsets[1:])
+        return offsets.tobytes(), b"".join(data)
+
+
+def _pad(n):
+    return (-n) % ALIGN
+
+
+def encode_tables(tables):
+    """
+    tables: {table 이름: [(column 이름, type, values), ...]} 를 .bin bytes 로 만든다.
+    "str" column 의 values 는 문자열 (또는 None) 리스트.
+    """
+    strings = StringTable()
+    buffers = []
+    body_len = 0
+
+    def add_buffer(raw):
+        nonlocal body_len
+        offset = body_len
+        buffers.append(raw)
+        buffers.append(b"\0" * _pad(len(raw)))
+        body_len += len(raw) + _pad(len(raw))
+        return [offset, len(raw)]
+
+    header_tables = {}
+    for table, columns in tables.items():
+        rows = None
+        header_columns = []
+        for name, type_, values in columns:
+            if type_ == "str":
+                values = [strings.index(v) for v in values]
+            elif type_ == "i32":
+                values = [I32_NULL if v is None else v for v in values]
+            elif type_ == "f64":
+                values = [np.nan if v is None else v for v in values]
+            arr = np.asarray(values, dtype=DTYPES[type_])
+            if rows is None:
+                rows = len(arr)
+            elif rows != len(arr):
+                raise ValueError(f"column {table}.{name} has {len(arr)} rows, expected {rows}")
+            offset, length = add_buffer(arr.tobytes())
+            header_columns.append({"name": name, "type": type_, "offset": offset, "length": length})
+        header_tables[table] = {"rows": rows or 0, "columns": header_columns}
+
+    str_offsets, str_data = strings.encode()
+    header = {
+        "version": VERSION,
+        "strings": {
+            "count": len(strings.values),
+            "offsets": add_buffer(str_offsets),
+            "data": add_buffer(str_data),
+        },
+        "tables": header_tables,
+    }
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes
+    return prefix + b"\0" * _pad(len(prefix)) + b"".join(buffers)
+
+
+def decode_tables(data):
+    """encode_tables 의 역변환. {table 이름: {column 이름: [값 ...]}} (검증 / 디버깅용)."""
+    if data[:4] != MAGIC:
+        raise ValueError("not a columnar file")
+    (header_len,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_len].decode("utf-8"))
+    body = 8 + header_len + _pad(8 + header_len)
+
+    def buffer(offset, length, dtype):
+        return np.frombuffer(data, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=body + offset)
+
+    strs = header["strings"]
+    offsets = buffer(*strs["offsets"], "<u4").tolist()
+    s_off, _s_len = strs["data"]
+    values = [
+        data[body + s_off + offsets[i]:body + s_off + offsets[i + 1]].decode("utf-8")
+        for i in range(strs["count"])
+    ]
+
+    tables = {}
+    for table, meta in header["tables"].items():
+        cols = {}
+        for col in meta["columns"]:
+            arr = buffer(col["offset"], col["length"], DTYPES[col["type"]]).tolist()
+            if col["type"] == "str":
+                arr = [None if v == STR_NULL else values[v] for v in arr]
+            elif col["type"] == "i32":
+                arr = [None if v == I32_NULL else v for v in arr]
+            elif col["type"] == "f64":
+                arr = [None if v != v else v for v in arr]
+            cols[col["name"]] = arr
+        tables[table] = cols
+    return tables
+
+
+# --- stage 함수 ---
+
+# cg_analytics 가 붙이는 node 지표 (cg_filtered.bin / functions.bin 공통)
+GRAPH_METRIC_COLUMNS = [
+    ("scc", "i32"),
+    ("scc_size", "i32"),
+    ("recursive", "i32"),
+    ("call_depth", "i32"),
+    ("pagerank", "f64"),
+    ("betweenness", "f64"),
+]
+
+
+def encode_cg(cg_data):
+    """cg_filtered.json 형식 dict -> cg_filtered.bin bytes."""
+    nodes = cg_data.get("nodes", [])
+    row = {node["id"]: i for i, node in enumerate(nodes)}
+    edges = [e for e in cg_data.get("edges", []) if e["source"] in row and e["target"] in row]
+
+    def col(key):
+        return [node.get(key) for node in nodes]
+
+    return encode_tables({
+        "nodes": [
+            ("name", "str", [node.get("name") or node.get("id") for node in nodes]),
+            ("file", "str", col("file")),
+            ("start_line", "i32", col("start_line")),
+            ("end_line", "i32", col("end_line")),
+            ("in_degree", "u32", col("in_degree")),
+            ("out_degree", "u32", col("out_degree")),
+            ("degree", "u32", col("degree")),
+            *((key, type_, col(key)) for key, type_ in GRAPH_METRIC_COLUMNS),
+            ("x", "f64", col("x")),
+            ("y", "f64", col("y")),
+        ],
+        "edges": [
+            ("source", "u32", [row[e["source"]] for e in edges]),
+            ("target", "u32", [row[e["target"]] for e in edges]),
+        ],
+    })
+
+
+FUNCTION_INT_COLUMNS = [
+    "NLOC", "CCN", "param", "length", "start_line", "end_line",
+    "in_degree", "out_degree", "degree",
+]
+
+
+def encode_functions(functions_data):
+    """functions.json 형식 리스트 -> functions.bin bytes."""
+    columns = [
+        ("file", "str", [f.get("file") for f in functions_data]),
+        ("function", "str", [f.get("function") for f in functions_data]),
+    ]
+    for key in FUNCTION_INT_COLUMNS:
+        columns.append((key, "i32", [f.get(key) for f in functions_data]))
+    for key, type_ in GRAPH_METRIC_COLUMNS:
+        columns.append((key, type_, [f.get(key) for f in functions_data]))
+    for level in ("HIGH", "MID", "LOW"):
+        columns.append((
+            f"warning_{level.lower()}",
+            "u32",
+            [(f.get("warning") or {}).get(level, 0) for f in functions_data],
+        ))
+    return encode_tables({"functions": columns})
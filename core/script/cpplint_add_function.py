@@ -4,42 +4,49 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    from .function_index import FunctionIndex
+except ImportError:  # python3 cpplint_add_function.py 로 직접 실행한 경우
+    from function_index import FunctionIndex
+
 
 def load_json(path: Path):
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def build_functions_by_file(lizard_funcs):
+def attach_functions(cpplint_data, lizard_data):
+    """cpplint warning 마다 해당 라인을 감싸는 lizard function 이름을 붙이는 stage 함수."""
+    # file -> 줄 번호 구간 index
+    index = FunctionIndex(lizard_data)
 
-    by_file = defaultdict(list)
-    for func in lizard_funcs:
-        file_ = func.get("file")
+    # 같은 파일의 warning 들은 한 번에 조회한다
+    positions_by_file = defaultdict(list)
+    for i, w in enumerate(cpplint_data):
+        file_ = w.get("file")
         if not file_:
             continue
-        by_file[file_].append(func)
+        positions_by_file[file_].append(i)
 
-    # 각 파일별로 start_line 기준으로 정렬해 두면 탐색이 조금 더 직관적
-    for file_, funcs in by_file.items():
-        funcs.sort(key=lambda f: f.get("start_line", 0))
+    func_recs = {}
+    for file_, positions in positions_by_file.items():
+        lines = [cpplint_data[i].get("line") for i in positions]
+        func_recs.update(zip(positions, index.find_many(file_, lines)))
 
-    return by_file
+    matched_warnings = []
 
+    for i, w in enumerate(cpplint_data):
+        func_rec = func_recs.get(i)
+        if func_rec is None:
+            continue  # 매칭 실패 → 버림
 
-def find_function_for_warning(warning, funcs_in_file):
-    line = warning.get("line")
-    if line is None:
-        return None
+        # 원래 warning 필드를 복사하고, lizard function 필드를 추가
+        w2 = dict(w)
+        w2["function"] = func_rec.get("function")
 
-    for func in funcs_in_file:
-        start = func.get("start_line")
-        end = func.get("end_line")
-        if start is None or end is None:
-            continue
-        if start <= line <= end:
-            return func
+        matched_warnings.append(w2)
 
-    return None
+    return matched_warnings
 
 
 def main():
@@ -61,29 +68,7 @@ def main():
     cpplint_data = load_json(cpplint_path)
     lizard_data = load_json(lizard_path)
 
-    # file -> [functions ...]
-    funcs_by_file = build_functions_by_file(lizard_data)
-
-    matched_warnings = []
-
-    for w in cpplint_data:
-        file_ = w.get("file")
-        if not file_:
-            continue
-
-        funcs_in_file = funcs_by_file.get(file_, [])
-        if not funcs_in_file:
-            continue
-
-        func_rec = find_function_for_warning(w, funcs_in_file)
-        if func_rec is None:
-            continue  # 매칭 실패 → 버림
-
-        # 원래 warning 필드를 복사하고, lizard function 필드를 추가
-        w2 = dict(w)
-        w2["function"] = func_rec.get("function")
-
-        matched_warnings.append(w2)
+    matched_warnings = attach_functions(cpplint_data, lizard_data)
 
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(matched_warnings, f, indent=2, ensure_ascii=False)
@@ -68,6 +68,17 @@ def parse_cpplint_line(line: str, repo_root: Path):
     }
 
 
+def parse_cpplint(path: Path, repo_root: Path):
+    """cpplint_result.txt 를 읽어 warning record 리스트를 반환하는 stage 함수."""
+    results = []
+    with path.open("r", encoding="utf-8", errors="ignore") as f:
+        for raw in f:
+            rec = parse_cpplint_line(raw, repo_root)
+            if rec is not None:
+                results.append(rec)
+    return results
+
+
 def main():
     repo_root = Path.cwd()                  # Celery에서 cwd=repo_dir 로 실행된다고 가정
     inp = repo_root / "cpplint_result.txt"
@@ -76,12 +87,7 @@ def main():
     if not inp.is_file():
         raise FileNotFoundError(f"cpplint_result.txt not found at {inp}")
 
-    results = []
-    with inp.open("r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            rec = parse_cpplint_line(raw, repo_root)
-            if rec is not None:
-                results.append(rec)
+    results = parse_cpplint(inp, repo_root)
 
     with outp.open("w", encoding="utf-8") as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,75 @@
+"""
+file_cache.py
+파일 캐시들(결과 캐시, layout 캐시, bitcode 캐시)이 같이 쓰는 파일 쓰기 / 정리 헬퍼.
+
+- write_atomic / copy_atomic: 같은 디렉토리의 임시 파일에 쓴 뒤 os.replace 로 바꿔,
+  동시에 읽는 쪽이 쓰다 만 파일을 보지 않게 한다.
+- evict_oldest: 디렉토리 아래 파일 크기 합이 상한을 넘으면 mtime 이 오래된 것부터 지운다.
+  (캐시 hit 때 os.utime 으로 mtime 을 갱신하면 LRU 가 된다)
+
+Django 에 의존하지 않으므로 scripts/bc_cache.py 처럼 worker 밖에서 실행되는 스크립트도 쓸 수 있다.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def _replace_atomic(path, write):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_atomic(path, data: bytes):
+    _replace_atomic(path, lambda f: f.write(data))
+
+
+def copy_atomic(src, path):
+    def write(f):
+        with open(src, "rb") as s:
+            shutil.copyfileobj(s, f)
+
+    _replace_atomic(path, write)
+
+
+def touch(path):
+    """캐시 hit 표시 (mtime 갱신). 실패해도 무시한다."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_oldest(root, max_bytes: int, pattern: str = "*/*"):
+    """root 아래 pattern 파일들의 크기 합이 max_bytes 를 넘으면 mtime 이 오래된 것부터 90% 이하가 될 때까지 지운다."""
+    entries = []
+    total = 0
+    for path in Path(root).glob(pattern):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    if total <= max_bytes:
+        return
+    target = int(max_bytes * 0.9)
+    for _mtime, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,97 @@
+"""
+function_index.py
+lizard_result.json 의 function 범위(start_line ~ end_line)로 "파일 F 의 N 번째 줄을 감싸는 function" 을 찾는 index.
+
+파일마다 function 범위의 경계(start, end + 1)로 줄 번호를 구간(segment)으로 나누고,
+구간마다 그 구간을 감싸는 function 하나를 미리 정해 둔다. 조회는 경계 리스트에 대한 이분 탐색 한 번.
+
+여러 function 이 같은 줄을 감싸면 (중첩된 local class 의 method, lambda 등) 가장 안쪽 function 을 고른다:
+  start_line 이 가장 큰 것 -> end_line 이 가장 작은 것 -> lizard_result.json 에서 먼저 나온 것
+"""
+
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
+
+
+class IntervalIndex:
+    """한 파일 안의 function 범위 index."""
+
+    def __init__(self, funcs):
+        intervals = []
+        for order, func in enumerate(funcs):
+            start = func.get("start_line")
+            end = func.get("end_line")
+            if start is None or end is None or end < start:
+                continue
+            intervals.append((start, end, order, func))
+        intervals.sort(key=lambda iv: iv[0])
+
+        points = sorted({iv[0] for iv in intervals} | {iv[1] + 1 for iv in intervals})
+
+        # 경계를 순서대로 훑으면서 현재 줄을 감싸는 function 들을 heap 에 유지한다
+        # heap 의 top 이 가장 안쪽 function: (-start, end, order)
+        self.bounds = points
+        self.owners = []
+        heap = []
+        i = 0
+        for point in points:
+            while i < len(intervals) and intervals[i][0] <= point:
+                start, end, order, func = intervals[i]
+                heapq.heappush(heap, (-start, end, order, func))
+                i += 1
+            while heap and heap[0][1] < point:
+                heapq.heappop(heap)
+            self.owners.append(heap[0][3] if heap else None)
+
+    def find(self, line):
+        """line 을 감싸는 가장 안쪽 function record (없으면 None)."""
+        if line is None:
+            return None
+        pos = bisect_right(self.bounds, line) - 1
+        if pos < 0:
+            return None
+        return self.owners[pos]
+
+    def find_sorted(self, lines):
+        """오름차순으로 정렬된 줄 번호들을 받아 차례로 function record (또는 None) 를 yield 한다."""
+        bounds = self.bounds
+        pos = -1
+        for line in lines:
+            while pos + 1 < len(bounds) and bounds[pos + 1] <= line:
+                pos += 1
+            yield self.owners[pos] if pos >= 0 else None
+
+
+class FunctionIndex:
+    """lizard function record 들로 만든 파일별 IntervalIndex 모음."""
+
+    def __init__(self, lizard_data):
+        by_file = defaultdict(list)
+        for func in lizard_data:
+            file_ = func.get("file")
+            if not file_:
+                continue
+            by_file[file_].append(func)
+        self.files = {file_: IntervalIndex(funcs) for file_, funcs in by_file.items()}
+
+    def find(self, file_, line):
+        index = self.files.get(file_)
+        if index is None:
+            return None
+        return index.find(line)
+
+    def find_many(self, file_, lines):
+        """한 파일의 여러 줄을 한 번에 조회한다. 결과는 lines 순서와 같다."""
+        index = self.files.get(file_)
+        if index is None:
+            return [None] * len(lines)
+
+        positions = sorted(
+            (i for i, line in enumerate(lines) if line is not None),
+            key=lambda i: lines[i],
+        )
+        results = [None] * len(lines)
+        for i, func in zip(positions, index.find_sorted(lines[i] for i in positions)):
+            results[i] = func
+        return results
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import json
+from pathlib import Path
+
+try:
+    from .function_index import FunctionIndex
+except ImportError:  # python3 infer_add_function.py 로 직접 실행한 경우
+    from function_index import FunctionIndex
+
+
+def load_json_if_exists(path: Path):
+    if not path.is_file():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def attach_missing_functions(infer_data, lizard_data):
+    """
+    procedure 가 비어 있는 infer warning 에 해당 라인을 감싸는 lizard function 이름을 채우는 stage 함수.
+    (cpplint 와 달리 매칭에 실패한 warning 도 버리지 않는다)
+    """
+    index = FunctionIndex(lizard_data)
+
+    results = []
+    for w in infer_data:
+        if not w.get("function"):
+            func_rec = index.find(w.get("file"), w.get("line"))
+            if func_rec is not None:
+                w = dict(w)
+                w["function"] = func_rec.get("function")
+        results.append(w)
+
+    return results
+
+
+def main():
+    repo_root = Path.cwd()
+
+    infer_path = repo_root / "infer_result.json"
+    lizard_path = repo_root / "lizard_result.json"
+    out_path = repo_root / "infer_with_funcs.json"
+
+    print(f"[infer_add_function] infer  input = {infer_path}")
+    print(f"[infer_add_function] lizard input = {lizard_path}")
+    print(f"[infer_add_function] output      = {out_path}")
+
+    infer_data = load_json_if_exists(infer_path)
+    lizard_data = load_json_if_exists(lizard_path)
+
+    results = attach_missing_functions(infer_data, lizard_data)
+
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print(f"[infer_add_function] Wrote {out_path}: {len(results)} warnings.")
+
+
+if __name__ == "__main__":
+    main()
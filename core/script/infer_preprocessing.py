@@ -18,22 +18,8 @@ def map_severity_level(severity: str) -> str:
     return "LOW"
 
 
-def main():
-    repo_root = Path.cwd()
-
-    inp =  repo_root / "infer-out" / "report.json"
-    outp = repo_root / "infer_result.json"
-
-    if inp is None:
-        raise FileNotFoundError("Cannot find infer report JSON.")
-
-    
-    print(f"[infer_preprocessing] input  = {inp}")
-    print(f"[infer_preprocessing] output = {outp}")
-
-    with inp.open("r", encoding="utf-8", errors="ignore") as f:
-        data = json.load(f)
-
+def convert_infer_report(data):
+    """infer-out/report.json 의 파싱 결과를 warning record 리스트로 바꾸는 stage 함수."""
     # 데이터가 dict 하나일 수도 있고, list 일 수도 있어서 통일
     if isinstance(data, dict):
         records = [data]
@@ -65,6 +51,26 @@ def main():
             "tool": "infer",
         }
         results.append(rec)
+    return results
+
+
+def main():
+    repo_root = Path.cwd()
+
+    inp =  repo_root / "infer-out" / "report.json"
+    outp = repo_root / "infer_result.json"
+
+    if inp is None:
+        raise FileNotFoundError("Cannot find infer report JSON.")
+
+    
+    print(f"[infer_preprocessing] input  = {inp}")
+    print(f"[infer_preprocessing] output = {outp}")
+
+    with inp.open("r", encoding="utf-8", errors="ignore") as f:
+        data = json.load(f)
+
+    results = convert_infer_report(data)
 
     with outp.open("w", encoding="utf-8") as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
@@ -10,6 +10,10 @@ def load_json(path: Path):
         return json.load(f)
 
 
+# cg_analytics 가 붙이는 graph 지표 (이전 결과의 cg_filtered.json 에는 없을 수 있다)
+CG_ANALYTICS_FIELDS = ("scc", "scc_size", "recursive", "call_depth", "pagerank", "betweenness")
+
+
 def build_cg_index(cg_nodes):
 
     index = {}
@@ -25,6 +29,9 @@ def build_cg_index(cg_nodes):
             "out_degree": node.get("out_degree", 0),
             "degree": node.get("degree", 0),
         }
+        for field in CG_ANALYTICS_FIELDS:
+            if field in node:
+                index[key][field] = node[field]
     return index
 
 
@@ -50,30 +57,8 @@ def build_warning_stats(warnings):
     return stats
 
 
-def main():
-    repo_root = Path.cwd()
-
-    lizard_path = repo_root / "lizard_result.json"
-    cg_path = repo_root / "cg_filtered.json"
-    warnings_path = repo_root / "warnings.json"
-    out_path = repo_root / "functions.json"
-
-    print(f"[build_functions] lizard input   = {lizard_path}")
-    print(f"[build_functions] cg input       = {cg_path}")
-    print(f"[build_functions] warnings input = {warnings_path}")
-    print(f"[build_functions] output         = {out_path}")
-
-    if not lizard_path.is_file():
-        raise FileNotFoundError(f"lizard_result.json not found at {lizard_path}")
-    if not cg_path.is_file():
-        raise FileNotFoundError(f"cg_filtered.json not found at {cg_path}")
-    if not warnings_path.is_file():
-        raise FileNotFoundError(f"warnings.json not found at {warnings_path}")
-
-    lizard_data = load_json(lizard_path)
-    cg_data = load_json(cg_path)
-    warnings_data = load_json(warnings_path)
-
+def build_functions(lizard_data, cg_data, warnings_data):
+    """lizard function 에 cg degree / graph 지표와 warning 통계를 붙여 functions.json 을 만드는 stage 함수."""
     cg_nodes = cg_data.get("nodes", [])
 
     # 1) (file,function) -> degree 정보
@@ -115,6 +100,9 @@ def main():
         func_rec["in_degree"] = deg["in_degree"]
         func_rec["out_degree"] = deg["out_degree"]
         func_rec["degree"] = deg["degree"]
+        for field in CG_ANALYTICS_FIELDS:
+            if field in deg:
+                func_rec[field] = deg[field]
 
         # warning 통계 붙이기 (없으면 0으로 채운다)
         wstat = warn_stats.get(key, {"HIGH": 0, "MID": 0, "LOW": 0})
@@ -126,6 +114,35 @@ def main():
 
         functions.append(func_rec)
 
+    return functions
+
+
+def main():
+    repo_root = Path.cwd()
+
+    lizard_path = repo_root / "lizard_result.json"
+    cg_path = repo_root / "cg_filtered.json"
+    warnings_path = repo_root / "warnings.json"
+    out_path = repo_root / "functions.json"
+
+    print(f"[build_functions] lizard input   = {lizard_path}")
+    print(f"[build_functions] cg input       = {cg_path}")
+    print(f"[build_functions] warnings input = {warnings_path}")
+    print(f"[build_functions] output         = {out_path}")
+
+    if not lizard_path.is_file():
+        raise FileNotFoundError(f"lizard_result.json not found at {lizard_path}")
+    if not cg_path.is_file():
+        raise FileNotFoundError(f"cg_filtered.json not found at {cg_path}")
+    if not warnings_path.is_file():
+        raise FileNotFoundError(f"warnings.json not found at {warnings_path}")
+
+    lizard_data = load_json(lizard_path)
+    cg_data = load_json(cg_path)
+    warnings_data = load_json(warnings_path)
+
+    functions = build_functions(lizard_data, cg_data, warnings_data)
+
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(functions, f, indent=2, ensure_ascii=False)
 
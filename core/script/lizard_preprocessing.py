@@ -14,6 +14,47 @@ def normalize_file_path(path_str: str) -> str:
     return path_str
 
 
+def parse_lizard_rows(rows):
+    """lizard csv row 들을 function record 리스트로 바꾼다."""
+    results = []
+    for row in rows:
+        # 빈 줄이나 컬럼 수 안 맞으면 스킵
+        if not row or len(row) < 11:
+            continue
+
+        try:
+            nloc = int(row[0])
+            ccn = int(row[1])
+            param_count = int(row[3])
+            length = int(row[4])
+            file_path = normalize_file_path(row[6])
+            func_name = row[7]
+            start_line = int(row[9])
+            end_line = int(row[10])
+        except ValueError:
+            # 숫자 파싱 실패하는 헤더/이상행 등은 스킵
+            continue
+
+        rec = {
+            "NLOC": nloc,
+            "CCN": ccn,
+            "param": param_count,
+            "length": length,
+            "file": file_path,
+            "function": func_name,
+            "start_line": start_line,
+            "end_line": end_line,
+        }
+        results.append(rec)
+    return results
+
+
+def parse_lizard_csv(path: Path):
+    """lizard_result.csv 를 읽어 function record 리스트를 반환하는 stage 함수."""
+    with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+        return parse_lizard_rows(csv.reader(f))
+
+
 def main():
     repo_root = Path.cwd() 
     inp = repo_root / "lizard_result.csv"
@@ -25,38 +66,7 @@ def main():
     if not inp.is_file():
         raise FileNotFoundError(f"lizard_result.csv not found at {inp}")
 
-    results = []
-    with inp.open("r", encoding="utf-8", errors="ignore", newline="") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            # 빈 줄이나 컬럼 수 안 맞으면 스킵
-            if not row or len(row) < 11:
-                continue
-
-            try:
-                nloc = int(row[0])
-                ccn = int(row[1])
-                param_count = int(row[3])
-                length = int(row[4])
-                file_path = normalize_file_path(row[6])
-                func_name = row[7]
-                start_line = int(row[9])
-                end_line = int(row[10])
-            except ValueError:
-                # 숫자 파싱 실패하는 헤더/이상행 등은 스킵
-                continue
-
-            rec = {
-                "NLOC": nloc,
-                "CCN": ccn,
-                "param": param_count,
-                "length": length,
-                "file": file_path,
-                "function": func_name,
-                "start_line": start_line,
-                "end_line": end_line,
-            }
-            results.append(rec)
+    results = parse_lizard_csv(inp)
 
     with outp.open("w", encoding="utf-8") as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
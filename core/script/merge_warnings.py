@@ -26,20 +26,8 @@ def build_id(rec: dict) -> str:
     return f"{file_}@{func}@{line_str}@{warning}"
 
 
-def main():
-    repo_root = Path.cwd()
-
-    cpplint_path = repo_root / "cpplint_with_funcs.json"
-    infer_path = repo_root / "infer_result.json"
-    out_path = repo_root / "warnings.json"
-
-    print(f"[merge_warnings] cpplint input = {cpplint_path}")
-    print(f"[merge_warnings] infer   input = {infer_path}")
-    print(f"[merge_warnings] output       = {out_path}")
-
-    cpplint_data = load_json_if_exists(cpplint_path)
-    infer_data = load_json_if_exists(infer_path)
-
+def merge_warnings(cpplint_data, infer_data):
+    """cpplint / infer warning 을 id 기준으로 중복 제거하며 합치는 stage 함수."""
     merged = []
     seen_ids = set()
 
@@ -63,6 +51,25 @@ def main():
         merged.append(rec_with_id)
         seen_ids.add(rid)
 
+    return merged
+
+
+def main():
+    repo_root = Path.cwd()
+
+    cpplint_path = repo_root / "cpplint_with_funcs.json"
+    infer_path = repo_root / "infer_result.json"
+    out_path = repo_root / "warnings.json"
+
+    print(f"[merge_warnings] cpplint input = {cpplint_path}")
+    print(f"[merge_warnings] infer   input = {infer_path}")
+    print(f"[merge_warnings] output       = {out_path}")
+
+    cpplint_data = load_json_if_exists(cpplint_path)
+    infer_data = load_json_if_exists(infer_path)
+
+    merged = merge_warnings(cpplint_data, infer_data)
+
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(merged, f, indent=2, ensure_ascii=False)
 
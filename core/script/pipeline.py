@@ -0,0 +1,292 @@
+"""
+pipeline.py
+core/script 의 stage 함수들을 Celery worker 프로세스 안에서 순서대로 실행하는 runner.
+
+- stage 마다 python3 를 새로 띄우지 않고, import 한 함수를 직접 호출한다.
+- stage 사이의 결과는 파싱된 객체 그대로 메모리(artifacts)로 넘긴다.
+  (예: lizard_result.json 은 한 번만 읽고 cg_filter / cpplint_add_function / lizard_filter 가 공유)
+- persist=True 인 산출물만 repo_dir 에 JSON 으로 쓴다. (stage 가 bytes 를 반환하면 그대로 쓴다)
+- 메모리에 없는 입력은 (이전 Celery task 가 만든 파일 등) repo_dir 에서 읽는다.
+- profile_dir 이 주어지면 stage 마다 cProfile / tracemalloc 결과를 그 디렉토리에 남긴다 (profiling.py).
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from . import (
+    cg_analytics,
+    cg_filter,
+    cg_index,
+    cg_layout,
+    cg_lod,
+    cg_preprocessing,
+    columnar,
+    cpplint_add_function,
+    cpplint_preprocessing,
+    infer_add_function,
+    infer_preprocessing,
+    lizard_filter,
+    lizard_preprocessing,
+    merge_warnings,
+    profiling,
+    result_index,
+)
+
+
+class StageError(Exception):
+    """stage 실행 중 발생한 예외를 stage 이름과 함께 감싼다."""
+
+    def __init__(self, stage_name: str, cause: Exception):
+        super().__init__(f"{stage_name}: {cause}")
+        self.stage_name = stage_name
+        self.cause = cause
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: Callable
+    inputs: tuple
+    output: str
+    # False 이면 다음 stage 에만 메모리로 넘기고 파일로는 쓰지 않는다
+    persist: bool = True
+    # 파일이 없으면 빈 리스트로 대신하는 입력들
+    optional_inputs: frozenset = frozenset()
+    # stage 함수가 repo_root 키워드 인자를 받는지 여부
+    pass_repo_root: bool = False
+    # True 이면 indent 없이 쓴다 (사람이 볼 일 없는 큰 중간 산출물용)
+    compact: bool = False
+    # Pipeline options 중 stage 함수에 keyword 인자로 넘길 이름들 (없으면 None)
+    options: tuple = ()
+
+
+class Pipeline:
+    def __init__(self, repo_dir, options=None, profile_dir=None):
+        self.repo_dir = Path(repo_dir)
+        self.options = options or {}
+        self.profile_dir = profile_dir
+        self.artifacts = {}
+
+    def load(self, name: str, optional: bool = False):
+        if name in self.artifacts:
+            return self.artifacts[name]
+
+        path = self.repo_dir / name
+        if not path.is_file():
+            if optional:
+                return []
+            raise FileNotFoundError(f"{name} not found at {path}")
+
+        # .txt / .csv 같은 원시 tool 출력은 stage 가 직접 스트리밍으로 읽도록 경로만 넘긴다
+        if path.suffix != ".json":
+            return path
+
+        with path.open("r", encoding="utf-8", errors="ignore") as f:
+            data = json.load(f)
+        self.artifacts[name] = data
+        return data
+
+    def write(self, name: str, data, compact: bool = False):
+        out_path = self.repo_dir / name
+        # binary 산출물 (.bin 등) 은 그대로 쓴다
+        if isinstance(data, bytes):
+            out_path.write_bytes(data)
+            return
+        with out_path.open("w", encoding="utf-8") as f:
+            if compact:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            else:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def run_stage(self, stage: Stage):
+        if self.profile_dir is not None:
+            return profiling.profile_call(lambda: self._run_stage(stage), self.profile_dir, stage.name)
+        return self._run_stage(stage)
+
+    def _run_stage(self, stage: Stage):
+        args = [self.load(name, name in stage.optional_inputs) for name in stage.inputs]
+        kwargs = {"repo_root": self.repo_dir} if stage.pass_repo_root else {}
+        kwargs.update((name, self.options.get(name)) for name in stage.options)
+
+        result = stage.func(*args, **kwargs)
+
+        self.artifacts[stage.output] = result
+        if stage.persist:
+            self.write(stage.output, result, compact=stage.compact)
+        return result
+
+    def run(self, stages, errors=None, on_stage=None):
+        """
+        stages 를 순서대로 실행한다.
+        errors 리스트가 주어지면 실패한 stage 를 기록하고 다음 stage 로 넘어가고,
+        주어지지 않으면 첫 실패에서 StageError 를 던진다.
+        on_stage 가 주어지면 stage 하나가 끝날 때마다 on_stage(i, total, stage, elapsed, ok) 를 호출한다.
+        """
+        total = len(stages)
+        for i, stage in enumerate(stages, start=1):
+            started = time.perf_counter()
+            try:
+                self.run_stage(stage)
+            except Exception as e:
+                if on_stage is not None:
+                    on_stage(i, total, stage, time.perf_counter() - started, False)
+                if errors is None:
+                    raise StageError(stage.name, e) from e
+                errors.append(f"[{i}/{total}] {stage.name}: {e}")
+                continue
+
+            elapsed = time.perf_counter() - started
+            print(f"[pipeline] [{i}/{total}] {stage.name} -> {stage.output} ({elapsed:.2f}s)")
+            if on_stage is not None:
+                on_stage(i, total, stage, elapsed, True)
+
+        return self.artifacts
+
+
+def stage_files(stages):
+    """
+    (stages 밖에서 받아야 하는 입력 파일들, stages 가 만드는 파일들).
+    persist=False stage 의 output 도 포함한다 (stage 가 직접 쓰는 경우가 있어서, 실제 크기는 파일 유무로 판단).
+    """
+    outputs = list(dict.fromkeys(stage.output for stage in stages))
+    inputs = []
+    for stage in stages:
+        for name in stage.inputs:
+            if name not in outputs and name not in inputs:
+                inputs.append(name)
+    return inputs, outputs
+
+
+# --- 분석 tool 별 전처리 stage (각 분석 Celery task 직후 실행) ---
+
+CG_PREPROCESSING = Stage(
+    "cg_preprocessing",
+    cg_preprocessing.build_cg,
+    ("cg.txt",),
+    "cg.json",
+    compact=True,
+)
+
+INFER_PREPROCESSING = Stage(
+    "infer_preprocessing",
+    infer_preprocessing.convert_infer_report,
+    ("infer-out/report.json",),
+    "infer_result.json",
+)
+
+CPPLINT_PREPROCESSING = Stage(
+    "cpplint_preprocessing",
+    cpplint_preprocessing.parse_cpplint,
+    ("cpplint_result.txt",),
+    "cpplint_result.json",
+    pass_repo_root=True,
+)
+
+LIZARD_PREPROCESSING = Stage(
+    "lizard_preprocessing",
+    lizard_preprocessing.parse_lizard_csv,
+    ("lizard_result.csv",),
+    "lizard_result.json",
+)
+
+
+# --- 최종 전처리 stage (run_preprocessing_task) ---
+
+PREPROCESSING_STAGES = [
+    # 1) Filtering Function
+    Stage(
+        "cg_filter",
+        cg_filter.filter_cg,
+        ("cg.json", "lizard_result.json"),
+        "cg_filtered.json",
+        # 뒤의 analytics / layout 이 실패해도 /cg/ 가 filter 결과는 돌려줄 수 있도록 먼저 한 번 쓴다
+        # (다음 stage 들이 덮어쓰므로 빠른 compact 형식)
+        compact=True,
+    ),
+    # SCC / call_depth / PageRank / betweenness 를 node 에 붙인다 (파일은 cg_layout 이 쓴다)
+    Stage(
+        "cg_analytics",
+        cg_analytics.annotate_cg,
+        ("cg_filtered.json",),
+        "cg_filtered.json",
+        persist=False,
+    ),
+    # 2D 좌표 (x, y) 를 붙여서 cg_filtered.json 으로 저장. 좌표 계산이 실패하면 좌표 없이 저장한다
+    Stage(
+        "cg_layout",
+        cg_layout.layout_cg,
+        ("cg_filtered.json",),
+        "cg_filtered.json",
+        options=("layout_cache_dir", "layout_max_nodes", "layout_cache_max_bytes"),
+    ),
+    # 2) Add Function Data and Merge Warnings
+    Stage(
+        "cpplint_add_function",
+        cpplint_add_function.attach_functions,
+        ("cpplint_result.json", "lizard_result.json"),
+        "cpplint_with_funcs.json",
+        persist=False,
+    ),
+    Stage(
+        "infer_add_function",
+        infer_add_function.attach_missing_functions,
+        ("infer_result.json", "lizard_result.json"),
+        "infer_with_funcs.json",
+        persist=False,
+        optional_inputs=frozenset({"infer_result.json", "lizard_result.json"}),
+    ),
+    Stage(
+        "merge_warnings",
+        merge_warnings.merge_warnings,
+        ("cpplint_with_funcs.json", "infer_with_funcs.json"),
+        "warnings.json",
+        optional_inputs=frozenset({"cpplint_with_funcs.json", "infer_with_funcs.json"}),
+    ),
+    # 3) Add Warning Data and Filtering
+    Stage(
+        "lizard_filter",
+        lizard_filter.build_functions,
+        ("lizard_result.json", "cg_filtered.json", "warnings.json"),
+        "functions.json",
+    ),
+    # 4) 프론트엔드용 binary columnar 사본 (Accept: application/vnd.infovis.columnar)
+    Stage(
+        "cg_columnar",
+        columnar.encode_cg,
+        ("cg_filtered.json",),
+        "cg_filtered.bin",
+    ),
+    Stage(
+        "functions_columnar",
+        columnar.encode_functions,
+        ("functions.json",),
+        "functions.bin",
+    ),
+    # 5) warnings / functions 조회 API 용 SQLite index
+    Stage(
+        "result_index",
+        result_index.build_result_index,
+        ("warnings.json", "functions.json"),
+        result_index.INDEX_FILENAME,
+        persist=False,
+        pass_repo_root=True,
+    ),
+    # 6) call graph 이웃 조회 API 용 정방향 / 역방향 adjacency index
+    Stage(
+        "cg_index",
+        cg_index.build_adjacency_index,
+        ("cg_filtered.json",),
+        cg_index.INDEX_FILENAME,
+    ),
+    # 7) directory / file / function 단계별로 묶은 level-of-detail graph
+    Stage(
+        "cg_lod",
+        cg_lod.build_lod,
+        ("cg_filtered.json", "functions.json"),
+        cg_lod.LOD_FILENAME,
+        compact=True,
+    ),
+]
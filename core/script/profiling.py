@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+profiling.py
+stage 하나를 cProfile + tracemalloc 아래에서 실행하고 결과를 파일로 남긴다. (Task 의 profile 옵션)
+
+  <out_dir>/<stage>.prof       cProfile 원본 (python -m pstats, snakeviz 등으로 열기)
+  <out_dir>/<stage>.alloc.txt  실행 시간, 최대 메모리, 끝난 시점에 남아 있는 할당 상위 줄, 누적 시간 상위 함수
+
+tracemalloc 은 할당마다 기록하므로 stage 가 몇 배 느려진다. profile 을 켠 Task 에서만 쓴다.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_DIRNAME = "profile"
+
+# 할당 위치로 남길 traceback 깊이 / report 에 적을 상위 개수
+TRACE_FRAMES = 1
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 30
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def _write_report(path: Path, name: str, elapsed: float, peak: int, stats, profiler):
+    lines = [
+        f"stage: {name}",
+        f"wall time: {elapsed:.3f}s (cProfile + tracemalloc 포함)",
+        f"peak traced memory: {peak / (1 << 20):.1f} MiB",
+        "",
+        f"top {TOP_ALLOCATIONS} allocations still alive at the end of the stage:",
+    ]
+    lines.extend(f"  {stat}" for stat in stats[:TOP_ALLOCATIONS])
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    lines += ["", f"top {TOP_FUNCTIONS} functions by cumulative time:", out.getvalue()]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def profile_call(func, out_dir, name: str):
+    """func() 를 profile 하면서 실행하고 그 반환값을 돌려준다. 실패해도 그때까지의 profile 은 남긴다."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # 이미 다른 곳에서 tracing 중이면 stage 전후 snapshot 의 차이만 본다
+    owns_tracing = not tracemalloc.is_tracing()
+    if owns_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+        baseline = None
+    else:
+        baseline = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        return profiler.runcall(func)
+    finally:
+        elapsed = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        _, peak = tracemalloc.get_traced_memory()
+        if owns_tracing:
+            tracemalloc.stop()
+
+        if baseline is None:
+            stats = snapshot.statistics("lineno")
+        else:
+            stats = snapshot.compare_to(baseline, "lineno")
+        profiler.dump_stats(str(out_dir / f"{name}.prof"))
+        _write_report(out_dir / f"{name}.alloc.txt", name, elapsed, peak, stats, profiler)
@@ -0,0 +1,125 @@
+"""
+result_index.py
+warnings.json / functions.json 을 조회용 SQLite 파일(results.sqlite3)로 한 번 적재하는 stage.
+
+API 가 요청마다 JSON 전체를 읽고 훑지 않도록, 필터 / 정렬에 쓰는 column 에 index 를 걸어 둔다.
+정렬 column 의 단일 index 는 (column, rowid) 순이라 cursor 페이지네이션이 정렬 없이 index 를 그대로 읽는다.
+조회는 core/result_query.py 에서 한다.
+
+테이블 column 이름은 JSON key 와 같다. 단 functions.json 의 "warning": {"HIGH", "MID", "LOW"} 는
+warning_high / warning_mid / warning_low 세 column 으로 펼친다.
+"""
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+INDEX_FILENAME = "results.sqlite3"
+
+WARNING_COLUMNS = [
+    ("id", "TEXT"),
+    ("file", "TEXT"),
+    ("function", "TEXT"),
+    ("line", "INTEGER"),
+    ("column", "INTEGER"),
+    ("tool", "TEXT"),
+    ("severity_level", "TEXT"),
+    ("severity", "TEXT"),
+    ("category", "TEXT"),
+    ("warning", "TEXT"),
+    ("detail", "TEXT"),
+]
+
+FUNCTION_COLUMNS = [
+    ("file", "TEXT"),
+    ("function", "TEXT"),
+    ("NLOC", "INTEGER"),
+    ("CCN", "INTEGER"),
+    ("param", "INTEGER"),
+    ("length", "INTEGER"),
+    ("start_line", "INTEGER"),
+    ("end_line", "INTEGER"),
+    ("in_degree", "INTEGER"),
+    ("out_degree", "INTEGER"),
+    ("degree", "INTEGER"),
+    ("scc", "INTEGER"),
+    ("scc_size", "INTEGER"),
+    ("recursive", "INTEGER"),
+    ("call_depth", "INTEGER"),
+    ("pagerank", "REAL"),
+    ("betweenness", "REAL"),
+    ("warning_high", "INTEGER"),
+    ("warning_mid", "INTEGER"),
+    ("warning_low", "INTEGER"),
+]
+
+# 정렬할 수 있는 column (긴 메시지 text 는 제외)
+WARNING_SORTABLE = [c for c, _ in WARNING_COLUMNS if c not in ("warning", "detail")]
+FUNCTION_SORTABLE = [c for c, _ in FUNCTION_COLUMNS if not c.startswith("warning_")]
+
+INDEXES = [
+    ("warnings", ("file", "line")),
+    ("functions", ("file", "start_line")),
+    *(("warnings", (c,)) for c in WARNING_SORTABLE),
+    *(("functions", (c,)) for c in FUNCTION_SORTABLE),
+]
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _create_table(conn, table, columns, rows):
+    conn.execute(f"CREATE TABLE {table} ({', '.join(f'{quote(c)} {t}' for c, t in columns)})")
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+
+def _warning_rows(warnings_data):
+    names = [c for c, _ in WARNING_COLUMNS]
+    for w in warnings_data:
+        yield tuple(w.get(name) for name in names)
+
+
+def _function_rows(functions_data):
+    names = [c for c, _ in FUNCTION_COLUMNS if not c.startswith("warning_")]
+    for f in functions_data:
+        counts = f.get("warning") or {}
+        yield tuple(f.get(name) for name in names) + (
+            counts.get("HIGH", 0),
+            counts.get("MID", 0),
+            counts.get("LOW", 0),
+        )
+
+
+def build_result_index(warnings_data, functions_data, repo_root):
+    """repo_root/results.sqlite3 를 새로 만들고 경로를 반환하는 stage 함수."""
+    out_path = Path(repo_root) / INDEX_FILENAME
+    # 다 만든 뒤 rename 해서, 읽는 쪽이 만들다 만 파일을 보지 않게 한다
+    fd, tmp = tempfile.mkstemp(dir=str(out_path.parent), prefix=f".{INDEX_FILENAME}.")
+    os.close(fd)
+    tmp_path = Path(tmp)
+
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        # 한 번 쓰고 읽기만 하는 파일이라 journal 없이 한 transaction 으로 적재
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            _create_table(conn, "warnings", WARNING_COLUMNS, _warning_rows(warnings_data))
+            _create_table(conn, "functions", FUNCTION_COLUMNS, _function_rows(functions_data))
+            for table, cols in INDEXES:
+                conn.execute(
+                    f"CREATE INDEX {table}_{'_'.join(c.lower() for c in cols)}_idx "
+                    f"ON {table} ({', '.join(quote(c) for c in cols)})"
+                )
+        conn.execute("ANALYZE")
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, out_path)
+    return str(out_path)
@@ -0,0 +1,67 @@
+# core/status_cache.py
+"""
+Task 상태 (TaskStatusView 응답) 의 Redis write-through 캐시.
+
+- worker 는 _sync_task_status (step 시작 / 끝) 에서 DB 를 갱신하고, commit 된 뒤 같은 내용을
+  Redis hash infovis:task:<id>:status 에 쓴다. 상태 조회는 DB 를 거치지 않고 이 hash 를 읽는다.
+- hash 의 각 field 는 응답 field 하나를 JSON 으로 인코딩한 값이다 (steps 는 목록 통째로).
+  version field 에는 AnalysisTask.updated_at 을 넣어, 늦게 도착한 이전 상태가 새 상태를 덮어쓰지 않게 한다.
+- 캐시 miss (만료, Redis 재시작 등) 면 DB 에서 읽어 다시 채운다. Redis 에 연결할 수 없으면 DB 만 쓴다.
+"""
+
+import json
+
+import redis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .redis_client import get_client
+
+KEY_PREFIX = "infovis:task:"
+
+FIELDS = ("id", "github_url", "commit_sha", "status", "current_step", "created_at", "error_message", "steps")
+
+
+def key(task_id: int) -> str:
+    return f"{KEY_PREFIX}{task_id}:status"
+
+
+def _version(updated_at) -> int:
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def write(task_id: int, data: dict, updated_at):
+    """
+    data (TaskStatusView 응답 모양) 를 캐시에 쓴다.
+    캐시에 updated_at 보다 새로운 상태가 이미 있으면 쓰지 않는다.
+    """
+    name = key(task_id)
+    version = _version(updated_at)
+    mapping = {field: json.dumps(data[field], cls=DjangoJSONEncoder) for field in FIELDS}
+    mapping["version"] = version
+
+    def _write(pipe):
+        current = pipe.hget(name, "version")
+        if current is not None and int(current) > version:
+            return
+        pipe.multi()
+        pipe.hset(name, mapping=mapping)
+        pipe.expire(name, settings.STATUS_CACHE_TTL)
+
+    try:
+        get_client().transaction(_write, name)
+    except redis.RedisError as e:
+        print(f"[status_cache] write failed for task {task_id}: {e}")
+
+
+def read(task_id: int):
+    """캐시된 상태 dict. 없거나 Redis 를 쓸 수 없으면 None."""
+    try:
+        cached = get_client().hgetall(key(task_id))
+    except redis.RedisError:
+        return None
+    values = [cached.get(field.encode()) for field in FIELDS]
+    if any(value is None for value in values):
+        return None
+    return {field: json.loads(value) for field, value in zip(FIELDS, values)}
+
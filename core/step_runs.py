@@ -0,0 +1,185 @@
+# core/step_runs.py
+"""
+단계 실행 한 번의 자원 사용을 StepRun 으로 남긴다.
+
+    run = step_runs.start(task_id, 'CLANG')
+    ...  # 단계 실행
+    run.finish('COMPLETED', input_bytes=..., output_bytes=..., exit_code=...)
+
+- wall time: time.perf_counter 차이
+- CPU: getrusage(RUSAGE_SELF) + getrusage(RUSAGE_CHILDREN) 의 user/system 시간 차이
+  (worker 안에서 돈 전처리 + 기다린 tool 프로세스들. 같은 worker 프로세스는 한 번에 한 단계만 실행한다)
+- max RSS: 단계 동안의 최댓값
+    worker 자신: 시작할 때 /proc/self/clear_refs 에 "5" 를 써서 peak RSS 를 초기화하고 끝날 때 VmHWM 을 읽는다
+    tool 프로세스: wait() / run() 으로 기다리면 os.wait4 가 돌려주는 그 자식만의 ru_maxrss
+  둘 중 큰 값을 남긴다. (clear_refs 를 쓸 수 없는 환경이면 worker 쪽은 프로세스 수명 동안의 ru_maxrss)
+
+tool 프로세스는 subprocess.run / Popen.wait 대신 이 모듈의 run() / wait() 로 기다려야 max RSS 에 잡힌다.
+"""
+
+import os
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.utils import timezone
+
+from .models import StepRun
+
+
+def _cpu_times():
+    user = system = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        user += usage.ru_utime
+        system += usage.ru_stime
+    return user, system
+
+
+def _reset_peak_rss() -> bool:
+    """이 프로세스의 peak RSS (VmHWM) 를 현재 RSS 로 초기화한다. (Linux 4.0+, 실패하면 False)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    """/proc/self/status 의 VmHWM. 읽을 수 없으면 프로세스 수명 동안의 ru_maxrss."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    # Linux 의 ru_maxrss 단위는 KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# 지금 실행 중인 단계 (worker 프로세스는 한 번에 한 단계만 실행한다).
+# cpplint shard 처럼 여러 thread 가 자식 프로세스를 기다리므로 자식 기록은 lock 으로 감싼다.
+_active = None
+_lock = threading.Lock()
+
+
+def wait(proc: subprocess.Popen) -> int:
+    """
+    proc 이 끝날 때까지 기다려 exit code 를 반환한다. (Popen.wait 대신)
+    os.wait4 로 그 프로세스만의 rusage 를 받아 실행 중인 단계의 max RSS 에 반영한다.
+    """
+    if proc.returncode is not None:
+        return proc.returncode
+    try:
+        _, wait_status, usage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        # 이미 다른 곳에서 reap 된 경우
+        return proc.wait()
+    proc.returncode = os.waitstatus_to_exitcode(wait_status)
+
+    meter = _active
+    if meter is not None:
+        with _lock:
+            # Linux 의 ru_maxrss 단위는 KiB
+            meter.child_max_rss = max(meter.child_max_rss, usage.ru_maxrss * 1024)
+    return proc.returncode
+
+
+def run(args, check=False, capture_output=False, text=False, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run 과 같되 wait() 로 기다린다.
+    PIPE 로 받는 stdout / stderr 는 임시 파일로 받는다 (communicate() 는 프로세스를 직접 reap 해서 rusage 를 잃는다).
+    """
+    if capture_output:
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+
+    output = {"stdout": None, "stderr": None}
+    with ExitStack() as stack:
+        captured = {}
+        for name in output:
+            if kwargs.get(name) == subprocess.PIPE:
+                captured[name] = kwargs[name] = stack.enter_context(tempfile.TemporaryFile())
+
+        proc = subprocess.Popen(args, **kwargs)
+        try:
+            returncode = wait(proc)
+        except BaseException:
+            proc.kill()
+            wait(proc)
+            raise
+
+        for name, f in captured.items():
+            f.seek(0)
+            data = f.read()
+            output[name] = data.decode(errors="replace") if text else data
+
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, output["stdout"], output["stderr"])
+    return subprocess.CompletedProcess(args, returncode, output["stdout"], output["stderr"])
+
+
+def path_size(path) -> int:
+    """파일이면 크기, 디렉토리면 안쪽 파일 크기 합 (symlink 는 따라가지 않음), 없으면 0."""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def files_size(repo_dir, filenames) -> int:
+    """repo_dir 안 filenames 중 있는 파일들의 크기 합."""
+    return sum(path_size(Path(repo_dir) / name) for name in filenames if (Path(repo_dir) / name).is_file())
+
+
+class StepMeter:
+    def __init__(self, task_id, step):
+        self.task_id = task_id
+        self.step = step
+        self.started_at = timezone.now()
+        self._started = time.perf_counter()
+        self._cpu = _cpu_times()
+        self.child_max_rss = 0
+        _reset_peak_rss()
+
+        global _active
+        _active = self
+
+    def finish(self, status, input_bytes=None, output_bytes=None, exit_code=None) -> StepRun:
+        wall = time.perf_counter() - self._started
+        user, system = _cpu_times()
+        max_rss = max(_peak_rss_bytes(), self.child_max_rss)
+
+        global _active
+        if _active is self:
+            _active = None
+        return StepRun.objects.create(
+            task_id=self.task_id,
+            step=self.step,
+            status=status,
+            started_at=self.started_at,
+            finished_at=timezone.now(),
+            wall_seconds=wall,
+            cpu_user_seconds=user - self._cpu[0],
+            cpu_system_seconds=system - self._cpu[1],
+            max_rss_bytes=max_rss,
+            input_bytes=input_bytes,
+            output_bytes=output_bytes,
+            exit_code=exit_code,
+        )
+
+
+def start(task_id, step) -> StepMeter:
+    return StepMeter(task_id, step)
@@ -0,0 +1,93 @@
+# core/stream_runner.py
+"""
+분석 tool 의 stdout 을 파일로 받은 뒤 다시 읽지 않고, 나오는 대로 한 줄씩 파서에 넘기는 runner.
+
+- iter_process_lines() 는 자식 프로세스 stdout pipe 를 줄 단위로 yield 하고,
+  프로세스가 끝나면 exit code 를 확인한다. (check=True 이면 실패 시 CalledProcessError)
+- raw_path 를 주면 받은 줄을 그대로 파일에도 남긴다. (디버깅용, 기본은 남기지 않음)
+- stderr 는 별도 thread 가 계속 비워서 pipe 가 차 멈추는 일이 없게 하고, 에러 메시지용으로 끝부분만 보관한다.
+
+tool 이 분석하는 동안 파싱이 같이 진행되고, 원시 출력 파일을 쓰고 다시 읽는 과정이 없어진다.
+"""
+
+import csv
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+
+from . import step_runs
+from .script.cg_preprocessing import build_cg_from_lines
+from .script.lizard_preprocessing import parse_lizard_rows
+
+# CalledProcessError.stderr 로 남길 stderr 마지막 줄 수
+STDERR_TAIL_LINES = 200
+
+
+def _drain(stream, tail):
+    for line in stream:
+        tail.append(line)
+    stream.close()
+
+
+def iter_process_lines(command, cwd, raw_path=None, check=True, merge_stderr=False):
+    """command 를 실행하고 stdout 을 줄 단위로 yield 한다."""
+    proc = subprocess.Popen(
+        command,
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+        text=True,
+        errors="ignore",
+    )
+
+    tail = deque(maxlen=STDERR_TAIL_LINES)
+    drainer = None
+    if not merge_stderr:
+        drainer = threading.Thread(target=_drain, args=(proc.stderr, tail), daemon=True)
+        drainer.start()
+
+    raw = open(raw_path, "w", encoding="utf-8") if raw_path is not None else None
+    try:
+        for line in proc.stdout:
+            if raw is not None:
+                raw.write(line)
+            yield line
+        # rusage (max RSS) 를 단계 기록에 남기도록 os.wait4 로 기다린다
+        returncode = step_runs.wait(proc)
+    finally:
+        # 소비하는 쪽이 중간에 멈추거나 예외가 나면 자식 프로세스를 정리
+        if proc.returncode is None:
+            proc.kill()
+            step_runs.wait(proc)
+        proc.stdout.close()
+        if drainer is not None:
+            drainer.join()
+        if raw is not None:
+            raw.close()
+
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command, stderr="".join(tail))
+
+
+def _raw_path(repo_dir: Path, filename: str):
+    return Path(repo_dir) / filename if settings.ANALYSIS_KEEP_RAW_OUTPUT else None
+
+
+def stream_callgraph(repo_dir: Path, command):
+    """clang_cg.sh 의 stdout(print-callgraph 출력)을 바로 cg.json 형식 dict 로 만든다."""
+    lines = iter_process_lines(command, repo_dir, raw_path=_raw_path(repo_dir, "cg.txt"))
+    return build_cg_from_lines(lines)
+
+
+def stream_lizard(repo_dir: Path):
+    """lizard --csv 의 stdout 을 바로 lizard_result.json 형식 record 리스트로 만든다."""
+    lines = iter_process_lines(
+        ["lizard", "--csv"],
+        repo_dir,
+        raw_path=_raw_path(repo_dir, "lizard_result.csv"),
+        check=False,  # 파싱 못 한 파일이 있어도 나머지 결과는 쓴다 (기존 동작과 같음)
+    )
+    return parse_lizard_rows(csv.reader(lines))
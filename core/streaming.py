@@ -0,0 +1,39 @@
+# core/streaming.py
+"""
+파일 읽기 / 압축처럼 blocking 작업을 하는 sync generator 를 ASGI 에서 버퍼링 없이 내보내기 위한 헬퍼.
+
+Django 는 ASGI 에서 StreamingHttpResponse 에 sync iterator 를 주면 sync_to_async(list) 로 전부 모은 뒤 보낸다.
+async_iterate() 는 sync generator 의 next() 를 chunk 하나마다 sync_to_async 로 실행하는 async iterator 를 만든다.
+(thread_sensitive 기본값이라 한 요청의 next() / close() 는 같은 thread 에서 차례로 실행된다)
+"""
+
+from asgiref.sync import sync_to_async
+
+FILE_CHUNK_SIZE = 1 << 20
+
+_DONE = object()
+
+
+def _next(iterator):
+    return next(iterator, _DONE)
+
+
+async def async_iterate(iterator):
+    """sync iterator -> async iterator. 클라이언트가 중간에 끊으면 (aclose) 원래 generator 도 닫는다."""
+    next_chunk = sync_to_async(_next)
+    try:
+        while True:
+            chunk = await next_chunk(iterator)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def iter_file(f, chunk_size=FILE_CHUNK_SIZE):
+    """열린 binary 파일 f 를 chunk_size 씩 읽어 내보내고, 다 읽으면 (또는 닫히면) 파일을 닫는다."""
+    with f:
+        yield from iter(lambda: f.read(chunk_size), b"")
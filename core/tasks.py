@@ -1,16 +1,24 @@
 # core/tasks.py (보완된 버전)
 
-from celery import shared_task
+from celery import shared_task, chain, chord, group
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from .models import AnalysisTask
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from .models import AnalysisTask, AnalysisStep
+from . import result_cache, incremental, cpplint_runner, stream_runner, file_response, result_query, result_store, cg_neighborhood, lod_query, zip_stream, events, status_cache, step_runs
+from .script.profiling import PROFILE_DIRNAME
+from .script.pipeline import (
+    Pipeline, StageError, PREPROCESSING_STAGES, INFER_PREPROCESSING, stage_files,
+)
 import subprocess
 import shutil
 import json
 from pathlib import Path
 import os
-import io
-import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
 
 CLANG_CG_SCRIPT = os.path.join(
     settings.BASE_DIR,
@@ -33,17 +41,109 @@ def ensure_empty_json(repo_dir: Path, filename: str):
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump([], f)
 
+def _profile_dir(task, repo_dir: Path):
+    """profile 을 켠 Task 면 stage profile 결과를 남길 디렉토리, 아니면 None."""
+    return repo_dir / PROFILE_DIRNAME if task.profile else None
+
+# --- 단계별 상태 관리 ---
+# 분석 단계들이 동시에 돌 수 있으므로 각 단계는 자기 AnalysisStep row 만 갱신하고,
+# AnalysisTask.status/current_step 은 step row 들로부터 다시 계산한다.
+
+STEP_ORDER = [code for code, _ in AnalysisTask.STEP_CHOICES]
+
+# 상태 계산 / 캐시에 필요한 column 만 읽는다 (result_data 같은 큰 JSON 은 읽지 않음)
+STATUS_FIELDS = ['id', 'github_url', 'commit_sha', 'status', 'current_step', 'created_at', 'updated_at', 'error_message']
+
+
+def init_steps(task_id, steps):
+    """workflow 시작 전에 실행할 단계들을 PENDING 으로 만들어 둔다."""
+    for step in steps:
+        AnalysisStep.objects.update_or_create(
+            task_id=task_id,
+            step=step,
+            defaults={'status': 'PENDING', 'error_message': None, 'started_at': None, 'finished_at': None},
+        )
+
+
+def _start_step(task_id, step):
+    AnalysisStep.objects.update_or_create(
+        task_id=task_id,
+        step=step,
+        defaults={'status': 'RUNNING', 'error_message': None, 'started_at': timezone.now(), 'finished_at': None},
+    )
+    _sync_task_status(task_id)
+
+
+def _finish_step(task_id, step, status, error_message=None):
+    AnalysisStep.objects.update_or_create(
+        task_id=task_id,
+        step=step,
+        defaults={'status': status, 'error_message': error_message, 'finished_at': timezone.now()},
+    )
+    _sync_task_status(task_id)
+
+
+def _fail_pending_steps(task_id):
+    """앞 단계가 실패해 실행하지 않을 PENDING 단계들을 FAILED 로 끝낸다. (error_message 는 앞 단계의 것만 남긴다)"""
+    AnalysisStep.objects.filter(task_id=task_id, status='PENDING').update(status='FAILED', finished_at=timezone.now())
+    _sync_task_status(task_id)
+
+
+def _sync_task_status(task_id):
+    """
+    step row 들로 AnalysisTask 의 status/current_step/error_message 를 다시 계산한다.
+    - 실행 중인 단계가 있으면 RUNNING, current_step 은 그 중 파이프라인 순서상 가장 앞 단계
+    - 없고 실패한 단계가 있으면 FAILED, current_step 은 실패한 단계 중 파이프라인 순서상 가장 앞 단계
+      (뒤 단계가 성공해도 일부 결과가 빠졌으므로 COMPLETED 로 보고하지 않는다)
+    - 그 외에는 가장 마지막에 끝난 단계의 status/step
+    - error_message 는 실패한 단계들의 메시지를 순서대로 이어 붙인 것
+    commit 된 뒤 같은 상태를 Redis 상태 캐시에 쓰고 SSE 구독자에게 publish 한다.
+    """
+    with transaction.atomic():
+        task = AnalysisTask.objects.select_for_update().only(*STATUS_FIELDS).get(pk=task_id)
+        steps = sorted(task.steps.all(), key=lambda s: STEP_ORDER.index(s.step))
+
+        running = [s for s in steps if s.status == 'RUNNING']
+        failed = [s for s in steps if s.status == 'FAILED']
+        finished = [s for s in steps if s.finished_at is not None]
+        if running:
+            task.status = 'RUNNING'
+            task.current_step = running[0].step
+        elif failed:
+            task.status = 'FAILED'
+            task.current_step = failed[0].step
+        elif finished:
+            latest = max(finished, key=lambda s: s.finished_at)
+            task.status = latest.status
+            task.current_step = latest.step
+
+        errors = [s.error_message for s in steps if s.status == 'FAILED' and s.error_message]
+        task.error_message = "\n".join(errors) or None
+        task.save(update_fields=['status', 'current_step', 'error_message', 'updated_at'])
+
+        snapshot = events.task_snapshot(task, steps)
+        updated_at = task.updated_at
+
+        def _push():
+            status_cache.write(task_id, snapshot, updated_at)
+            events.publish(task_id, 'status', snapshot)
+
+        transaction.on_commit(_push)
+
+
 # 모든 분석 작업을 처리하는 공통 헬퍼 함수
-def _execute_analysis(task_id, step_name, command_list, output_filename, path_field, preprocessing=None):
-    task = get_object_or_404(AnalysisTask, pk=task_id)
+def _execute_analysis(task_id, step_name, command_list, output_filename, path_field, preprocessing=None, runner=None, compact=False):
+    task = get_object_or_404(AnalysisTask.objects.only('id', 'profile'), pk=task_id)
     repo_dir = get_repo_path(task_id)
     output_filepath = repo_dir / output_filename # 결과 파일 경로
     
-    # 상태 업데이트: RUNNING으로 설정하고 현재 단계 지정
-    task.status = 'RUNNING'
-    task.current_step = step_name.upper()
-    task.error_message = None
-    task.save(update_fields=['status', 'current_step', 'error_message'])
+    # 상태 업데이트: 이 단계의 step row 만 RUNNING 으로 설정
+    _start_step(task_id, step_name.upper())
+    run = step_runs.start(task_id, step_name.upper())
+    # 입력 크기: 분석 대상 repo (clone 된 소스 트리)
+    input_bytes = step_runs.path_size(repo_dir)
+    outputs = [output_filename] + ([preprocessing.output] if preprocessing is not None else [])
+    exit_code = None
     
     is_othertool = step_name.upper() == 'CPPLINT' or step_name.upper() == 'LIZARD'
 
@@ -58,49 +158,98 @@ def _execute_analysis(task_id, step_name, command_list, output_filename, path_fi
             v_check = True
             v_stderr = subprocess.PIPE
 
-        # -- 실제 분석 명령어 실행 --
-        # stdout을 파일로 리다이렉션하여 원시 데이터 저장
-        with open(output_filepath, 'w') as f:
-             subprocess.run(
-                command_list, 
-                cwd=str(repo_dir),
-                check=v_check, 
-                stdout=f, # 결과를 파일로 출력
-                stderr=v_stderr, # 에러는 파이프로 받음
-                text=True
-             )
+        if runner is not None:
+            # runner 가 분석부터 record 생성까지 직접 하는 경우 (incremental, stdout 스트리밍 등): 결과 JSON 만 저장
+            Pipeline(repo_dir).write(output_filename, runner(repo_dir), compact=compact)
+        else:
+            # -- 실제 분석 명령어 실행 --
+            # stdout을 파일로 리다이렉션하여 원시 데이터 저장
+            with open(output_filepath, 'w') as f:
+                 completed = step_runs.run(
+                    command_list, 
+                    cwd=str(repo_dir),
+                    check=v_check, 
+                    stdout=f, # 결과를 파일로 출력
+                    stderr=v_stderr, # 에러는 파이프로 받음
+                    text=True
+                 )
+            exit_code = completed.returncode
         
-        # 파일 경로 저장 및 상태 업데이트
-        setattr(task, path_field, output_filename)
+        # 파일 경로 저장 (동시에 도는 다른 단계의 필드를 덮어쓰지 않도록 이 필드만 update)
+        AnalysisTask.objects.filter(pk=task_id).update(**{path_field: output_filename})
 
+        # 전처리 stage 는 별도 python3 프로세스 없이 worker 안에서 바로 실행
         if preprocessing is not None:
-            script_path = Path(settings.BASE_DIR) / "core" / "script" / preprocessing
-            preprocess_cmd = [
-                'python3',
-                str(script_path),
-            ]
-            subprocess.run(
-                preprocess_cmd,
-                cwd=str(repo_dir),
-                check=True,
-                text=True
-            )
+            Pipeline(repo_dir, profile_dir=_profile_dir(task, repo_dir)).run([preprocessing])
 
         
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        task.status = 'FAILED'
+    except Exception as e:
+        # 어떤 예외든 step 을 FAILED 로 끝내야 chord callback (전처리) 이 실행되고 Task 가 RUNNING 에 남지 않는다
         if isinstance(e, subprocess.CalledProcessError):
             err_detail = e.stderr or ''
-            task.error_message = f"{step_name} Failed: {str(e)}\n{err_detail}"
+            error_message = f"{step_name} Failed: {str(e)}\n{err_detail}"
+            exit_code = e.returncode
+        elif isinstance(e, (FileNotFoundError, StageError)):
+            error_message = f"{step_name} Failed: {str(e)}"
         else:
-            task.error_message = f"{step_name} Failed: {str(e)}"
-        task.save()
+            error_message = f"{step_name} Failed: {type(e).__name__}: {e}"
+        run.finish('FAILED', input_bytes, step_runs.files_size(repo_dir, outputs), exit_code)
+        _finish_step(task_id, step_name.upper(), 'FAILED', error_message)
         return 'FAILED'
     
-    task.status = 'COMPLETED'
-    task.save()
+    run.finish('COMPLETED', input_bytes, step_runs.files_size(repo_dir, outputs), exit_code)
+    _finish_step(task_id, step_name.upper(), 'COMPLETED')
     return 'SUCCESS'
 
+# 결과 캐시 조회 헬퍼 함수 (start_cloning_task 에서 clone 전에 호출)
+def complete_from_cache(task: AnalysisTask) -> bool:
+    """
+    github_url 의 원격 HEAD commit 결과가 캐시에 있으면 /data/analysis_<id> 에 복사하고
+    Task 를 바로 COMPLETED 로 만든다. 캐시 miss 면 False.
+    git ls-remote / 파일 복사가 오래 걸릴 수 있으므로 web 요청이 아니라 worker 에서 실행한다.
+    """
+    commit_sha = result_cache.resolve_commit_sha(task.github_url)
+    if commit_sha is None:
+        return False
+
+    repo_dir = get_repo_path(task.id)
+    if not result_cache.restore_results(task.github_url, commit_sha, repo_dir):
+        return False
+    # 캐시로 완료한 Task 도 DB 조회 (Function / WarningRecord / CallEdge) 가 되도록 적재
+    try:
+        results = {}
+        for name in ("functions.json", "warnings.json", "cg_filtered.json"):
+            with open(repo_dir / name, "r", encoding="utf-8") as f:
+                results[name] = json.load(f)
+        result_counts = result_store.ingest_results(
+            task.id, results["functions.json"], results["warnings.json"], results["cg_filtered.json"],
+        )
+    except (OSError, ValueError, DatabaseError) as e:
+        logger.warning("result cache ingest failed for task %s, running the pipeline instead: %s", task.id, e)
+        return False
+    precompress_results(repo_dir)
+
+    AnalysisTask.objects.filter(pk=task.id).update(commit_sha=commit_sha, result_data=result_counts)
+    # start_full_pipeline 이 PENDING 으로 만들어 둔, 이제 실행하지 않을 단계 row 는 지운다
+    AnalysisStep.objects.filter(task_id=task.id, status='PENDING').exclude(step='PREPROCESSING').delete()
+    now = timezone.now()
+    AnalysisStep.objects.update_or_create(
+        task_id=task.id,
+        step='PREPROCESSING',
+        defaults={'status': 'COMPLETED', 'error_message': None, 'started_at': now, 'finished_at': now},
+    )
+    _sync_task_status(task.id)
+    return True
+
+
+def _cacheable(task_id) -> bool:
+    """
+    전처리 앞의 파이프라인 단계가 모두 COMPLETED 인지.
+    실패한 tool 은 빈 결과 ([]) 를 남기므로, 하나라도 실패했거나 실행되지 않았으면 결과 캐시에 저장하지 않는다.
+    """
+    statuses = dict(AnalysisStep.objects.filter(task_id=task_id).values_list('step', 'status'))
+    return all(statuses.get(step) == 'COMPLETED' for step in PIPELINE_STEPS if step != 'PREPROCESSING')
+
 # 결과 json 파일 1개 읽는 헬퍼 함수
 def load_task_json(task_id: int, filename: str):
     """
@@ -108,7 +257,7 @@ def load_task_json(task_id: int, filename: str):
     파싱된 JSON 객체를 반환합니다.
     """
     # Task 존재 여부만 확인 (status 필터 X)
-    get_object_or_404(AnalysisTask, pk=task_id)
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
 
     repo_dir = get_repo_path(task_id)
     file_path = repo_dir / filename
@@ -121,81 +270,134 @@ def load_task_json(task_id: int, filename: str):
 
     return data
 
-# 결과 josn 파일을 zip 하는 헬퍼 함수
-def build_task_zip(task_id: int, filenames=None) -> bytes:
+# 결과 파일 1개의 경로를 찾는 헬퍼 함수 (파일을 그대로 내려줄 때)
+def get_task_file_path(task_id: int, filename: str) -> Path:
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
+
+    file_path = get_repo_path(task_id) / filename
+    if not file_path.is_file():
+        raise FileNotFoundError(f"{filename} not found for task {task_id}")
+
+    return file_path
+
+# 결과 조회용 SQLite index 경로를 찾는 헬퍼 함수 (없으면 JSON 에서 만든다)
+def get_task_result_index(task_id: int) -> Path:
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
+    return result_query.ensure_index(get_repo_path(task_id))
+
+def get_task_cg_index(task_id: int) -> Path:
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
+    return cg_neighborhood.ensure_index(get_repo_path(task_id))
+
+def get_task_cg_lod(task_id: int) -> Path:
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
+    return lod_query.ensure_lod(get_repo_path(task_id))
+
+def get_task_profile(task_id: int):
+    """profile 을 켠 Task 의 stage profile 파일들 [(이름, 경로), ...]. 없으면 FileNotFoundError."""
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
+    profile_dir = get_repo_path(task_id) / PROFILE_DIRNAME
+    members = []
+    if profile_dir.is_dir():
+        members = sorted((path.name, path) for path in profile_dir.iterdir() if path.is_file())
+    if not members:
+        raise FileNotFoundError(f"No profile found for task {task_id}")
+    return members
+
+def precompress_results(repo_dir: Path):
+    """API 로 내려주는 결과 파일들의 gzip / brotli 압축본을 미리 만들어 둔다."""
+    for filename in result_cache.RESULT_FILES:
+        path = repo_dir / filename
+        if path.is_file():
+            file_response.precompress(path)
+
+# 결과 json 파일을 zip 으로 내려주기 위한 헬퍼 함수
+ZIP_ARCHIVE_NAME = "results.zip"
+
+def get_task_zip(task_id: int, filenames=None):
     """
-    COMPLETED 상태의 Task에 대해 /tmp/analysis_<task_id> 안의
-    주어진 filenames들을 하나의 ZIP 바이트로 만들어 반환합니다.
+    /tmp/analysis_<task_id> 안의 filenames 중 존재하는 파일들을 ZIP 으로 내려주기 위한 정보를 반환합니다.
+      (cached, members, cache_path)
+      - cached: 이미 만들어 둔 최신 ZIP 경로 (없으면 None)
+      - members: ZIP 에 넣을 (이름, 경로) 목록
+      - cache_path: 새로 만들 ZIP 을 남길 경로 (COMPLETED Task 만, 아니면 None)
     """
-    # Task 존재 여부만 확인
-    get_object_or_404(AnalysisTask, pk=task_id)
+    task = get_object_or_404(AnalysisTask.objects.only('id', 'status'), pk=task_id)
 
     repo_dir = get_repo_path(task_id)
 
     if filenames is None:
         filenames = ["cg_filtered.json", "warnings.json", "functions.json"]
 
-    memory_file = io.BytesIO()
-    added_any = False
+    members = [(filename, repo_dir / filename) for filename in filenames if (repo_dir / filename).is_file()]
+    if not members:
+        raise FileNotFoundError(f"No result files found for task {task_id}")
 
-    with zipfile.ZipFile(memory_file, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for filename in filenames:
-            file_path = repo_dir / filename
-            if file_path.is_file():
-                zf.write(file_path, arcname=filename)
-                added_any = True
+    archive = repo_dir / ZIP_ARCHIVE_NAME
+    if zip_stream.is_fresh(archive, members):
+        return archive, members, None
 
-    if not added_any:
-        raise FileNotFoundError(f"No result files found for task {task_id}")
-    
-    memory_file.seek(0)
-    return memory_file.getvalue()
+    cache_path = archive if task.status == 'COMPLETED' else None
+    return None, members, cache_path
 
 
 # --- Step 0: Git Clone Task ---
 @shared_task
 def start_cloning_task(task_id, github_url):
-    task = get_object_or_404(AnalysisTask, pk=task_id)
+    task = get_object_or_404(AnalysisTask.objects.only('id', 'github_url', 'profile'), pk=task_id)
+
+    # 같은 repo@commit 결과가 캐시에 있으면 clone / 분석 없이 완료 (profile 은 실제로 실행해야 하므로 제외)
+    # 이후 단계 (run_analyzers_task) 는 'CACHED' 를 받으면 아무것도 하지 않는다
+    if not task.profile and complete_from_cache(task):
+        return 'CACHED'
+
     repo_dir = get_repo_path(task_id)
-    task.status = 'RUNNING'
-    task.current_step = 'CLONING'
-    task.save(update_fields=['status', 'current_step'])
+    _start_step(task_id, 'CLONING')
+    run = step_runs.start(task_id, 'CLONING')
 
-    success = False
+    status = 'FAILED'
+    error_message = None
+    exit_code = None
     try:
         if repo_dir.exists():
             shutil.rmtree(repo_dir)
 
-        subprocess.run(
+        completed = step_runs.run(
             ['git', 'clone', '--depth', '1', github_url, str(repo_dir)], 
             check=True, 
             capture_output=True, 
             text=True
         )
-        success = True
-        task.status = 'COMPLETED'
+        exit_code = completed.returncode
+        # 결과 캐시 key 로 쓰기 위해 실제로 clone 된 commit 을 기록
+        commit_sha = result_cache.read_commit_sha(repo_dir)
+        AnalysisTask.objects.filter(pk=task_id).update(commit_sha=commit_sha)
+        status = 'COMPLETED'
 
     except subprocess.CalledProcessError as e:
-        task.status = 'FAILED'
-        task.error_message = f"Git Clone Failed: {e.stderr}"
-    
-    if not success:
-        task.status = 'FAILED'
+        error_message = f"Git Clone Failed: {e.stderr}"
+        exit_code = e.returncode
+    except Exception as e:
+        # rmtree / commit 조회 실패 등: step 을 FAILED 로 끝내 Task 가 RUNNING 에 남지 않게 한다
+        error_message = f"Git Clone Failed: {type(e).__name__}: {e}"
     
-    task.save()
-    return task.status
+    # 출력 크기: clone 된 repo (.git 포함)
+    run.finish(status, output_bytes=step_runs.path_size(repo_dir), exit_code=exit_code)
+    _finish_step(task_id, 'CLONING', status, error_message)
+    return status
 
 # --- Step 1: Clang Build/Call Graph Task ---
 @shared_task
 def run_clang_build_task(task_id):
-    # Clang/CG 결과를 'cg.json.txt' 파일로 저장 (JSON 형태의 TXT)
+    # clang_cg.sh 의 stdout(call graph)을 나오는 대로 파싱해 cg.json 으로 저장 (cg.txt 는 거치지 않음)
     return _execute_analysis(
         task_id, 
         'CLANG', 
-        [CLANG_CG_SCRIPT],
-        'cg.txt', 
+        None,
+        'cg.json', 
         'clang_path',
-        'cg_preprocessing.py'
+        runner=lambda repo_dir: stream_runner.stream_callgraph(repo_dir, [CLANG_CG_SCRIPT]),
+        compact=True,
     )
     
 # --- Step 2: Infer Task ---
@@ -210,7 +412,7 @@ def run_infer_task(task_id):
         ['infer', 'run', '--', 'make'], # make 실행은 repo_dir 내부에서 
         'infer_result.txt', 
         'infer_path',
-        'infer_preprocessing.py'
+        INFER_PREPROCESSING
     )
 
 # --- Step 3: Cpplint Task ---
@@ -219,82 +421,127 @@ def run_cpplint_task(task_id):
     repo_dir = get_repo_path(task_id)
     ensure_empty_json(repo_dir, 'cpplint_result.json')
 
+    # 바뀐 파일(blob)만 cpplint 로 검사하고 나머지는 캐시된 결과를 합친다
+    if settings.ANALYSIS_INCREMENTAL:
+        return _execute_analysis(
+            task_id,
+            'CPPLINT',
+            None,
+            'cpplint_result.json',
+            'cpplint_path',
+            runner=incremental.run_cpplint_incremental,
+        )
+
+    # 전체 검사: C/C++ 소스를 shard 로 나눠 여러 cpplint 프로세스로 병렬 검사
     return _execute_analysis(
         task_id, 
         'CPPLINT', 
-        ['cpplint', '--recursive', str(repo_dir)], 
-        'cpplint_result.txt', 
+        None, 
+        'cpplint_result.json', 
         'cpplint_path',
-        'cpplint_preprocessing.py'
+        runner=cpplint_runner.run_cpplint_sharded,
     )
 
 # --- Step 4: Lizard Task ---
 @shared_task
 def run_lizard_task(task_id):
+    if settings.ANALYSIS_INCREMENTAL:
+        return _execute_analysis(
+            task_id,
+            'LIZARD',
+            None,
+            'lizard_result.json',
+            'lizard_path',
+            runner=incremental.run_lizard_incremental,
+        )
+
+    # lizard --csv 출력을 나오는 대로 파싱해 lizard_result.json 으로 저장
     return _execute_analysis(
         task_id, 
         'LIZARD', 
-        ['lizard', '-o', 'lizard_result.csv'],
-        'lizard_result.txt', 
+        None,
+        'lizard_result.json', 
         'lizard_path',
-        'lizard_preprocessing.py'
+        runner=stream_runner.stream_lizard,
     )
 
 
 # --- Step 5: Preprocessing Task ---
-def run_script(script_name, repo_dir):
-    base_dir = Path(settings.BASE_DIR)
-
-    script_path = base_dir / "core" / "script" / script_name
-    if not script_path.is_file():
-        raise FileNotFoundError(f"Preprocessing script not found: {script_path}")
-
-    subprocess.run(
-        ["python3", str(script_path)],
-        cwd=str(repo_dir),
-        check=True,
-        text=True,
-    )
-
-
 @shared_task
 def run_preprocessing_task(task_id):
-    task = get_object_or_404(AnalysisTask, pk=task_id)
+    task = get_object_or_404(AnalysisTask.objects.only('id', 'github_url', 'profile'), pk=task_id)
     repo_dir = get_repo_path(task_id)
 
-    task.status = 'RUNNING'
-    task.current_step = 'PREPROCESSING'
-    task.error_message = None
-    task.save(update_fields=['status', 'current_step', 'error_message'])
+    _start_step(task_id, 'PREPROCESSING')
+    run = step_runs.start(task_id, 'PREPROCESSING')
+    inputs, outputs = stage_files(PREPROCESSING_STAGES)
+    input_bytes = step_runs.files_size(repo_dir, inputs)
     
     errors: list[str] = []
 
-    def safe_run(script_name: str, step_label: str):
-        try:
-            run_script(script_name, repo_dir)
-        except Exception as e:
-            errors.append(f"{step_label}: {e}")
+    # cg_filter -> cpplint_add_function -> merge_warnings -> lizard_filter
+    # 중간 결과는 메모리로 넘기고 cg_filtered / warnings / functions.json 만 파일로 남긴다.
+    # 실패한 stage 가 있어도 나머지 stage 는 계속 실행한다.
+    # layout 좌표는 같은 graph 면 다시 계산하지 않도록 graph hash 별로 캐시
+    options = {
+        "layout_cache_dir": Path(settings.ANALYSIS_CACHE_DIR) / "layouts",
+        "layout_max_nodes": settings.ANALYSIS_LAYOUT_MAX_NODES,
+        "layout_cache_max_bytes": settings.ANALYSIS_LAYOUT_CACHE_MAX_BYTES,
+    }
+    def on_stage(index, total, stage, elapsed, ok):
+        events.publish(task_id, 'progress', {
+            "step": 'PREPROCESSING', "stage": stage.name, "index": index, "total": total,
+            "elapsed": round(elapsed, 3), "ok": ok,
+        })
 
-    # 1) Filtering Function
-    safe_run("cg_filter.py", "[1/4] cg_filter")
+    try:
+        artifacts = Pipeline(repo_dir, options=options, profile_dir=_profile_dir(task, repo_dir)).run(PREPROCESSING_STAGES, errors=errors, on_stage=on_stage)
+    except Exception as e:
+        # stage 밖의 실패 (profile 디렉토리 생성 등) 도 FAILED run / step 으로 남긴다
+        errors.append(f"pipeline: {type(e).__name__}: {e}")
 
-    # 2) Add Function Data and Merge Warnings
-    safe_run("cpplint_add_function.py", "[2/4] cpplint_add_function")
-    safe_run("merge_warnings.py", "[3/4] merge_warnings")
+    # repo 디렉토리가 지워져도 조회할 수 있도록 결과를 DB 에 적재 (한 transaction)
+    result_counts = {}
+    if not errors:
+        try:
+            result_counts = result_store.ingest_results(
+                task_id,
+                artifacts["functions.json"],
+                artifacts["warnings.json"],
+                artifacts["cg_filtered.json"],
+            )
+        except DatabaseError as e:
+            errors.append(f"result ingestion: {e}")
 
-    # 3) Add Warning Data and Filtering
-    safe_run("lizard_filter.py", "[4/4] lizard_filter")
+    if not errors:
+        try:
+            task.result_data = result_counts
+            task.save(update_fields=['result_data'])
+            # 결과 API 가 요청마다 압축하지 않도록 압축본을 한 번만 만들어 둔다
+            precompress_results(repo_dir)
+        except Exception as e:
+            errors.append(f"finalize: {type(e).__name__}: {e}")
 
     # 4) Check error
     if errors:
-        task.status = 'FAILED'
-        task.error_message = "Preprocessing encountered errors:\n" + "\n".join(errors)
+        run.finish('FAILED', input_bytes, step_runs.files_size(repo_dir, outputs))
+        _finish_step(
+            task_id, 'PREPROCESSING', 'FAILED',
+            "Preprocessing encountered errors:\n" + "\n".join(errors),
+        )
     else:
-        final_json_data = {}
-        task.result_data = final_json_data
-        task.status = 'COMPLETED'
+        # 같은 repo@commit 재요청 시 바로 완료할 수 있도록 결과 캐시에 저장 (실패해도 Task 는 성공)
+        # 분석 tool 이 하나라도 실패한 결과는 불완전하므로 저장하지 않는다
+        try:
+            task.refresh_from_db(fields=['commit_sha'])
+            if task.commit_sha and _cacheable(task_id):
+                result_cache.store_results(task.github_url, task.commit_sha, repo_dir)
+                result_cache.evict()
+        except (OSError, DatabaseError):
+            logger.exception("result cache store failed for task %s", task_id)
 
-    task.save()
+        run.finish('COMPLETED', input_bytes, step_runs.files_size(repo_dir, outputs))
+        _finish_step(task_id, 'PREPROCESSING', 'COMPLETED')
 
 @shared_task
 def run_cleanup_task(task_id):
@@ -304,26 +551,66 @@ def run_cleanup_task(task_id):
     - Task의 status는 기본적으로 건드리지 않고,
       실패했을 때만 FAILED + error_message를 남긴다.
     """
-    task = get_object_or_404(AnalysisTask, pk=task_id)
+    get_object_or_404(AnalysisTask.objects.only('id'), pk=task_id)
     repo_dir = get_repo_path(task_id)
 
-    task.status = 'RUNNING'
-    task.current_step = 'CLEANUP'
-    task.error_message = None
-    task.save(update_fields=['status', 'current_step', 'error_message'])
+    _start_step(task_id, 'CLEANUP')
 
+    status = 'FAILED'
+    error_message = None
     try:
         if repo_dir.exists():
             shutil.rmtree(repo_dir)
-        task.status = 'COMPLETED'
+        status = 'COMPLETED'
 
     except Exception as e:
-        task.status = 'FAILED'
-        msg = f"Cleanup Failed for analysis_{task_id}: {e}"
-        if task.error_message:
-            task.error_message += f"\n{msg}"
-        else:
-            task.error_message = msg
+        error_message = f"Cleanup Failed for analysis_{task_id}: {e}"
     finally:
-        task.save()
-        return {"task_id": task_id, "status": task.status}
\ No newline at end of file
+        _finish_step(task_id, 'CLEANUP', status, error_message)
+        return {"task_id": task_id, "status": status}
+
+
+# --- 전체 파이프라인 (clone -> {clang, infer, cpplint, lizard} -> preprocess) ---
+ANALYZER_TASKS = {
+    'CLANG': run_clang_build_task,
+    'INFER': run_infer_task,
+    'CPPLINT': run_cpplint_task,
+    'LIZARD': run_lizard_task,
+}
+
+PIPELINE_STEPS = ['CLONING', *ANALYZER_TASKS, 'PREPROCESSING']
+
+# clang_cg.sh (cmake build) 와 infer (make) 는 같은 checkout 에서 빌드하므로 동시에 돌리지 않고 차례로 실행한다
+SERIAL_BUILD_STEPS = ('CLANG', 'INFER')
+
+
+@shared_task(bind=True)
+def run_analyzers_task(self, clone_status, task_id):
+    """
+    clone 결과를 받아, 성공했으면 서로 독립적인 분석 tool 들을 group 으로 동시에 실행하고
+    모두 끝나면 chord callback 으로 run_preprocessing_task 를 실행한다.
+    빌드가 필요한 clang / infer 는 group 안에서 하나의 chain 으로 차례로 실행한다.
+    """
+    # 결과 캐시로 완료된 경우 ('CACHED') 남은 step 은 complete_from_cache 가 이미 정리했다
+    if clone_status == 'CACHED':
+        return clone_status
+    # clone 이 실패하면 실행하지 못한 단계들을 FAILED 로 끝내 Task 가 대기 중으로 남지 않게 한다
+    # (SSE / 상태 API 는 PENDING step 이 있으면 아직 끝나지 않은 것으로 본다)
+    if clone_status != 'COMPLETED':
+        _fail_pending_steps(task_id)
+        return clone_status
+
+    lanes = [chain(*(ANALYZER_TASKS[step].si(task_id) for step in SERIAL_BUILD_STEPS))]
+    lanes += [t.si(task_id) for step, t in ANALYZER_TASKS.items() if step not in SERIAL_BUILD_STEPS]
+    workflow = chord(group(lanes), run_preprocessing_task.si(task_id))
+    return self.replace(workflow)
+
+
+def start_full_pipeline(task_id, github_url):
+    """전체 파이프라인을 하나의 Celery workflow 로 등록한다."""
+    init_steps(task_id, PIPELINE_STEPS)
+    workflow = chain(
+        start_cloning_task.si(task_id, github_url),
+        run_analyzers_task.s(task_id),
+    )
+    return workflow.apply_async()
@@ -1,3 +1,592 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+try:
+    import fakeredis
+except ImportError:  # 개발용 패키지. 없으면 Redis 캐시 테스트만 건너뛴다
+    fakeredis = None
+
+from . import events, file_response, incremental, result_cache, status_cache
+from .cg_neighborhood import neighborhood
+from .lod_query import LodIndex
+from .models import AnalysisStep, AnalysisTask, CallEdge, Function
+from .result_query import QueryError, query
+from .result_store import filter_text, ingest_results
+from .script.callgraph import CallGraph
+from .script.cg_index import build_adjacency_index
+from .script.cg_analytics import annotate_cg, approximate_betweenness, pagerank
+from .script.cg_filter import filter_cg
+from .script.cg_lod import build_lod
+from .script.cg_preprocessing import build_cg_from_lines
+from .script.columnar import decode_tables, encode_cg, encode_functions
+from .script.pipeline import Pipeline, Stage, StageError
+from .script.result_index import build_result_index
+from .events import is_finished, task_snapshot
+from .tasks import PIPELINE_STEPS, _sync_task_status, init_steps, run_analyzers_task
+from .zip_stream import stream_zip
+
+
+class TempDirMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+
+def _fail(*args):
+    raise ValueError("boom")
+
+
+class PipelineTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        (self.tmp / "in.json").write_text(json.dumps([1, 2, 3]))
+        self.stages = [
+            Stage("double", lambda xs: [x * 2 for x in xs], ("in.json",), "double.json"),
+            Stage("broken", _fail, ("double.json",), "broken.json"),
+            Stage("total", sum, ("double.json",), "total.json", persist=False),
+        ]
+
+    def test_collects_errors_and_runs_remaining_stages(self):
+        errors = []
+        calls = []
+        artifacts = Pipeline(self.tmp).run(
+            self.stages, errors=errors, on_stage=lambda i, total, stage, elapsed, ok: calls.append((stage.name, ok)),
+        )
+
+        self.assertEqual(errors, ["[2/3] broken: boom"])
+        self.assertEqual(calls, [("double", True), ("broken", False), ("total", True)])
+        self.assertEqual(artifacts["total.json"], 12)
+        self.assertEqual(json.loads((self.tmp / "double.json").read_text()), [2, 4, 6])
+        self.assertFalse((self.tmp / "broken.json").exists())
+        # persist=False 인 산출물은 파일로 남기지 않는다
+        self.assertFalse((self.tmp / "total.json").exists())
+
+    def test_raises_stage_error_without_error_list(self):
+        with self.assertRaises(StageError) as ctx:
+            Pipeline(self.tmp).run(self.stages)
+        self.assertEqual(ctx.exception.stage_name, "broken")
+        self.assertIsInstance(ctx.exception.cause, ValueError)
+        self.assertFalse((self.tmp / "total.json").exists())
+
+    def test_missing_input_fails_the_stage(self):
+        errors = []
+        Pipeline(self.tmp).run([Stage("load", len, ("nope.json",), "out.json")], errors=errors)
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("[1/1] load:"))
+
+
+class SyncTaskStatusTests(TestCase):
+    def setUp(self):
+        self.task = AnalysisTask.objects.create(github_url="https://github.com/o/r")
+        self.now = timezone.now()
+
+    def _step(self, step, status, finished_offset=None, error_message=None):
+        AnalysisStep.objects.create(
+            task=self.task,
+            step=step,
+            status=status,
+            started_at=self.now,
+            finished_at=self.now + timedelta(seconds=finished_offset) if finished_offset is not None else None,
+            error_message=error_message,
+        )
+
+    def _sync(self):
+        _sync_task_status(self.task.id)
+        self.task.refresh_from_db()
+
+    def test_running_step_wins_and_earliest_is_current(self):
+        self._step("CLONING", "COMPLETED", 1)
+        self._step("LIZARD", "RUNNING")
+        self._step("CLANG", "RUNNING")
+        self._step("CPPLINT", "FAILED", 2, "cpplint broke")
+        self._sync()
+        self.assertEqual((self.task.status, self.task.current_step), ("RUNNING", "CLANG"))
+        self.assertEqual(self.task.error_message, "cpplint broke")
+
+    def test_failed_step_keeps_task_failed_after_later_success(self):
+        self._step("CLONING", "COMPLETED", 1)
+        self._step("LIZARD", "FAILED", 2, "lizard broke")
+        self._step("INFER", "FAILED", 3, "infer broke")
+        self._step("PREPROCESSING", "COMPLETED", 4)
+        self._sync()
+        self.assertEqual((self.task.status, self.task.current_step), ("FAILED", "INFER"))
+        self.assertEqual(self.task.error_message, "infer broke\nlizard broke")
+
+    def test_all_completed_reports_latest_step(self):
+        self._step("CLONING", "COMPLETED", 1)
+        self._step("CLANG", "COMPLETED", 3)
+        self._step("CPPLINT", "COMPLETED", 2)
+        self._step("PREPROCESSING", "PENDING")
+        self._sync()
+        self.assertEqual((self.task.status, self.task.current_step), ("COMPLETED", "CLANG"))
+        self.assertIsNone(self.task.error_message)
+
+    def test_clone_failure_finishes_remaining_steps(self):
+        init_steps(self.task.id, PIPELINE_STEPS)
+        AnalysisStep.objects.filter(task=self.task, step="CLONING").update(
+            status="FAILED", finished_at=self.now, error_message="Git Clone Failed: not found"
+        )
+        self.assertEqual(run_analyzers_task("FAILED", self.task.id), "FAILED")
+
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.status, self.task.current_step), ("FAILED", "CLONING"))
+        self.assertEqual(self.task.error_message, "Git Clone Failed: not found")
+        self.assertFalse(self.task.steps.filter(status="PENDING").exists())
+        self.assertTrue(is_finished(task_snapshot(self.task, self.task.steps.all())))
+
+
+class ResultQueryTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.warnings = [
+            {"id": f"w{i}", "file": f"src/f{i % 3}.c", "function": f"fn{i % 4}", "line": None if i % 5 == 0 else i,
+             "column": 1, "tool": "infer" if i % 2 else "cpplint", "severity_level": "HIGH" if i % 3 == 0 else "LOW",
+             "warning": "w", "detail": "d"}
+            for i in range(23)
+        ]
+        self.functions = [
+            {"file": "src/f0.c", "function": f"fn{i}", "CCN": i % 7 or None, "start_line": i,
+             "warning": {"HIGH": i % 2, "MID": 0, "LOW": 1}}
+            for i in range(11)
+        ]
+        build_result_index(self.warnings, self.functions, self.tmp)
+        self.db = self.tmp / "results.sqlite3"
+
+    def _all_pages(self, table, **params):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page = query(self.db, table, {**params, **({"cursor": cursor} if cursor else {})})
+            rows.extend(page["results"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return rows, pages
+
+    def test_filters(self):
+        rows, _ = self._all_pages("warnings", tool="infer", line_min="10", fields="id,line,tool")
+        expected = [w for w in self.warnings if w["tool"] == "infer" and w["line"] is not None and w["line"] >= 10]
+        self.assertEqual(sorted(r["id"] for r in rows), sorted(w["id"] for w in expected))
+        self.assertEqual(set(rows[0]), {"id", "line", "tool"})
+
+    def test_pagination_matches_full_sort_with_nulls_last(self):
+        rows, pages = self._all_pages("warnings", sort="line", limit="4", fields="id,line")
+        non_null = sorted((w for w in self.warnings if w["line"] is not None), key=lambda w: w["line"])
+        nulls = [w for w in self.warnings if w["line"] is None]
+        self.assertEqual([r["id"] for r in rows], [w["id"] for w in non_null + nulls])
+        self.assertEqual(pages, 6)
+
+    def test_descending_puts_nulls_first(self):
+        rows, _ = self._all_pages("functions", sort="-CCN", limit="3", fields="function,CCN")
+        values = [r["CCN"] for r in rows]
+        self.assertEqual(values[:2], [None, None])
+        self.assertEqual(values[2:], sorted(values[2:], reverse=True))
+        self.assertEqual(len(rows), len(self.functions))
+
+    def test_nested_warning_counts(self):
+        page = query(self.db, "functions", {"function": "fn3", "fields": "function,warning"})
+        self.assertEqual(page["results"], [{"function": "fn3", "warning": {"HIGH": 1, "MID": 0, "LOW": 1}}])
+
+    def test_invalid_parameters(self):
+        for params in ({"sort": "detail"}, {"limit": "0"}, {"fields": "nope"}, {"cursor": "%%%"}, {"line_min": "x"}):
+            with self.subTest(params=params), self.assertRaises(QueryError):
+                query(self.db, "warnings", params)
+
+
+class ResultStoreTests(TestCase):
+    def test_filter_text_matches_long_names(self):
+        task = AnalysisTask.objects.create(github_url="https://github.com/example/repo")
+        long_name = "std::function<" + "x" * 5000 + ">"
+        ingest_results(
+            task.id,
+            [{"file": "a.cc", "function": long_name}, {"file": "b.cc", "function": "main"}],
+            [],
+            {"edges": [{"source": "main", "target": long_name}, {"source": "main", "target": "g"}]},
+        )
+
+        edges = filter_text(CallEdge.objects.filter(task_id=task.id), target=long_name)
+        self.assertEqual(list(edges.values_list("source", flat=True)), ["main"])
+        self.assertEqual(list(filter_text(Function.objects.all(), function="main").values_list("file", flat=True)), ["b.cc"])
+        self.assertFalse(filter_text(Function.objects.all(), function="nope").exists())
+
+
+class CgAnalyticsTests(SimpleTestCase):
+    # a -> b -> c -> a 재귀 cycle 에서 c -> d -> e 로 빠져나가는 graph
+    NAMES = ["a", "b", "c", "d", "e"]
+    EDGES = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "e")]
+
+    def setUp(self):
+        self.cg = {
+            "nodes": [{"id": n, "name": n} for n in self.NAMES],
+            "edges": [{"source": s, "target": t} for s, t in self.EDGES],
+        }
+        self.graph = CallGraph.from_json(self.cg)
+
+    def test_scc_and_call_depth(self):
+        nodes = {n["id"]: n for n in annotate_cg(self.cg)["nodes"]}
+        self.assertEqual(len({nodes[n]["scc"] for n in "abc"}), 1)
+        self.assertEqual(len({nodes[n]["scc"] for n in "ade"}), 3)
+        self.assertEqual([nodes[n]["scc_size"] for n in self.NAMES], [3, 3, 3, 1, 1])
+        self.assertEqual([nodes[n]["recursive"] for n in self.NAMES], [True, True, True, False, False])
+        self.assertEqual([nodes[n]["call_depth"] for n in self.NAMES], [0, 0, 0, 1, 2])
+
+    def test_direct_self_call_is_recursive(self):
+        cg_txt = [
+            "Call graph node for function: 'main'<<0x1>>  #uses=0\n",
+            "  CS<0x2> calls function 'fact'\n",
+            "Call graph node for function: 'fact'<<0x3>>  #uses=2\n",
+            "  CS<0x4> calls function 'fact'\n",
+            "  CS<0x5> calls function 'printf'\n",
+        ]
+        cg = build_cg_from_lines(cg_txt)
+        self.assertNotIn({"source": "fact", "target": "fact"}, cg["edges"])
+
+        lizard = [{"function": name, "file": "a.c", "start_line": 1, "end_line": 2} for name in ("main", "fact")]
+        nodes = {n["id"]: n for n in annotate_cg(filter_cg(cg, lizard))["nodes"]}
+        self.assertEqual(nodes["fact"]["scc_size"], 1)
+        self.assertTrue(nodes["fact"]["recursive"])
+        self.assertFalse(nodes["main"]["recursive"])
+
+    def test_pagerank_matches_dense_solution(self):
+        n, d = len(self.NAMES), 0.85
+        index = {name: i for i, name in enumerate(self.NAMES)}
+        m = np.zeros((n, n))
+        for s, t in self.EDGES:
+            m[index[t], index[s]] = 1.0
+        out = m.sum(axis=0)
+        # callee 가 없는 node 는 모든 node 로 고르게 이어진 것으로 본다
+        m[:, out == 0] = 1.0
+        m /= m.sum(axis=0)
+        expected = np.linalg.solve(np.eye(n) - d * m, np.full(n, (1 - d) / n))
+
+        rank = pagerank(self.graph)
+        self.assertAlmostEqual(rank.sum(), 1.0)
+        np.testing.assert_allclose(rank, expected, atol=1e-8)
+
+    def test_exact_betweenness_when_sampling_every_node(self):
+        # 최단 경로가 모두 하나뿐이라 손으로 센 값: a 는 (c, b), b 는 (a, c|d|e),
+        # c 는 (a, d|e), (b, a|d|e), d 는 (a|b|c, e) 의 중간. (n - 1)(n - 2) = 12 로 정규화
+        bc = approximate_betweenness(self.graph, samples=len(self.NAMES))
+        np.testing.assert_allclose(bc, np.array([1, 3, 5, 3, 0]) / 12)
+
+
+class CgLodTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        placement = {"f1": "src/a.c", "f2": "src/a.c", "f3": "src/b.c", "f4": "lib/c.c"}
+        self.cg = {
+            "nodes": [{"id": f, "name": f, "file": path} for f, path in placement.items()],
+            "edges": [
+                {"source": s, "target": t}
+                for s, t in [("f1", "f2"), ("f1", "f3"), ("f3", "f4"), ("f2", "f4"), ("f4", "f4")]
+            ],
+        }
+        self.functions = [
+            {"file": "src/a.c", "function": "f1", "NLOC": 10, "CCN": 2, "warning": {"HIGH": 1, "MID": 0, "LOW": 2}},
+            {"file": "src/a.c", "function": "f2", "NLOC": 5, "CCN": 7, "warning": {"HIGH": 0, "MID": 1, "LOW": 0}},
+            {"file": "src/b.c", "function": "f3", "NLOC": 20, "CCN": 4, "warning": {"HIGH": 0, "MID": 0, "LOW": 1}},
+            {"file": "lib/c.c", "function": "f4", "NLOC": 1, "CCN": 1},
+        ]
+        self.lod = build_lod(self.cg, self.functions)
+
+    def test_directory_roll_up(self):
+        level = self.lod["levels"]["directory"]
+        nodes = {n["id"]: n for n in level["nodes"]}
+        src = nodes["dir:src"]
+        self.assertEqual(
+            (src["functions"], src["nloc"], src["ccn"], src["ccn_max"], src["internal_edges"]), (3, 35, 13, 7, 2),
+        )
+        self.assertEqual(src["warning"], {"HIGH": 1, "MID": 1, "LOW": 3})
+        self.assertEqual(nodes["dir:lib"]["internal_edges"], 1)
+        self.assertEqual(level["edges"], [{"source": "dir:src", "target": "dir:lib", "weight": 2}])
+
+    def test_file_roll_up(self):
+        level = self.lod["levels"]["file"]
+        nodes = {n["id"]: n for n in level["nodes"]}
+        self.assertEqual(nodes["file:src/a.c"]["parent"], "dir:src")
+        self.assertEqual((nodes["file:src/a.c"]["functions"], nodes["file:src/a.c"]["internal_edges"]), (2, 1))
+        self.assertEqual(
+            sorted((e["source"], e["target"], e["weight"]) for e in level["edges"]),
+            [("file:src/a.c", "file:lib/c.c", 1), ("file:src/a.c", "file:src/b.c", 1), ("file:src/b.c", "file:lib/c.c", 1)],
+        )
+
+    def test_function_level_and_expand(self):
+        path = self.tmp / "cg_lod.json"
+        path.write_text(json.dumps(self.lod))
+        lod = LodIndex(path)
+
+        functions = {n["id"]: n for n in lod.level("function")["nodes"]}
+        self.assertEqual(functions["f2"]["parent"], "file:src/a.c")
+        self.assertEqual((functions["f4"]["internal_edges"], functions["f2"]["ccn_max"]), (1, 7))
+
+        expanded = lod.expand("file:src/a.c")
+        self.assertEqual([n["id"] for n in expanded["nodes"]], ["f1", "f2"])
+        self.assertEqual(expanded["edges"], [{"source": "f1", "target": "f2", "weight": 1}])
+        self.assertEqual(
+            expanded["external_edges"],
+            [{"source": "f1", "target": "file:src/b.c", "weight": 1}, {"source": "f2", "target": "file:lib/c.c", "weight": 1}],
+        )
+
+
+class ZipStreamTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        (self.tmp / "a.bin").write_bytes(rng.bytes(3 << 20))
+        (self.tmp / "b.json").write_text(json.dumps({"k": list(range(1000))}))
+        self.members = [("a.bin", self.tmp / "a.bin"), ("nested/b.json", self.tmp / "b.json")]
+
+    @async_to_sync
+    async def _collect(self, cache_path=None):
+        return b"".join([chunk async for chunk in stream_zip(self.members, cache_path)])
+
+    def test_round_trip_and_cache(self):
+        cache = self.tmp / "out.zip"
+        data = self._collect(cache)
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.namelist(), ["a.bin", "nested/b.json"])
+            for arcname, path in self.members:
+                self.assertEqual(zf.read(arcname), path.read_bytes())
+        self.assertEqual(cache.read_bytes(), data)
+
+    @async_to_sync
+    async def _abort(self, cache_path):
+        stream = stream_zip(self.members, cache_path)
+        await stream.__anext__()
+        await stream.aclose()
+
+    def test_aborted_stream_leaves_no_cache_file(self):
+        self._abort(self.tmp / "out.zip")
+        self.assertEqual(sorted(p.name for p in self.tmp.iterdir()), ["a.bin", "b.json"])
+
+
+class ColumnarTests(SimpleTestCase):
+    def test_cg_round_trip(self):
+        cg = {
+            "nodes": [
+                {"id": "main", "name": "main", "file": "src/main.c", "start_line": 3, "end_line": 9,
+                 "in_degree": 0, "out_degree": 2, "degree": 2, "recursive": False, "pagerank": 0.25, "x": 0.5, "y": 1.0},
+                {"id": "헬퍼", "name": "헬퍼", "file": None, "start_line": None, "end_line": None,
+                 "in_degree": 1, "out_degree": 0, "degree": 1, "recursive": True, "pagerank": None},
+            ],
+            "edges": [{"source": "main", "target": "헬퍼"}, {"source": "main", "target": "printf"}],
+        }
+        tables = decode_tables(encode_cg(cg))
+
+        nodes = tables["nodes"]
+        self.assertEqual(nodes["name"], ["main", "헬퍼"])
+        self.assertEqual(nodes["file"], ["src/main.c", None])
+        self.assertEqual(nodes["start_line"], [3, None])
+        self.assertEqual(nodes["recursive"], [0, 1])
+        self.assertEqual(nodes["pagerank"], [0.25, None])
+        self.assertEqual((nodes["x"], nodes["y"]), ([0.5, None], [1.0, None]))
+        # node 목록에 없는 callee 로 가는 edge 는 빠지고, 나머지는 row 번호로 바뀐다
+        self.assertEqual((tables["edges"]["source"], tables["edges"]["target"]), ([0], [1]))
+
+    def test_functions_round_trip(self):
+        functions = [
+            {"file": "a.c", "function": "f", "NLOC": 10, "CCN": 3, "warning": {"HIGH": 2, "MID": 0, "LOW": 1}},
+            {"file": "a.c", "function": "g", "NLOC": None, "CCN": 1},
+        ]
+        table = decode_tables(encode_functions(functions))["functions"]
+        self.assertEqual(table["function"], ["f", "g"])
+        self.assertEqual(table["NLOC"], [10, None])
+        self.assertEqual((table["warning_high"], table["warning_low"]), ([2, 0], [1, 0]))
+
+
+class FileResponseTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.tmp / "warnings.json"
+        self.body = json.dumps([{"id": i, "warning": "x" * 50} for i in range(200)]).encode()
+        self.path.write_bytes(self.body)
+        file_response.precompress(self.path)
+        self.factory = RequestFactory()
+
+    def _get(self, **headers):
+        return file_response.serve_file(self.factory.get("/", headers=headers), self.path, "application/json")
+
+    @async_to_sync
+    async def _content(self, response):
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    def test_accept_encoding_selects_precompressed_variant(self):
+        preferred = "br" if file_response.brotli is not None else "gzip"
+        response = self._get(accept_encoding="gzip, br")
+        self.assertEqual(response["Content-Encoding"], preferred)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        gzipped = self._get(accept_encoding="gzip")
+        self.assertEqual(gzip.decompress(self._content(gzipped)), self.body)
+
+        identity = self._get(accept_encoding="gzip;q=0")
+        self.assertFalse(identity.has_header("Content-Encoding"))
+        self.assertEqual(self._content(identity), self.body)
+        # 인코딩마다 bytes 가 다르므로 ETag 도 다르다
+        self.assertNotEqual(gzipped["ETag"], identity["ETag"])
+
+    def test_if_none_match_returns_304(self):
+        etag = self._get(accept_encoding="gzip")["ETag"]
+        self.assertEqual(self._get(accept_encoding="gzip", if_none_match=etag).status_code, 304)
+        # 다른 인코딩의 ETag 로는 304 가 아니다
+        self.assertEqual(self._get(if_none_match=etag).status_code, 200)
+
+
+class IncrementalTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = self.tmp / "repo"
+        (self.repo / "src").mkdir(parents=True)
+        (self.repo / "src" / "a.c").write_text("int a(void) { return 0; }\n")
+        (self.repo / "b.c").write_text("int b(void) { return 1; }\n")
+        (self.repo / "src" / "CPPLINT.cfg").write_text("linelength=100\n")
+        self._git("init", "-q")
+        self._git("add", ".")
+
+        settings_override = override_settings(ANALYSIS_CACHE_DIR=str(self.tmp / "cache"))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        versions = mock.patch.object(result_cache, "probe_tool_versions", return_value={"cpplint": "test"})
+        versions.start()
+        self.addCleanup(versions.stop)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.repo, check=True)
+
+    def _lint(self):
+        analyzed = []
+
+        def lint_files(repo_dir, paths):
+            analyzed.extend(paths)
+            return {path: [{"file": path, "line": 1, "warning": "w"}] for path in paths}
+
+        with mock.patch.object(incremental, "lint_files", lint_files):
+            records = incremental.run_cpplint_incremental(self.repo)
+        return sorted(analyzed), records
+
+    def test_only_changed_blobs_and_configs_are_relinted(self):
+        analyzed, records = self._lint()
+        self.assertEqual(analyzed, ["b.c", "src/a.c"])
+        self.assertEqual([r["file"] for r in records], ["b.c", "src/a.c"])
+
+        analyzed, cached = self._lint()
+        self.assertEqual(analyzed, [])
+        self.assertEqual(cached, records)
+
+        # CPPLINT.cfg 가 바뀌면 그 디렉토리 아래 파일만 다시 검사
+        (self.repo / "src" / "CPPLINT.cfg").write_text("linelength=120\n")
+        self._git("add", ".")
+        self.assertEqual(self._lint()[0], ["src/a.c"])
+
+        (self.repo / "b.c").write_text("int b(void) { return 2; }\n")
+        self._git("add", ".")
+        self.assertEqual(self._lint()[0], ["b.c"])
+
+
+@override_settings(REDIS_URL="redis://127.0.0.1:1/0")  # 연결할 수 없는 Redis -> DB polling 으로 대신
+class TaskEventsTests(TestCase):
+    def setUp(self):
+        self.task = AnalysisTask.objects.create(github_url="https://github.com/o/r")
+        self.now = timezone.now()
+
+    def _snapshot(self, status, step_status):
+        return {"status": status, "steps": [{"step": "CLONING", "status": step_status}]}
+
+    @async_to_sync
+    async def _collect(self):
+        return [chunk async for chunk in events.stream_task_events(self.task.id)]
+
+    def test_stream_ends_immediately_for_finished_task(self):
+        AnalysisStep.objects.create(task=self.task, step="CLONING", status="COMPLETED", finished_at=self.now)
+        AnalysisTask.objects.filter(pk=self.task.id).update(status="COMPLETED")
+
+        chunks = self._collect()
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith("event: status\n"))
+        self.assertEqual(json.loads(chunks[0].split("data: ", 1)[1])["status"], "COMPLETED")
+
+    def test_polling_stream_ends_when_task_finishes(self):
+        snapshots = [
+            self._snapshot("RUNNING", "RUNNING"),
+            self._snapshot("RUNNING", "RUNNING"),
+            self._snapshot("FAILED", "FAILED"),
+        ]
+        with mock.patch.object(events, "POLL_INTERVAL", 0), \
+                mock.patch.object(events, "_load_snapshot", side_effect=snapshots):
+            chunks = self._collect()
+        self.assertEqual([c.split("\n", 1)[0] for c in chunks], ["event: status", ": keep-alive", "event: status"])
+
+
+@skipIf(fakeredis is None, "fakeredis is not installed")
+class StatusCacheTests(SimpleTestCase):
+    def setUp(self):
+        client = mock.patch.object(status_cache, "get_client", return_value=fakeredis.FakeRedis())
+        client.start()
+        self.addCleanup(client.stop)
+        self.now = timezone.now()
+
+    def _data(self, status):
+        return {
+            "id": 1, "github_url": "u", "commit_sha": None, "status": status, "current_step": "CLONING",
+            "created_at": None, "error_message": None, "steps": [{"step": "CLONING", "status": status}],
+        }
+
+    def test_write_read_and_stale_write_is_ignored(self):
+        self.assertIsNone(status_cache.read(1))
+        status_cache.write(1, self._data("COMPLETED"), self.now)
+        # 늦게 도착한 이전 상태는 새 상태를 덮어쓰지 않는다
+        status_cache.write(1, self._data("RUNNING"), self.now - timedelta(seconds=1))
+        self.assertEqual(status_cache.read(1), self._data("COMPLETED"))
+
+
+class CgNeighborhoodTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        # a -> b -> c -> d, a -> e, x -> a
+        edges = [("a", "b"), ("b", "c"), ("c", "d"), ("a", "e"), ("x", "a")]
+        cg = {
+            "nodes": [{"id": n, "name": n} for n in "abcdex"],
+            "edges": [{"source": s, "target": t} for s, t in edges],
+        }
+        self.path = self.tmp / "cg_adjacency.npz"
+        self.path.write_bytes(build_adjacency_index(cg))
+
+    def _query(self, **params):
+        return neighborhood(self.path, {"function": "a", **params})
+
+    def test_depth_and_direction(self):
+        result = self._query(depth="2", direction="callees")
+        self.assertEqual({n["id"]: n["depth"] for n in result["nodes"]}, {"a": 0, "b": 1, "c": 2, "e": 1})
+        self.assertFalse(result["truncated"])
+        self.assertEqual(
+            sorted((e["source"], e["target"]) for e in result["edges"]),
+            [("a", "b"), ("a", "e"), ("b", "c")],
+        )
+        self.assertEqual(sorted(n["id"] for n in self._query()["nodes"]), ["a", "b", "e", "x"])
+
+    def test_limit_truncates(self):
+        result = self._query(depth="10", limit="3")
+        self.assertEqual(len(result["nodes"]), 3)
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["nodes"][0]["id"], "a")
+
+    def test_invalid_parameters(self):
+        for params in ({"depth": "0"}, {"depth": "11"}, {"limit": "x"}, {"direction": "up"}, {"function": ""}):
+            with self.subTest(params=params), self.assertRaises(QueryError):
+                self._query(**params)
+        with self.assertRaises(KeyError):
+            self._query(function="nope")
@@ -1,15 +1,21 @@
 from django.urls import path
-from .views import StartAnalysisView, RunAnalysisStepView, TaskStatusView, TaskResultView, TaskCGView, TaskWarningsView, TaskFunctionsView, TaskZipDownloadView
+from .views import StartAnalysisView, StartPipelineView, RunAnalysisStepView, TaskStatusView, TaskResultView, TaskCGView, TaskWarningsView, TaskFunctionsView, TaskWarningsQueryView, TaskFunctionsQueryView, TaskCGNeighborhoodView, TaskCGLodView, TaskZipDownloadView, TaskProfileDownloadView, task_events, metrics
 
 urlpatterns = [
     # POST 요청: 분석 Task 시작 (StartAnalysisView가 처리)
     path('tasks/start/', StartAnalysisView.as_view(), name='start_analysis'),
+
+    # POST 요청: 전체 파이프라인 Task 시작 (clone -> 분석 tool 병렬 -> 전처리)
+    path('tasks/pipeline/', StartPipelineView.as_view(), name='start_pipeline'),
     
     # POST 요청: 특정 Task의 다음 분석 단계 실행
     path('tasks/<int:task_id>/run/<str:step_name>/', RunAnalysisStepView.as_view(), name='run_analysis_step'),
     
     # GET 요청: Task 상태 조회
     path('tasks/<int:pk>/status/', TaskStatusView.as_view(), name='task_status'),
+
+    # GET 요청: Task 상태 push (Server-Sent Events)
+    path('tasks/<int:pk>/events/', task_events, name='task_events'),
     
     # GET 요청: Task 최종 결과 조회
     path('tasks/<int:pk>/result/', TaskResultView.as_view(), name='task_result'),
@@ -19,6 +25,22 @@ urlpatterns = [
     path('tasks/<int:pk>/warnings/', TaskWarningsView.as_view(), name='task_warnings'),
     path('tasks/<int:pk>/functions/', TaskFunctionsView.as_view(), name='task_functions'),
 
+    # warnings / functions 조회 (필터, 필드 선택, 정렬, cursor 페이지네이션)
+    path('tasks/<int:pk>/warnings/query/', TaskWarningsQueryView.as_view(), name='task_warnings_query'),
+    path('tasks/<int:pk>/functions/query/', TaskFunctionsQueryView.as_view(), name='task_functions_query'),
+
+    # call graph k-hop 이웃 조회
+    path('tasks/<int:pk>/cg/neighborhood/', TaskCGNeighborhoodView.as_view(), name='task_cg_neighborhood'),
+
+    # directory / file / function 단계별 call graph (level 조회, 묶음 펼치기)
+    path('tasks/<int:pk>/cg/lod/', TaskCGLodView.as_view(), name='task_cg_lod'),
+
     # ZIP 다운로드
     path('tasks/<int:pk>/download/', TaskZipDownloadView.as_view(), name='task_download'),
+
+    # 전처리 stage profile 결과 (profile=true 로 시작한 Task) ZIP 다운로드
+    path('tasks/<int:pk>/profile/', TaskProfileDownloadView.as_view(), name='task_profile'),
+
+    # 단계 실행 기록 metrics (Prometheus text format)
+    path('metrics/', metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -3,26 +3,28 @@ from rest_framework import views, status, generics
 from rest_framework.response import Response
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse, JsonResponse, HttpResponse
 import json
 
 from .models import AnalysisTask
 from .tasks import (
     start_cloning_task, run_infer_task, run_cpplint_task, 
     run_lizard_task, run_clang_build_task, run_preprocessing_task,
-    load_task_json, build_task_zip, run_cleanup_task
+    load_task_json, get_task_file_path, get_task_result_index, get_task_cg_index, get_task_cg_lod, get_task_zip, get_task_profile, run_cleanup_task, start_full_pipeline,
+    STATUS_FIELDS
 )
+from .renderers import ColumnarRenderer
+from .file_response import serve_file
+from .zip_stream import stream_zip
+from .events import stream_task_events, task_snapshot
+from . import status_cache, metrics as step_metrics
+from .result_query import QueryError, query as query_results
+from .cg_neighborhood import neighborhood as cg_neighborhood
+from .lod_query import query as query_lod
+from .script import columnar
 
 # --- 1. Serializers ---
 
-class TaskStatusSerializer(serializers.ModelSerializer):
-    """
-    작업의 현재 상태 및 진행 단계를 표시하기 위한 Serializer.
-    """
-    class Meta:
-        model = AnalysisTask
-        fields = ('id', 'github_url', 'status', 'current_step', 'created_at', 'error_message')
-
 class TaskResultSerializer(serializers.ModelSerializer):
     """
     최종 분석 결과 (result_data)를 반환하기 위한 Serializer.
@@ -34,20 +36,26 @@ class TaskResultSerializer(serializers.ModelSerializer):
 
 # --- 2. API Views ---
 
+def _profile_flag(request):
+    """요청 body 의 profile 값 (true/false, 1/0 등). 잘못된 값이면 ValidationError (400)."""
+    return serializers.BooleanField().to_internal_value(request.data.get('profile', False))
+
 # 1. 분석 시작 (Clone)
 class StartAnalysisView(views.APIView):
     """
     GitHub URL을 받아 AnalysisTask를 생성하고 CLONING Celery Task를 시작합니다.
+    profile=true 를 주면 전처리 stage 마다 cProfile / tracemalloc 결과를 남깁니다 (결과 캐시는 쓰지 않음).
     """
     def post(self, request):
         github_url = request.data.get('github_url')
         if not github_url:
             return Response({"error": "GitHub URL is required."}, status=status.HTTP_400_BAD_REQUEST)
+        profile = _profile_flag(request)
         
         # Task 생성 및 상태 초기화 (PENDING, NONE)
-        task = AnalysisTask.objects.create(github_url=github_url, status='PENDING', current_step='NONE')
-        
-        # Celery Task 시작
+        task = AnalysisTask.objects.create(github_url=github_url, status='PENDING', current_step='NONE', profile=profile)
+
+        # Celery Task 시작 (같은 repo@commit 결과가 캐시에 있으면 worker 가 clone 없이 바로 완료)
         start_cloning_task.delay(task.id, github_url)
         
         return Response({
@@ -57,6 +65,31 @@ class StartAnalysisView(views.APIView):
             "message": "Cloning task initiated. Check status API for updates."
         }, status=status.HTTP_202_ACCEPTED)
 
+# 1-1. 전체 파이프라인 실행 (Clone -> 분석 tool 병렬 실행 -> 전처리)
+class StartPipelineView(views.APIView):
+    """
+    GitHub URL을 받아 AnalysisTask를 생성하고
+    clone -> {clang, infer, cpplint, lizard} -> preprocess 전체를 하나의 Celery workflow로 시작합니다.
+    단계별 진행 상황은 status API의 steps 필드로 확인합니다.
+    profile=true 를 주면 전처리 stage 마다 cProfile / tracemalloc 결과를 남깁니다 (결과 캐시는 쓰지 않음).
+    """
+    def post(self, request):
+        github_url = request.data.get('github_url')
+        if not github_url:
+            return Response({"error": "GitHub URL is required."}, status=status.HTTP_400_BAD_REQUEST)
+        profile = _profile_flag(request)
+
+        task = AnalysisTask.objects.create(github_url=github_url, status='PENDING', current_step='NONE', profile=profile)
+
+        start_full_pipeline(task.id, github_url)
+
+        return Response({
+            "task_id": task.id,
+            "status": "RUNNING",
+            "current_step": "CLONING",
+            "message": "Full analysis pipeline initiated. Check status API for per-step updates."
+        }, status=status.HTTP_202_ACCEPTED)
+
 # 2. 단계별 분석 실행
 class RunAnalysisStepView(views.APIView):
     """
@@ -95,9 +128,35 @@ class RunAnalysisStepView(views.APIView):
 class TaskStatusView(generics.RetrieveAPIView):
     """
     Task ID로 현재 상태 (status, current_step)를 조회합니다.
+    worker 가 써 둔 Redis 상태 캐시를 먼저 읽고, 없을 때만 DB 에서 읽어 캐시를 채웁니다.
+    응답 형식은 캐시와 SSE 가 같이 쓰는 events.task_snapshot 이 정합니다 (serializer 는 쓰지 않음).
     """
-    queryset = AnalysisTask.objects.all()
-    serializer_class = TaskStatusSerializer
+    queryset = AnalysisTask.objects.only(*STATUS_FIELDS).prefetch_related('steps')
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self.kwargs['pk']
+        data = status_cache.read(pk)
+        if data is None:
+            task = self.get_object()
+            data = task_snapshot(task, task.steps.all())
+            status_cache.write(pk, data, task.updated_at)
+        return Response(data)
+
+# 3-1. 상태 push (Server-Sent Events)
+async def task_events(request, pk):
+    """
+    Task 의 status / current_step / 전처리 stage 진행 상황을 text/event-stream 으로 push 합니다.
+    연결 직후 현재 상태를 한 번 보내고, Task 가 끝나면 stream 을 닫습니다.
+    긴 연결을 붙잡고 있으므로 DRF view 가 아닌 async view 로 두고, ASGI 로 서빙해야 합니다.
+    """
+    if not await AnalysisTask.objects.filter(pk=pk).aexists():
+        return JsonResponse({"detail": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(stream_task_events(pk), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # nginx 등 reverse proxy 가 응답을 모아 두지 않도록
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 # 4. 결과 조회
 class TaskResultView(generics.RetrieveAPIView):
@@ -117,10 +176,20 @@ class TaskResultView(generics.RetrieveAPIView):
 # 4-1. 결과 json 각각 전달
 class TaskFileJSONView(views.APIView):
     """
-    /tmp/analysis_<task_id>/<filename> 을 읽어 JSON으로 반환하는 공통 View.
+    /tmp/analysis_<task_id>/<filename> 을 파싱하지 않고 그대로 반환하는 공통 View.
     자식 클래스에서 filename만 override.
+    columnar_filename 이 있으면 Accept: application/vnd.infovis.columnar 요청에 binary columnar 파일을 반환.
+    ETag / Last-Modified 조건부 GET(304) 과 미리 압축해 둔 gzip / brotli 파일을 지원한다.
     """
     filename: str | None = None
+    columnar_filename: str | None = None
+    columnar_encoder = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.columnar_filename is not None:
+            renderers.append(ColumnarRenderer())
+        return renderers
 
     def get(self, request, pk, *args, **kwargs):
         if self.filename is None:
@@ -129,33 +198,126 @@ class TaskFileJSONView(views.APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        if isinstance(request.accepted_renderer, ColumnarRenderer):
+            return self.get_columnar(request, pk)
+
         try:
-            data = load_task_json(pk, self.filename)
+            path = get_task_file_path(pk, self.filename)
         except FileNotFoundError as e:
             # Task 없거나, 파일 없을 때 둘 다 여기서 처리 가능
             return Response(
                 {"detail": str(e)},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        except json.JSONDecodeError:
-            return Response(
-                {"detail": f"{self.filename} is not a valid JSON file."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+
+        # 디스크의 JSON 이 곧 응답이므로 json.load / 재직렬화 없이 그대로 스트리밍
+        return serve_file(request, path, "application/json")
+
+    def get_columnar(self, request, pk):
+        try:
+            return serve_file(request, get_task_file_path(pk, self.columnar_filename), columnar.CONTENT_TYPE)
+        except FileNotFoundError:
+            # 전처리 단계에서 .bin 을 만들기 전의 결과면 JSON 에서 바로 변환
+            try:
+                data = self.columnar_encoder(load_task_json(pk, self.filename))
+            except FileNotFoundError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+            except json.JSONDecodeError:
+                return Response(
+                    {"detail": f"{self.filename} is not a valid JSON file."},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
 
         return Response(data, status=status.HTTP_200_OK)
 
 
 class TaskCGView(TaskFileJSONView):
     filename = "cg_filtered.json"
+    columnar_filename = "cg_filtered.bin"
+    columnar_encoder = staticmethod(columnar.encode_cg)
 
 class TaskWarningsView(TaskFileJSONView):
     filename = "warnings.json"
 
 class TaskFunctionsView(TaskFileJSONView):
     filename = "functions.json"
+    columnar_filename = "functions.bin"
+    columnar_encoder = staticmethod(columnar.encode_functions)
+
+# 4-2. warnings / functions 조회 (필터, 필드 선택, 정렬, cursor 페이지네이션)
+class TaskResultQueryView(views.APIView):
+    """
+    전처리 때 만든 results.sqlite3 index 로 warnings / functions 의 일부만 조회.
+    자식 클래스에서 table만 override.
+    예: /tasks/<id>/warnings/query/?file=src/a.c&severity_level=HIGH&fields=line,warning&sort=line&limit=50
+    """
+    table: str | None = None
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            db_path = get_task_result_index(pk)
+            data = query_results(db_path, self.table, request.query_params)
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except QueryError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class TaskWarningsQueryView(TaskResultQueryView):
+    table = "warnings"
+
+class TaskFunctionsQueryView(TaskResultQueryView):
+    table = "functions"
+
+# 4-3. call graph 이웃 조회
+class TaskCGNeighborhoodView(views.APIView):
+    """
+    전처리 때 만든 adjacency index 로 함수 하나의 k-hop caller / callee 만 cg_filtered.json 형식으로 반환.
+    예: /tasks/<id>/cg/neighborhood/?function=main&depth=2&direction=callees&limit=100
+    """
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            index_path = get_task_cg_index(pk)
+            data = cg_neighborhood(index_path, request.query_params)
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except KeyError:
+            return Response(
+                {"detail": f"function {request.query_params.get('function')!r} is not in the call graph."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except QueryError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+class TaskCGLodView(views.APIView):
+    """
+    directory / file / function 단계로 묶은 call graph.
+    예: /tasks/<id>/cg/lod/?level=directory  (한 단계 전체)
+        /tasks/<id>/cg/lod/?expand=dir:src/net  (묶음 하나를 한 단계 아래로 펼침)
+    """
 
-# 4-2. 결과 json zip file download
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            lod_path = get_task_cg_lod(pk)
+            data = query_lod(lod_path, request.query_params)
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except KeyError:
+            return Response(
+                {"detail": f"cluster {request.query_params.get('expand')!r} is not in the call graph."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except QueryError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+# 4-4. 결과 json zip file download
 class TaskZipDownloadView(views.APIView):
     """
     /tmp/analysis_<task_id> 내의
@@ -164,13 +326,15 @@ class TaskZipDownloadView(views.APIView):
       - functions.json
     세 파일 중, 존재하는 것만 ZIP으로 묶어 내려줌.
     세 개 모두 없으면 404.
+    ZIP 은 메모리에 다 만들지 않고 압축하는 대로 스트리밍하고,
+    완료된 Task 의 ZIP 은 디스크에 남겨 두었다가 다음 요청부터 파일 그대로 내려준다.
     """
 
     filenames = ["cg_filtered.json", "warnings.json", "functions.json"]
 
     def get(self, request, pk, *args, **kwargs):
         try:
-            zip_bytes = build_task_zip(pk, self.filenames)
+            cached, members, cache_path = get_task_zip(pk, self.filenames)
         except FileNotFoundError as e:
             # Task가 없거나, 결과 파일이 아예 없는 경우
             return Response(
@@ -178,6 +342,34 @@ class TaskZipDownloadView(views.APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        response = HttpResponse(zip_bytes, content_type="application/zip")
+        if cached is not None:
+            response = serve_file(request, cached, "application/zip")
+        else:
+            response = StreamingHttpResponse(stream_zip(members, cache_path), content_type="application/zip")
         response["Content-Disposition"] = f'attachment; filename="analysis_{pk}.zip"'
-        return response
\ No newline at end of file
+        return response
+
+
+# 4-5. 전처리 stage profile 결과 download
+class TaskProfileDownloadView(views.APIView):
+    """
+    profile=true 로 시작한 Task 의 stage 별 cProfile (.prof) 과 할당 report (.alloc.txt) 를 ZIP 으로 내려줌.
+    profile 결과가 없으면 404.
+    """
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            members = get_task_profile(pk)
+        except FileNotFoundError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        response = StreamingHttpResponse(stream_zip(members), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="analysis_{pk}_profile.zip"'
+        return response
+
+# 5. 단계 실행 기록 metrics (Prometheus scrape 용)
+def metrics(request):
+    """
+    StepRun 기록을 tool 별 histogram (시간, CPU, 최대 RSS, 입출력 크기) 으로 내보냅니다.
+    """
+    return HttpResponse(step_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
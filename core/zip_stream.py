@@ -0,0 +1,99 @@
+# core/zip_stream.py
+"""
+결과 파일들을 메모리에 전부 올리지 않고 조금씩 압축해서 내보내는 ZIP generator.
+
+- zipfile 을 seek 할 수 없는 sink 에 쓰게 해서 (local header 뒤 data descriptor 방식)
+  CHUNK_SIZE 만큼 압축할 때마다 나온 bytes 를 바로 yield 한다. 메모리는 chunk 몇 개 분량만 쓴다.
+- cache_path 가 주어지면 내보내는 bytes 를 임시 파일에도 같이 쓰고, 끝까지 다 만들었을 때만
+  cache_path 로 rename 한다. (중간에 연결이 끊기면 임시 파일은 지운다)
+- stream_zip() 은 async iterator 다. 파일 읽기 / zlib 압축은 chunk 마다 sync_to_async 로 실행해
+  ASGI 에서 event loop 를 막지도, 응답 전체를 메모리에 모으지도 않는다. (core/streaming.py)
+"""
+
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+from .streaming import async_iterate
+
+CHUNK_SIZE = 1 << 20
+
+
+class _Sink:
+    """zipfile 이 쓰는 bytes 를 모아 두었다가 drain() 때 넘겨주는 write-only 파일 객체."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def is_fresh(archive: Path, members) -> bool:
+    """archive 가 있고 members 의 어떤 파일보다도 나중에 만들어졌는지."""
+    archive = Path(archive)
+    if not archive.is_file():
+        return False
+    built = archive.stat().st_mtime_ns
+    return all(Path(path).stat().st_mtime_ns <= built for _, path in members)
+
+
+def _iter_zip(members):
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for arcname, path in members:
+            info = zipfile.ZipInfo.from_file(path, arcname=arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as src, zf.open(info, mode="w") as dest:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _zip_chunks(members, cache_path=None):
+    """_iter_zip 과 같고, cache_path 가 주어지면 다 만든 ZIP 을 그 경로에도 남긴다."""
+    if cache_path is None:
+        yield from _iter_zip(members)
+        return
+
+    cache_path = Path(cache_path)
+    fd, tmp = tempfile.mkstemp(dir=str(cache_path.parent), prefix=f".{cache_path.name}.")
+    completed = False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for data in _iter_zip(members):
+                f.write(data)
+                yield data
+        os.replace(tmp, cache_path)
+        completed = True
+    finally:
+        # 클라이언트가 중간에 끊으면 (GeneratorExit) 만들다 만 파일은 버린다
+        if not completed and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def stream_zip(members, cache_path=None):
+    """
+    members: [(zip 안의 이름, 파일 경로), ...] 를 ZIP bytes chunk 들로 내보내는 async iterator.
+    cache_path 가 주어지면 다 만든 ZIP 을 그 경로에도 남긴다.
+    """
+    return async_iterate(_zip_chunks(members, cache_path))
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+bc_cache.py: clang_cg.sh 에서 쓰는 translation unit 단위 bitcode / call graph 캐시 (ccache 방식).
+
+Usage (리포지토리 루트에서 실행):
+  python3 bc_cache.py compile --compile-db build/compile_commands.json --out-dir bc --jobs N c_files.txt
+  python3 bc_cache.py callgraph --out-dir bc > cg.txt
+
+- compile:   .c 파일마다 (toolchain 버전 + 컴파일 옵션 + 전처리된 소스) hash 를 key 로
+             캐시된 .bc 가 있으면 복사하고, 없을 때만 clang -emit-llvm 을 실행해 캐시에 넣는다.
+             key 목록은 <out-dir>/keys.json 에 남긴다.
+             전처리와 컴파일 모두 -ffile-prefix-map=<repo>=. 로 실행해 __FILE__ / debug info 에
+             /data/analysis_<id> 같은 task 별 절대 경로가 들어가지 않게 한다.
+- callgraph: 모든 module key 로 만든 key 에 캐시된 call graph 가 있으면 그대로 출력하고,
+             없으면 llvm-link + opt 를 한 번 실행한다. 링크가 실패하면 module 별 call graph 를
+             (module key 로 캐시하며) 이어서 출력한다.
+             linked module 의 call graph 는 전체 module 을 하나의 key 로 캐시하므로,
+             .c 파일 하나만 바뀌어도 llvm-link + opt 는 전체를 다시 실행한다
+             (컴파일은 바뀐 파일만 다시 한다). module 별 캐시는 링크가 실패했을 때만 쓰인다.
+
+캐시 위치는 BC_CACHE_DIR (기본 $ANALYSIS_CACHE_DIR/bitcode), 크기 상한은 BC_CACHE_MAX_BYTES.
+상한을 넘으면 가장 오래 쓰이지 않은(mtime 기준) 항목부터 지운다.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.script.file_cache import copy_atomic, evict_oldest, write_atomic  # noqa: E402
+
+CACHE_DIR = Path(
+    os.environ.get("BC_CACHE_DIR")
+    or os.path.join(os.environ.get("ANALYSIS_CACHE_DIR", "/data/cache"), "bitcode")
+)
+CACHE_MAX_BYTES = int(os.environ.get("BC_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+COMPILE_FLAGS = ["-O0", "-g", "-emit-llvm", "-c"]
+
+
+def prefix_map_flags(repo_dir):
+    # __FILE__ (macro) 와 debug info 의 repo 절대 경로를 "." 으로 바꾼다
+    return [f"-ffile-prefix-map={repo_dir}=."]
+
+# 전처리 결과에 영향을 주는 옵션들 (값을 다음 인자로 받는 형태)
+PP_FLAGS_WITH_ARG = {"-I", "-D", "-U", "-include", "-imacros", "-isystem", "-iquote", "-idirafter"}
+# 값이 경로인 옵션들 (key 에는 repo 기준 상대 경로로 넣는다)
+PP_PATH_FLAGS = {"-I", "-include", "-imacros", "-isystem", "-iquote", "-idirafter"}
+
+
+def run_text(cmd):
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    return (proc.stdout or proc.stderr).strip()
+
+
+def toolchain_version():
+    return run_text(["clang", "--version"]) + "\n" + run_text(["opt", "--version"])
+
+
+def sha256_text(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8", errors="surrogateescape"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# --- cache 저장소 ---
+
+def cache_path(key, suffix):
+    return CACHE_DIR / key[:2] / f"{key}{suffix}"
+
+
+def cache_get(key, suffix, dest=None):
+    """hit 이면 mtime 을 갱신(LRU)하고, dest 가 있으면 복사 후 True / 없으면 내용을 반환."""
+    path = cache_path(key, suffix)
+    try:
+        os.utime(path)
+        if dest is not None:
+            shutil.copyfile(path, dest)
+            return True
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def cache_put(key, suffix, src=None, data=None):
+    path = cache_path(key, suffix)
+    try:
+        if src is not None:
+            copy_atomic(src, path)
+        else:
+            write_atomic(path, data)
+    except OSError as e:
+        # 캐시는 최적화일 뿐이므로 저장 실패는 무시
+        print(f"[bc_cache] store failed for {path}: {e}", file=sys.stderr)
+
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """캐시 전체 크기가 max_bytes 를 넘으면 mtime 이 오래된 것부터 90% 이하가 될 때까지 지운다."""
+    evict_oldest(CACHE_DIR, max_bytes)
+
+
+# --- compile ---
+
+def load_compile_db(db_path, repo_dir):
+    """file -> (directory, 전처리 옵션(실행용), 전처리 옵션(key 용)) 매핑."""
+    with open(db_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    db = {}
+    for entry in entries:
+        file_ = entry.get("file")
+        if not file_ or file_ in db:
+            continue
+        directory = entry.get("directory") or str(repo_dir)
+        args = entry.get("arguments") or shlex.split(entry.get("command", ""))
+
+        run_flags, key_flags = [], []
+        i = 1  # args[0] 은 컴파일러
+        while i < len(args):
+            arg = args[i]
+            flag, value = None, None
+            if arg in PP_FLAGS_WITH_ARG and i + 1 < len(args):
+                flag, value = arg, args[i + 1]
+                i += 1
+            elif arg.startswith("-std="):
+                run_flags.append(arg)
+                key_flags.append(arg)
+            else:
+                for prefix in ("-isystem", "-iquote", "-I", "-D", "-U"):
+                    if arg.startswith(prefix) and len(arg) > len(prefix):
+                        flag, value = prefix, arg[len(prefix):]
+                        break
+            i += 1
+
+            if flag is None:
+                continue
+            if flag in PP_PATH_FLAGS:
+                abs_value = os.path.normpath(os.path.join(directory, value))
+                run_flags += [flag, abs_value]
+                # /data/analysis_<id> 처럼 task 마다 다른 절대 경로가 key 에 들어가지 않도록
+                key_flags += [flag, os.path.relpath(abs_value, repo_dir)]
+            else:
+                run_flags += [flag, value]
+                key_flags += [flag, value]
+
+        db[file_] = (directory, run_flags, key_flags)
+    return db
+
+
+def preprocessed_hash(src, run_flags, repo_dir):
+    # -P: line marker(절대 경로 포함)를 빼고, prefix map 으로 __FILE__ 도 repo 기준 경로로 바꿔
+    # repo 위치가 달라도 같은 hash 가 나오게 한다
+    proc = subprocess.Popen(
+        ["clang", "-E", "-P", *prefix_map_flags(repo_dir), *run_flags, src],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    h = hashlib.sha256()
+    for chunk in iter(lambda: proc.stdout.read(1 << 16), b""):
+        h.update(chunk)
+    if proc.wait() != 0:
+        return None
+    return h.hexdigest()
+
+
+def bc_filename(src):
+    # 예: src/main.c -> src_main.bc (기존 clang_cg.sh 와 같은 규칙)
+    name = src.replace("/", "_")
+    return name[:-2] + ".bc" if name.endswith(".c") else name
+
+
+def compile_one(src, db, repo_dir, out_dir, toolchain):
+    # include 경로는 절대 경로로 바꿔 두었으므로 clang 은 기존처럼 리포지토리 루트에서 실행
+    _directory, run_flags, key_flags = db.get(src, (str(repo_dir), [], []))
+    out_path = out_dir / bc_filename(src)
+
+    pp_hash = preprocessed_hash(src, run_flags, repo_dir)
+    key = None
+    if pp_hash is not None:
+        key = sha256_text(
+            toolchain, " ".join(COMPILE_FLAGS), "-ffile-prefix-map=<repo>=.", " ".join(key_flags), pp_hash
+        )
+        if cache_get(key, ".bc", dest=out_path):
+            return out_path.name, key, True
+
+    proc = subprocess.run(
+        ["clang", *COMPILE_FLAGS, *prefix_map_flags(repo_dir), *run_flags, src, "-o", str(out_path)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"clang failed for {src}:\n{proc.stderr}")
+
+    if key is not None:
+        cache_put(key, ".bc", src=out_path)
+    else:
+        # 전처리가 실패한 경우: 캐시 없이 컴파일 결과 내용으로 key 를 만든다
+        key = sha256_text(toolchain, hashlib.sha256(out_path.read_bytes()).hexdigest())
+    return out_path.name, key, False
+
+
+def cmd_compile(args):
+    repo_dir = Path.cwd()
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(args.sources, "r", encoding="utf-8") as f:
+        sources = [line.strip() for line in f if line.strip()]
+
+    db = load_compile_db(args.compile_db, repo_dir)
+    toolchain = toolchain_version()
+
+    keys = {}
+    hits = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(compile_one, src, db, repo_dir, out_dir, toolchain) for src in sources]
+        for future in futures:
+            try:
+                name, key, hit = future.result()
+            except RuntimeError as e:
+                failed.append(str(e))
+                continue
+            keys[name] = key
+            hits += hit
+
+    with open(out_dir / "keys.json", "w", encoding="utf-8") as f:
+        json.dump(keys, f, indent=2, sort_keys=True)
+
+    print(f"[bc_cache] {len(sources)} sources: {hits} cached, {len(keys) - hits} compiled", file=sys.stderr)
+    evict()
+
+    if failed:
+        print("\n".join(failed), file=sys.stderr)
+        return 1
+    return 0
+
+
+# --- callgraph ---
+
+def run_opt(bc_path):
+    # opt는 stderr로 call graph를 쓰니까 stdout 과 합쳐서 받는다
+    proc = subprocess.run(
+        ["opt", "-passes=print-callgraph", "-disable-output", str(bc_path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stdout.decode("utf-8", errors="ignore"))
+    return proc.stdout
+
+
+def cmd_callgraph(args):
+    out_dir = Path(args.out_dir)
+    with open(out_dir / "keys.json", "r", encoding="utf-8") as f:
+        keys = json.load(f)
+    if not keys:
+        print("[bc_cache] no bitcode modules", file=sys.stderr)
+        return 1
+
+    names = sorted(keys)
+    toolchain = toolchain_version()
+    out = sys.stdout.buffer
+
+    # 전체 module key 로 만든 key 이므로 module 하나만 바뀌어도 miss 가 나고 링크부터 다시 한다
+    linked_key = sha256_text(toolchain, "linked", *(keys[n] for n in names))
+    cached = cache_get(linked_key, ".cg.txt")
+    if cached is not None:
+        print("[bc_cache] call graph cache hit (linked module)", file=sys.stderr)
+        out.write(cached)
+        return 0
+
+    # 하나의 module 로 링크해 opt 를 한 번만 실행 (module 간 호출도 한 그래프에서 해석됨)
+    link = subprocess.run(
+        ["llvm-link", *(str(out_dir / n) for n in names), "-o", args.linked],
+        capture_output=True,
+        text=True,
+    )
+    if link.returncode == 0:
+        cg = run_opt(args.linked)
+        cache_put(linked_key, ".cg.txt", data=cg)
+        out.write(cg)
+        return 0
+
+    # 여러 실행 파일의 main 처럼 중복 정의가 있으면 링크가 실패하므로 그때는 module 별로 추출
+    print(f"[bc_cache] llvm-link failed, extracting per module:\n{link.stderr}", file=sys.stderr)
+    for name in names:
+        print(f";; ===== Callgraph for module: {out_dir / name} =====", file=sys.stderr)
+        module_key = sha256_text(toolchain, "module", keys[name])
+        cg = cache_get(module_key, ".cg.txt")
+        if cg is None:
+            cg = run_opt(out_dir / name)
+            cache_put(module_key, ".cg.txt", data=cg)
+        out.write(cg)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_compile = sub.add_parser("compile")
+    p_compile.add_argument("sources", help="컴파일할 .c 파일 목록 (한 줄에 하나)")
+    p_compile.add_argument("--compile-db", required=True)
+    p_compile.add_argument("--out-dir", default="bc")
+    p_compile.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    p_compile.set_defaults(func=cmd_compile)
+
+    p_cg = sub.add_parser("callgraph")
+    p_cg.add_argument("--out-dir", default="bc")
+    p_cg.add_argument("--linked", default="all.bc")
+    p_cg.set_defaults(func=cmd_callgraph)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+bench_preprocessing.py: 합성 tool 출력으로 core/script 의 전처리 stage 들을 돌려 보는 benchmark.
+
+Usage (리포지토리 루트에서 실행):
+  python3 scripts/bench_preprocessing.py --scales 1000,10000,100000 --out bench.json
+  python3 scripts/bench_preprocessing.py --scales 1000000 --repeat 1 --no-memory --out bench_1m.json
+  python3 scripts/bench_preprocessing.py --scales 1000,10000 --compare bench.json   # 이전 report 와 비교
+
+scale (함수 수) 마다 다음 tool 출력을 같은 seed 로 만든다 (같은 인자면 항상 같은 입력):
+  cg.txt                opt -passes=print-callgraph 형식. 함수마다 평균 --edges-per-function 개 호출
+                        (대부분 같은 디렉토리 안, 일부는 전체에서), 가끔 external node / llvm-link suffix
+  lizard_result.csv     lizard --csv 형식. 파일마다 FUNCTIONS_PER_FILE 개, 디렉토리마다 FILES_PER_DIR 개
+  cpplint_result.txt    cpplint 형식 (절대 경로). warning 의 절반
+  infer-out/report.json infer report 형식. warning 의 나머지 절반 (일부는 procedure 없음)
+
+그 다음 worker 와 같은 순서로 (tool 별 전처리 -> run_preprocessing_task 의 stage 들) Pipeline 으로 실행하고
+stage 마다 아래 값을 JSON report 에 남긴다.
+  wall_seconds        --repeat 번 중 가장 짧은 시간 (tracemalloc 없이 측정)
+  peak_memory_bytes   stage 실행 중 추가로 잡은 Python 메모리 최댓값 (tracemalloc, numpy 포함. 따로 한 번 더 실행)
+  throughput_per_s    stage 단위(unit: functions / warnings) 개수 / wall_seconds
+  output_bytes        파일로 남긴 산출물 크기 (메모리로만 넘기는 stage 는 0)
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np  # noqa: E402
+
+from core.script.pipeline import (  # noqa: E402
+    CG_PREPROCESSING,
+    CPPLINT_PREPROCESSING,
+    INFER_PREPROCESSING,
+    LIZARD_PREPROCESSING,
+    PREPROCESSING_STAGES,
+    Pipeline,
+)
+
+STAGES = [CG_PREPROCESSING, CPPLINT_PREPROCESSING, LIZARD_PREPROCESSING, INFER_PREPROCESSING, *PREPROCESSING_STAGES]
+
+# warning 개수에 비례하는 stage (나머지는 함수 개수)
+WARNING_STAGES = {
+    "cpplint_preprocessing", "infer_preprocessing",
+    "cpplint_add_function", "infer_add_function", "merge_warnings",
+}
+
+FUNCTIONS_PER_FILE = 20
+FILES_PER_DIR = 20
+# --compare 에서 느려졌다고 표시할 비율 (측정 잡음보다 큰 차이만)
+SLOWER_THRESHOLD = 0.10
+
+# 같은 디렉토리 안의 함수를 부르는 비율 (나머지는 전체에서 무작위)
+LOCAL_CALL_RATIO = 0.8
+
+CPPLINT_CATEGORIES = [
+    ("Missing space around operator", "whitespace/operators", 4),
+    ("Lines should be <= 80 characters long", "whitespace/line_length", 2),
+    ("Using C-style cast", "readability/casting", 4),
+    ("Missing username in TODO", "readability/todo", 2),
+    ("Almost always, snprintf is better than strcpy", "runtime/printf", 4),
+]
+INFER_BUGS = [
+    ("NULL_DEREFERENCE", "Null Dereference", "ERROR"),
+    ("RESOURCE_LEAK", "Resource Leak", "ERROR"),
+    ("UNINITIALIZED_VALUE", "Uninitialized Value", "WARNING"),
+    ("DEAD_STORE", "Dead Store", "INFO"),
+]
+
+
+# --- 합성 tool 출력 ---
+
+def _layout_functions(n, rng):
+    """함수 i 의 (파일 경로, 시작 줄, 끝 줄)."""
+    files, starts, ends = [], np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+    lengths = rng.integers(5, 80, size=n)
+    line = 1
+    for i in range(n):
+        file_no = i // FUNCTIONS_PER_FILE
+        if i % FUNCTIONS_PER_FILE == 0:
+            line = 1
+        files.append(f"src/mod{file_no // FILES_PER_DIR}/file{file_no % FILES_PER_DIR}.c")
+        starts[i] = line + 2
+        ends[i] = starts[i] + lengths[i] - 1
+        line = ends[i] + 1
+    return files, starts, ends
+
+
+def _write_cg(path, n, edges_per_function, rng):
+    per_dir = FUNCTIONS_PER_FILE * FILES_PER_DIR
+    calls = rng.poisson(edges_per_function, size=n)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("Call graph node <<null function>><<0x1>>  #uses=0\n")
+        for i in range(n):
+            f.write(f"\nCall graph node for function: 'fn_{i}'<<0x{i:x}>>  #uses={calls[i] + 1}\n")
+            k = int(calls[i])
+            if not k:
+                continue
+            local = rng.random(k) < LOCAL_CALL_RATIO
+            base = (i // per_dir) * per_dir
+            targets = np.where(
+                local,
+                base + rng.integers(0, min(per_dir, n - base), size=k),
+                rng.integers(0, n, size=k),
+            )
+            for t in targets.tolist():
+                # llvm-link 가 겹치는 static 함수 이름에 붙이는 suffix 도 가끔 섞는다
+                name = f"fn_{t}.{t % 7}" if t % 97 == 0 else f"fn_{t}"
+                f.write(f"  CS<0x{t:x}> calls function '{name}'\n")
+            if i % 5 == 0:
+                f.write("  CS<0x0> calls external node\n")
+
+
+def _write_lizard(path, files, starts, ends, rng):
+    n = len(files)
+    nloc = ends - starts + 1 - rng.integers(0, 4, size=n)
+    ccn = rng.integers(1, 30, size=n)
+    params = rng.integers(0, 6, size=n)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for i in range(n):
+            start, end = int(starts[i]), int(ends[i])
+            location = f"fn_{i}@{start}-{end}@./{files[i]}"
+            writer.writerow([
+                int(nloc[i]), int(ccn[i]), int(nloc[i]) * 6, int(params[i]), end - start + 1,
+                location, f"./{files[i]}", f"fn_{i}", f"fn_{i}( )", start, end,
+            ])
+
+
+def _warning_sites(count, files, starts, ends, rng):
+    """warning 마다 (함수 번호, 줄 번호). 줄은 그 함수 범위 안."""
+    owners = rng.integers(0, len(files), size=count)
+    lines = starts[owners] + (rng.random(count) * (ends[owners] - starts[owners] + 1)).astype(np.int64)
+    return owners.tolist(), lines.tolist()
+
+
+def _write_cpplint(path, repo_dir, count, files, starts, ends, rng):
+    owners, lines = _warning_sites(count, files, starts, ends, rng)
+    kinds = rng.integers(0, len(CPPLINT_CATEGORIES), size=count).tolist()
+    with path.open("w", encoding="utf-8") as f:
+        for owner, line, kind in zip(owners, lines, kinds):
+            detail, category, confidence = CPPLINT_CATEGORIES[kind]
+            f.write(f"{repo_dir}/{files[owner]}:{line}:  {detail}  [{category}] [{confidence}]\n")
+        f.write(f"Done processing {len(files) // FUNCTIONS_PER_FILE + 1} files\n")
+        f.write(f"Total errors found: {count}\n")
+
+
+def _write_infer(path, count, files, starts, ends, rng):
+    owners, lines = _warning_sites(count, files, starts, ends, rng)
+    kinds = rng.integers(0, len(INFER_BUGS), size=count).tolist()
+    # procedure 가 비어 있으면 infer_add_function 이 줄 번호로 함수를 찾는다
+    named = (rng.random(count) < 0.7).tolist()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("[")
+        for i, (owner, line, kind) in enumerate(zip(owners, lines, kinds)):
+            bug_type, bug_type_hum, severity = INFER_BUGS[kind]
+            item = {
+                "bug_type": bug_type,
+                "qualifier": f"{bug_type_hum.lower()} at line {line}",
+                "severity": severity,
+                "category": "",
+                "line": line,
+                "column": 3,
+                "procedure": f"fn_{owner}" if named[i] else "",
+                "file": files[owner],
+                "bug_type_hum": bug_type_hum,
+            }
+            f.write(("," if i else "") + json.dumps(item))
+        f.write("]")
+
+
+def generate(repo_dir: Path, functions: int, warnings: int, edges_per_function: float, seed: int):
+    """repo_dir 에 합성 tool 출력 4 개를 만든다."""
+    repo_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    files, starts, ends = _layout_functions(functions, rng)
+    _write_cg(repo_dir / "cg.txt", functions, edges_per_function, rng)
+    _write_lizard(repo_dir / "lizard_result.csv", files, starts, ends, rng)
+    _write_cpplint(repo_dir / "cpplint_result.txt", repo_dir, warnings // 2, files, starts, ends, rng)
+    _write_infer(repo_dir / "infer-out" / "report.json", warnings - warnings // 2, files, starts, ends, rng)
+
+
+# --- 측정 ---
+
+def _run_pass(repo_dir, options, measure_memory):
+    """STAGES 를 한 번 다 실행하고 stage 별 (시간, 추가 peak 메모리, 출력 파일 크기) 를 반환한다."""
+    pipeline = Pipeline(repo_dir, options=options)
+    results = {}
+    for stage in STAGES:
+        if measure_memory:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        pipeline.run_stage(stage)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] - baseline if measure_memory else None
+        # 같은 파일을 뒤 stage 가 덮어쓰기도 하므로 (cg_filter -> cg_layout) stage 직후에 잰다
+        results[stage.name] = (elapsed, peak, _output_bytes(repo_dir, stage))
+    return results
+
+
+def _output_bytes(repo_dir, stage):
+    out_path = repo_dir / stage.output
+    # persist=False 여도 pass_repo_root stage 는 (result_index 처럼) 파일을 직접 쓴다
+    written = stage.persist or stage.pass_repo_root
+    return out_path.stat().st_size if written and out_path.is_file() else 0
+
+
+def bench_scale(repo_dir, functions, warnings, args):
+    started = time.perf_counter()
+    generate(repo_dir, functions, warnings, args.edges_per_function, args.seed)
+    generate_seconds = time.perf_counter() - started
+    input_bytes = {
+        name: (repo_dir / name).stat().st_size
+        for name in ("cg.txt", "lizard_result.csv", "cpplint_result.txt", "infer-out/report.json")
+    }
+
+    options = {"layout_cache_dir": None, "layout_max_nodes": args.layout_max_nodes}
+    timings = [_run_pass(repo_dir, options, False) for _ in range(args.repeat)]
+    memory = None
+    if not args.no_memory:
+        tracemalloc.start()
+        try:
+            memory = _run_pass(repo_dir, options, True)
+        finally:
+            tracemalloc.stop()
+
+    stages = []
+    for stage in STAGES:
+        wall = min(t[stage.name][0] for t in timings)
+        unit = "warnings" if stage.name in WARNING_STAGES else "functions"
+        items = warnings if unit == "warnings" else functions
+        stages.append({
+            "name": stage.name,
+            "wall_seconds": round(wall, 6),
+            "peak_memory_bytes": memory[stage.name][1] if memory else None,
+            "unit": unit,
+            "items": items,
+            "throughput_per_s": round(items / wall, 1) if wall > 0 else None,
+            "output_bytes": timings[0][stage.name][2],
+        })
+
+    return {
+        "functions": functions,
+        "warnings": warnings,
+        "generate_seconds": round(generate_seconds, 3),
+        "input_bytes": input_bytes,
+        "total_wall_seconds": round(sum(s["wall_seconds"] for s in stages), 6),
+        "stages": stages,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(report, baseline):
+    """같은 scale / stage 의 wall_seconds 비율 (현재 / baseline) 표를 출력한다."""
+    before = {
+        (result["functions"], stage["name"]): stage["wall_seconds"]
+        for result in baseline["results"] for stage in result["stages"]
+    }
+    print(f"\ncompared with {baseline.get('commit') or '?'} (ratio > 1 is slower)")
+    matched = 0
+    for result in report["results"]:
+        for stage in result["stages"]:
+            old = before.get((result["functions"], stage["name"]))
+            if not old:
+                continue
+            matched += 1
+            ratio = stage["wall_seconds"] / old
+            flag = "  <-- slower" if ratio > 1 + SLOWER_THRESHOLD else ""
+            print(f"  {result['functions']:>9} {stage['name']:<24} {old:9.3f}s -> {stage['wall_seconds']:9.3f}s  x{ratio:.2f}{flag}")
+    if not matched:
+        print("  (no common scale)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1000,10000,100000",
+                        help="쉼표로 구분한 함수 수 목록 (기본 1000,10000,100000)")
+    parser.add_argument("--warnings-per-function", type=float, default=1.0)
+    parser.add_argument("--edges-per-function", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (가장 짧은 값을 남김)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 pass 를 건너뜀")
+    parser.add_argument("--layout-max-nodes", type=int,
+                        default=int(os.environ.get("ANALYSIS_LAYOUT_MAX_NODES", "200000")))
+    parser.add_argument("--workdir", help="합성 입력을 만들 디렉토리 (기본: 임시 디렉토리, 끝나면 삭제)")
+    parser.add_argument("--out", help="JSON report 경로 (기본: stdout)")
+    parser.add_argument("--compare", help="비교할 이전 JSON report")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="bench_preprocessing."))
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": {"platform": platform.platform(), "cpus": os.cpu_count()},
+        "params": {
+            "warnings_per_function": args.warnings_per_function,
+            "edges_per_function": args.edges_per_function,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "layout_max_nodes": args.layout_max_nodes,
+        },
+        "results": [],
+    }
+    try:
+        for functions in scales:
+            warnings = int(functions * args.warnings_per_function)
+            print(f"[bench] {functions} functions / {warnings} warnings", file=sys.stderr)
+            result = bench_scale(workdir / f"scale_{functions}", functions, warnings, args)
+            for stage in result["stages"]:
+                print(f"[bench]   {stage['name']:<24} {stage['wall_seconds']:9.3f}s", file=sys.stderr)
+            report["results"].append(result)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print(f"[bench] Wrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
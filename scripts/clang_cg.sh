@@ -7,6 +7,7 @@ set -euo pipefail
 set -x
 
 REPO_DIR=$(pwd)
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 NPROCS=$(nproc)
 COMPILE_DB="build/compile_commands.json"
 ALL_BC_FILENAME="all.bc"
@@ -51,33 +52,22 @@ if [ ! -s "$C_FILES_LIST" ]; then
     exit 1
 fi
 
-echo "4. Generating Bitcode (.bc) files..."
-while IFS= read -r src; do
-  # 출력 경로 설정 (경로 충돌 방지 위해 원본 경로를 기반으로 파일명 생성)
-  # 예: src/main.c -> src_main.bc
-  out_filename=$(echo "$src" | sed 's#/#_#g' | sed 's#\.c$#.bc#')
-  out_path="bc/$out_filename"
-  
-  # clang 컴파일: -O0 -g -emit-llvm -c 옵션을 사용하여 Bitcode 생성
-  # $src 경로가 compile_commands.json에 있는 상대 경로와 일치해야 합니다.
-  clang -O0 -g -emit-llvm -c "$src" -o "$out_path"
-done < "$C_FILES_LIST"
+echo "4. Generating Bitcode (.bc) files with $NPROCS parallel jobs..."
+# 파일 단위 컴파일은 서로 독립적이므로 core 수만큼 동시에 실행하고,
+# (전처리된 소스 + 컴파일 옵션) hash 가 같은 translation unit 은 캐시된 .bc 를 그대로 쓴다.
+# 하나라도 컴파일에 실패하면 0 이 아닌 값으로 끝나 set -e 로 종료
+python3 "$SCRIPT_DIR/bc_cache.py" compile \
+  --compile-db "$COMPILE_DB" \
+  --out-dir bc \
+  --jobs "$NPROCS" \
+  "$C_FILES_LIST"
 
-# 3. 모든 Bitcode 파일 링크
-echo "5. Linking all Bitcode files into $ALL_BC_FILENAME..."
-BC_FILES=$(find bc/ -name "*.bc")
-
-if [ -z "$BC_FILES" ]; then
-    echo "에러: Bitcode 파일이 생성되지 않았습니다. Call Graph 추출 실패." >&2
-    exit 1
-fi
-
-echo "6. Extracting Call Graph per module (to STDOUT)..." >&2
-for bc in $BC_FILES; do
-  echo ";; ===== Callgraph for module: $bc =====" >&2
-  # opt는 stderr로 call graph를 쓰니까, 2>&1 해서 stdout으로 보냄
-  opt -passes=print-callgraph -disable-output "$bc" 2>&1
-done
+# 3. 모든 Bitcode 파일 링크 + Call Graph 추출
+# 하나의 module 로 링크해 opt 를 한 번만 실행 (module 간 호출도 한 그래프에서 해석됨).
+# 모든 module 이 이전 실행과 같으면 llvm-link / opt 없이 캐시된 call graph 를 출력한다.
+# 여러 실행 파일의 main 처럼 중복 정의가 있어 링크가 실패하면 module 별로 추출한다.
+echo "5. Linking all Bitcode files into $ALL_BC_FILENAME and extracting Call Graph (to STDOUT)..." >&2
+python3 "$SCRIPT_DIR/bc_cache.py" callgraph --out-dir bc --linked "$ALL_BC_FILENAME"
 
 echo "======================================================"
 echo "Call Graph extraction completed successfully."